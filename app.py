@@ -1,15 +1,12 @@
 import streamlit as st
-import requests
-from bs4 import BeautifulSoup
-import re
-from urllib.parse import urlparse
-import time
-from groq import Groq
 import os
-from typing import Optional, Tuple, Dict, Any
+from typing import Any, Dict, Optional
+from urllib.parse import urlparse
 import logging
 from dotenv import load_dotenv
-from firecrawl import FirecrawlApp
+import metrics
+from summarizer import BlogSummarizer, create_summarizer
+from tracing import current_span, tracer
 
 # Load environment variables
 load_dotenv()
@@ -26,205 +23,178 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
-class BlogSummarizer:
-    def __init__(self, groq_api_key: str, firecrawl_api_key: Optional[str] = None):
-        """Initialize the BlogSummarizer with API keys."""
-        self.groq_client = Groq(api_key=groq_api_key)
-        self.firecrawl_client = FirecrawlApp(api_key=firecrawl_api_key) if firecrawl_api_key else None
+@st.cache_resource(show_spinner=False)
+def get_summarizer(groq_api_key: str, firecrawl_api_key: Optional[str] = None) -> BlogSummarizer:
+    """Return a process-wide summarizer so API clients and HTTP pools survive reruns and sessions."""
+    return create_summarizer(groq_api_key, firecrawl_api_key)
+
+@st.cache_resource(show_spinner=False)
+def start_metrics_exporter():
+    """Serve Prometheus metrics on METRICS_PORT, once per process, if configured."""
+    return metrics.start_http_server_from_env()
+
+def show_details(url: str, title: Optional[str], method: str, content_length: int, summary_length: str, summary_stats: Dict[str, Any]):
+    """Show how the summary was produced."""
+    with st.expander("ℹ️ Processing Details"):
+        st.write(f"**Source URL:** {url}")
+        st.write(f"**Extraction Method:** {method}")
+        st.write(f"**Content Length:** {content_length:,} characters")
+        st.write(f"**Summary Length Setting:** {summary_length.title()}")
+        if summary_stats.get("cached"):
+            st.write("**Served From Cache:** yes, without fetching the page")
+        if "compression_ratio" in summary_stats:
+            st.write(f"**Pre-compression:** kept {summary_stats['compression_ratio']:.0%} of the content tokens")
+        if "prompt_tokens" in summary_stats:
+            st.write(f"**Prompt Tokens (estimated):** {summary_stats['prompt_tokens']:,}")
+        if "chunks" in summary_stats:
+            st.write(f"**Sections Summarized:** {summary_stats['chunks']}")
+        if summary_stats.get("queue_wait"):
+            st.write(f"**Rate Limit Queue Wait:** {summary_stats['queue_wait'] * 1000:,.0f} ms")
+        if "time_to_first_token" in summary_stats:
+            st.write(f"**Time to First Token:** {summary_stats['time_to_first_token'] * 1000:,.0f} ms")
+        if "total_time" in summary_stats:
+            st.write(f"**Summary Generation Time:** {summary_stats['total_time'] * 1000:,.0f} ms")
+        if summary_stats.get("bytes_downloaded"):
+            st.write(f"**Page Size:** {summary_stats['bytes_downloaded']:,} bytes")
+        if "token_usage" in summary_stats:
+            usage = summary_stats["token_usage"]
+            st.write(f"**Groq Token Usage:** {usage['prompt']:,} prompt + {usage['completion']:,} completion")
+        if summary_stats.get("timings"):
+            st.write("**Stage Timings:**")
+            st.table({
+                "Stage": list(summary_stats["timings"]),
+                "Time (ms)": [f"{seconds * 1000:,.1f}" for seconds in summary_stats["timings"].values()],
+            })
+        
+        if "trace_id" in summary_stats:
+            st.write(f"**Trace ID:** `{summary_stats['trace_id']}`")
         
-        # Fallback session for basic scraping
-        self.session = requests.Session()
-        self.session.headers.update({
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-        })
+        if title:
+            st.write(f"**Original Title:** {title}")
+
+def show_copy(summary: str):
+    """Show the summary in a copyable code block."""
+    st.markdown("### 📋 Copy Summary")
+    st.code(summary, language=None)
+
+def summarize_and_show(summarizer: BlogSummarizer, url: str, summary_length: str, stream_summary: bool,
+                       firecrawl_api_key: Optional[str]):
+    """Extract and summarize a URL, rendering progress, the summary and its details."""
+    if not summarizer.is_valid_url(url):
+        st.error("❌ Please enter a valid URL (including http:// or https://)")
+        return
     
-    def is_valid_url(self, url: str) -> bool:
-        """Validate URL format."""
-        try:
-            result = urlparse(url)
-            return all([result.scheme, result.netloc])
-        except Exception:
-            return False
+    span = current_span()
+    summary_stats = {"trace_id": span.trace_id} if span else {}
     
-    def extract_with_firecrawl(self, url: str) -> Tuple[Optional[str], Optional[str], Optional[str]]:
-        """Extract content using Firecrawl API."""
-        try:
-            # Scrape the URL with Firecrawl
-            scrape_result = self.firecrawl_client.scrape_url(
-                url,
-                params={
-                    'formats': ['markdown', 'html'],
-                    'onlyMainContent': True,
-                    'includeTags': ['title', 'h1', 'h2', 'h3', 'p', 'article'],
-                    'excludeTags': ['nav', 'footer', 'header', 'aside', 'script', 'style'],
-                    'waitFor': 3000,  # Wait for dynamic content
-                    'timeout': 30000  # 30 second timeout
-                }
-            )
-            
-            if not scrape_result.get('success', False):
-                return None, None, f"Firecrawl failed to scrape the URL: {scrape_result.get('error', 'Unknown error')}"
-            
-            data = scrape_result.get('data', {})
-            
-            # Extract title and content
-            title = data.get('title') or data.get('metadata', {}).get('title')
-            
-            # Prefer markdown content, fallback to cleaned HTML
-            content = data.get('markdown')
-            if not content:
-                content = data.get('content')
-            
-            if not content:
-                return None, None, "No content could be extracted from the page"
-            
-            # Clean markdown content if needed
-            if content:
-                # Remove excessive whitespace and newlines
-                content = re.sub(r'\n\s*\n\s*\n', '\n\n', content)
-                content = re.sub(r'\s+', ' ', content)
-                content = content.strip()
-            
-            return title, content, None
-            
-        except Exception as e:
-            logger.error(f"Extraction error for {url}: {str(e)}")
-            return None, None, f"Firecrawl error: {str(e)}"
+    # A summary cached for this page, under any variant of its URL, needs no extraction
+    cached = summarizer.get_cached_summary(url, summary_length)
+    if cached is not None:
+        summary_stats["cached"] = True
+        st.success("✅ Summary loaded from cache!")
+        if cached["title"]:
+            st.subheader(f"📄 {cached['title']}")
+        st.markdown("### 📝 Summary")
+        st.markdown(cached["summary"])
+        remember_and_show(url, cached["title"], cached["method"], cached["content_length"], summary_length,
+                          cached["summary"], summary_stats)
+        return
     
-    def extract_with_fallback(self, url: str) -> Tuple[Optional[str], Optional[str], Optional[str]]:
-        """Fallback content extraction using BeautifulSoup."""
-        try:
-            response = self.session.get(url, timeout=15)
-            response.raise_for_status()
-            
-            soup = BeautifulSoup(response.content, 'html.parser')
-            
-            # Remove unwanted elements
-            for element in soup(["script", "style", "nav", "footer", "header", "aside", "iframe", "noscript"]):
-                element.decompose()
-            
-            # Extract title
-            title = None
-            title_selectors = [
-                'title', 'h1', '.post-title', '.entry-title', '.article-title',
-                '[property="og:title"]', '.headline', '.page-title'
-            ]
-            for selector in title_selectors:
-                title_elem = soup.select_one(selector)
-                if title_elem:
-                    title = title_elem.get_text().strip() if hasattr(title_elem, 'get_text') else title_elem.get('content', '').strip()
-                    if title:
-                        break
-            
-            # Extract main content
-            content = None
-            content_selectors = [
-                'article', '.post-content', '.entry-content', '.article-content',
-                '.content', 'main', '.post', '.blog-post', '[role="main"]',
-                '.story-body', '.article-body', '.post-body'
-            ]
-            
-            for selector in content_selectors:
-                content_elem = soup.select_one(selector)
-                if content_elem:
-                    content = content_elem.get_text(separator=' ', strip=True)
-                    if len(content) > 200:  # Ensure substantial content
-                        break
-            
-            # Final fallback to body content
-            if not content or len(content) < 200:
-                body = soup.find('body')
-                if body:
-                    content = body.get_text(separator=' ', strip=True)
-            
-            # Clean up content
-            if content:
-                content = re.sub(r'\s+', ' ', content)
-                content = re.sub(r'(Skip to content|Copyright|All rights reserved|Privacy Policy|Terms of Service).*', '', content, flags=re.IGNORECASE)
-                content = content.strip()
-            
-            return title, content, None
-            
-        except requests.exceptions.Timeout:
-            return None, None, "Request timeout - the website took too long to respond"
-        except requests.exceptions.ConnectionError:
-            return None, None, "Connection error - unable to reach the website"
-        except requests.exceptions.HTTPError as e:
-            return None, None, f"HTTP error {e.response.status_code} - {e.response.reason}"
-        except Exception as e:
-            logger.error(f"Fallback extraction error for {url}: {str(e)}")
-            return None, None, f"Error extracting content: {str(e)}"
+    # Progress tracking
+    progress_bar = st.progress(0)
+    status_text = st.empty()
     
-    def extract_content(self, url: str) -> Tuple[Optional[str], Optional[str], Optional[str], str]:
-        """Extract content using the best available method."""
-        method_used = "unknown"
+    # Extract content
+    status_text.text("🔍 Extracting content from the article...")
+    progress_bar.progress(25)
+    
+    title, content, error, method = summarizer.extract_content(url, stats=summary_stats)
+    
+    if error:
+        st.error(f"❌ {error}")
+        if not firecrawl_api_key and "timeout" not in error.lower():
+            st.info("💡 **Tip**: Many extraction issues can be resolved with Firecrawl integration. Contact your administrator for premium extraction capabilities.")
+        return
+    
+    if not content or len(content.strip()) < 100:
+        st.error("❌ Unable to extract sufficient content from this URL. The page might be behind a paywall, require JavaScript, or have content protection.")
+        if not firecrawl_api_key:
+            st.info("💡 **Tip**: Firecrawl can often handle protected and JavaScript-heavy sites. Contact your administrator about upgrading.")
+        return
+    
+    progress_bar.progress(60)
+    status_text.text("🤖 Generating AI summary...")
+    
+    # Generate summary
+    if stream_summary:
+        progress_bar.empty()
+        status_text.empty()
+        
+        # Render tokens as they arrive instead of waiting for the full completion
+        if title:
+            st.subheader(f"📄 {title}")
+        st.markdown("### 📝 Summary")
+        summary_placeholder = st.empty()
+        summary = ""
+        for token in summarizer.summarize_content_stream(title or "Untitled Article", content, summary_length, stats=summary_stats):
+            summary += token
+            summary_placeholder.markdown(summary + "▌")
+        summary = summary.strip()
+        summary_placeholder.markdown(summary)
+        error = summary_stats.get("error")
         
-        # Try Firecrawl first if available
-        if self.firecrawl_client:
-            method_used = "Firecrawl"
-            title, content, error = self.extract_with_firecrawl(url)
-            if not error and content and len(content.strip()) > 100:
-                return title, content, None, method_used
+        if error:
+            st.error(f"❌ {error}")
+            return
+        
+        st.success("✅ Summary generated successfully!")
+    else:
+        summary, error = summarizer.summarize_content(title or "Untitled Article", content, summary_length, stats=summary_stats)
+        progress_bar.progress(100)
+        status_text.empty()
+        progress_bar.empty()
         
-        # Fallback to basic scraping
-        method_used = "Basic Scraping"
-        title, content, error = self.extract_with_fallback(url)
-        return title, content, error, method_used
+        if error:
+            st.error(f"❌ {error}")
+            return
+        
+        # Display results
+        st.success("✅ Summary generated successfully!")
+        
+        # Display title if available
+        if title:
+            st.subheader(f"📄 {title}")
+        
+        # Display summary
+        st.markdown("### 📝 Summary")
+        st.markdown(summary)
     
-    def summarize_content(self, title: str, content: str, summary_length: str = "medium") -> Tuple[Optional[str], Optional[str]]:
-        """Summarize the extracted content using Groq."""
-        try:
-            # Truncate content if too long
-            max_content_length = 15000  # More generous limit for better summaries
-            if len(content) > max_content_length:
-                content = content[:max_content_length] + "..."
-            
-            # Define summary length instructions
-            length_instructions = {
-                "short": "Provide a concise 2-3 sentence summary highlighting only the most important points.",
-                "medium": "Provide a comprehensive summary in 1-2 paragraphs (4-6 sentences) covering the main points and key insights.",
-                "long": "Provide a detailed summary in 2-3 paragraphs (6-10 sentences) covering main points, supporting details, and key takeaways."
-            }
-            
-            length_instruction = length_instructions.get(summary_length, length_instructions["medium"])
-            
-            prompt = f"""Please summarize the following blog post/article. {length_instruction}
-
-Title: {title or "Article"}
-
-Content: {content}
+    summarizer.cache_url_summaries(url, summary_length, title, summary, method, content, summary_stats)
+    remember_and_show(url, title, method, len(content), summary_length, summary, summary_stats)
 
-Focus on:
-- Main arguments or points
-- Key insights or findings  
-- Important conclusions or takeaways
-- Actionable information if present
-
-Summary:"""
-            
-            response = self.groq_client.chat.completions.create(
-                messages=[
-                    {
-                        "role": "system",
-                        "content": "You are an expert content summarizer. Create clear, informative summaries that capture the essence of articles while being engaging and easy to understand. Focus on the most valuable information for readers."
-                    },
-                    {
-                        "role": "user",
-                        "content": prompt
-                    }
-                ],
-                model="llama3-8b-8192",
-                temperature=0.5
-            )
-            
-            summary = response.choices[0].message.content.strip()
-            return summary, None
-            
-        except Exception as e:
-            logger.error(f"Error generating summary: {str(e)}")
-            return None, f"Error generating summary: {str(e)}"
+def remember_and_show(url: str, title: Optional[str], method: str, content_length: int, summary_length: str,
+                      summary: str, summary_stats: Dict[str, Any]):
+    """Keep the result in the session, then show its details and the copyable summary."""
+    # Keep every generated length so switching the setting needs no new request
+    summaries = dict(summary_stats.get("summaries") or {})
+    previous = st.session_state.get("summary_result")
+    if previous and previous["url"] == url:
+        summaries = {**previous["summaries"], **summaries}
+    summaries[summary_length] = summary
+    st.session_state["summary_result"] = {
+        "url": url,
+        "title": title,
+        "method": method,
+        "content_length": content_length,
+        "summaries": summaries,
+        "stats": summary_stats,
+    }
+    
+    show_details(url, title, method, content_length, summary_length, summary_stats)
+    show_copy(summary)
 
 def main():
+    start_metrics_exporter()
     st.title("📚 Advanced Blog Post Summarizer")
     st.markdown("Transform lengthy blog posts into concise, informative summaries using AI-powered content extraction.")
     
@@ -253,6 +223,12 @@ def main():
             help="Choose how detailed you want the summary to be"
         )
         
+        stream_summary = st.checkbox(
+            "Stream summary",
+            value=True,
+            help="Show the summary word by word as it is generated"
+        )
+        
         st.markdown("---")
         st.markdown("### 📖 How to Use")
         st.markdown("1. Paste any blog post or article URL")
@@ -270,9 +246,9 @@ def main():
             st.markdown("• JavaScript-heavy sites")
             st.markdown("• Protected content")
     
-    # Initialize summarizer
+    # Initialize summarizer (shared across reruns and sessions)
     try:
-        summarizer = BlogSummarizer(groq_api_key, firecrawl_api_key)
+        summarizer = get_summarizer(groq_api_key, firecrawl_api_key)
     except Exception as e:
         st.error(f"Error initializing summarizer: {str(e)}")
         return
@@ -288,70 +264,22 @@ def main():
     with col2:
         summarize_button = st.button("🚀 Summarize Article", type="primary", use_container_width=True)
     
-    if summarize_button and url:
-        if not summarizer.is_valid_url(url):
-            st.error("❌ Please enter a valid URL (including http:// or https://)")
-            return
-        
-        # Progress tracking
-        progress_bar = st.progress(0)
-        status_text = st.empty()
-        
-        # Extract content
-        status_text.text("🔍 Extracting content from the article...")
-        progress_bar.progress(25)
-        
-        title, content, error, method = summarizer.extract_content(url)
-        
-        if error:
-            st.error(f"❌ {error}")
-            if not firecrawl_api_key and "timeout" not in error.lower():
-                st.info("💡 **Tip**: Many extraction issues can be resolved with Firecrawl integration. Contact your administrator for premium extraction capabilities.")
-            return
-        
-        if not content or len(content.strip()) < 100:
-            st.error("❌ Unable to extract sufficient content from this URL. The page might be behind a paywall, require JavaScript, or have content protection.")
-            if not firecrawl_api_key:
-                st.info("💡 **Tip**: Firecrawl can often handle protected and JavaScript-heavy sites. Contact your administrator about upgrading.")
-            return
-        
-        progress_bar.progress(60)
-        status_text.text("🤖 Generating AI summary...")
-        
-        # Generate summary
-        summary, error = summarizer.summarize_content(title or "Untitled Article", content, summary_length)
-        progress_bar.progress(100)
-        status_text.empty()
-        progress_bar.empty()
-        
-        if error:
-            st.error(f"❌ {error}")
-            return
-        
-        # Display results
-        st.success("✅ Summary generated successfully!")
-        
-        # Display title if available
-        if title:
-            st.subheader(f"📄 {title}")
-        
-        # Display summary
+    # A summary already generated for this URL and length (e.g. after only the
+    # length setting changed) is shown straight from the session
+    previous = st.session_state.get("summary_result")
+    if url and previous and previous["url"] == url and summary_length in previous["summaries"]:
+        summary = previous["summaries"][summary_length]
+        if previous["title"]:
+            st.subheader(f"📄 {previous['title']}")
         st.markdown("### 📝 Summary")
         st.markdown(summary)
-        
-        # Display additional info
-        with st.expander("ℹ️ Processing Details"):
-            st.write(f"**Source URL:** {url}")
-            st.write(f"**Extraction Method:** {method}")
-            st.write(f"**Content Length:** {len(content):,} characters")
-            st.write(f"**Summary Length Setting:** {summary_length.title()}")
-            
-            if title:
-                st.write(f"**Original Title:** {title}")
-        
-        # Copy summary section
-        st.markdown("### 📋 Copy Summary")
-        st.code(summary, language=None)
+        show_details(url, previous["title"], previous["method"], previous["content_length"], summary_length, previous["stats"])
+        show_copy(summary)
+    
+    elif summarize_button and url:
+        with tracer.span("summarize_request", {"url.host": urlparse(url).netloc.lower(), "summary.length": summary_length}) as span, \
+                summarizer.profile_request("summarize_request", span.trace_id):
+            summarize_and_show(summarizer, url, summary_length, stream_summary, firecrawl_api_key)
     
     elif summarize_button and not url:
         st.warning("⚠️ Please enter a blog post URL to summarize.")
@@ -0,0 +1,383 @@
+import asyncio
+import logging
+import random
+import time
+from typing import Any, Dict, List, Optional, Tuple, Union
+from urllib.parse import urlparse
+
+import httpx
+from groq import AsyncGroq, RateLimitError
+
+from metrics import (
+    GROQ_REQUESTS, IN_PROGRESS, merge_stats, record_bytes, record_stage, record_tokens, stage_timer
+)
+from canonical import canonicalize_url
+from resilience import RETRYABLE_STATUSES
+from ratelimit import parse_duration
+from singleflight import AsyncSingleFlight
+from summarizer import (
+    CONDENSE_ROUNDS, MODEL_NAME, OUTPUT_TOKEN_BUDGET, USER_AGENT, BlogSummarizer, join_sections,
+    summarizer_options_from_env
+)
+from text_utils import estimate_message_tokens
+from tracing import annotate, exporter_from_env, in_current_span, tracer
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncBlogSummarizer:
+    """asyncio variant of BlogSummarizer built on httpx and AsyncGroq.
+
+    extract_content(), summarize_content() and summarize_url() are coroutines
+    with the same return values as their BlogSummarizer counterparts, so a
+    single event loop can keep hundreds of fetches and Groq calls in flight.
+    Firecrawl has no async client and runs on the core's Firecrawl threads,
+    so its slow calls never queue behind (or in front of) the short blocking
+    work, HTML parsing and the cache and near-duplicate lookups, which runs
+    in the loop's default executor.
+
+    Configuration, the cache and every decision that needs no I/O (extraction
+    routing, prompt packing, multi-length handling, the URL-cache write-back)
+    live in a wrapped BlogSummarizer, ``core``; this class only swaps in async
+    I/O around them. It does not subclass the core, so the blocking entry
+    points are not reachable through it.
+    """
+
+    def __init__(self, groq_api_key: str, firecrawl_api_key: Optional[str] = None, max_connections: int = 200,
+                 async_groq_client: Optional[AsyncGroq] = None, **kwargs):
+        """Initialize with the same options as BlogSummarizer plus the total HTTP connection limit.
+
+        ``async_groq_client`` replaces the AsyncGroq client; by default one is
+        built with the API key, base URL, timeout and retries of the core's
+        Groq client, so an injected ``groq_client`` stand-in is honored.
+        """
+        self.core = BlogSummarizer(groq_api_key, firecrawl_api_key, **kwargs)
+        groq_client = self.core.groq_client
+        self.async_groq_client = async_groq_client or AsyncGroq(
+            api_key=groq_client.api_key,
+            base_url=groq_client.base_url,
+            timeout=groq_client.timeout,
+            max_retries=groq_client.max_retries
+        )
+        self.http_client = httpx.AsyncClient(
+            headers={'User-Agent': USER_AGENT},
+            timeout=15,
+            follow_redirects=True,
+            limits=httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_connections)
+        )
+        self.chunk_semaphore = asyncio.Semaphore(kwargs.get("chunk_concurrency", 4))
+        self._host_semaphores: Dict[str, asyncio.Semaphore] = {}
+        self.async_extraction_flights = AsyncSingleFlight()
+        self.async_summary_flights = AsyncSingleFlight()
+
+    async def aclose(self) -> None:
+        """Close the HTTP connection pools."""
+        await self.http_client.aclose()
+        await self.async_groq_client.close()
+
+    async def _host_slot(self, host: str) -> asyncio.Semaphore:
+        """Acquire one of the host's connection slots, counting waits like HostLimiter."""
+        semaphore = self._host_semaphores.get(host)
+        if semaphore is None:
+            semaphore = self._host_semaphores[host] = asyncio.Semaphore(self.core.max_connections_per_host)
+        if semaphore.locked():
+            start = time.perf_counter()
+            await semaphore.acquire()
+            self.core.http_stats.record_pool_wait(time.perf_counter() - start)
+        else:
+            await semaphore.acquire()
+        return semaphore
+
+    def _retry_delay(self, attempt: int, response: Optional[httpx.Response]) -> float:
+        """Seconds to wait before a retry: Retry-After if present, else jittered backoff."""
+        retry_after = parse_duration(response.headers.get('Retry-After')) if response is not None else None
+        if retry_after is not None:
+            return min(retry_after, 30.0)
+        backoff = self.core.backoff_factor * (2 ** attempt)
+        return backoff / 2 + random.uniform(0, backoff / 2)
+
+    async def extract_with_firecrawl(self, url: str, stats: Optional[Dict[str, Any]] = None) -> Tuple[Optional[str], Optional[str], Optional[str]]:
+        """Extract content using Firecrawl API on the core's Firecrawl pool."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self.core.firecrawl_executor, in_current_span(self.core.extract_with_firecrawl), url, stats
+        )
+
+    async def extract_with_fallback(self, url: str, stats: Optional[Dict[str, Any]] = None) -> Tuple[Optional[str], Optional[str], Optional[str]]:
+        """Fallback content extraction by fetching the page and parsing it locally."""
+        with stage_timer(stats, "connection_slot"):
+            semaphore = await self._host_slot(urlparse(url).netloc.lower())
+        try:
+            for attempt in range(self.core.max_retries + 1):
+                retrying = attempt < self.core.max_retries
+                try:
+                    request_start = time.perf_counter()
+                    with tracer.span("http.fetch", {"url.host": urlparse(url).netloc.lower(), "http.attempt": attempt}) as span:
+                        async with self.http_client.stream("GET", url) as response:
+                            record_stage(stats, "fetch_headers", time.perf_counter() - request_start)
+                            span.set_attribute("http.status_code", response.status_code)
+                            if response.status_code in RETRYABLE_STATUSES and retrying:
+                                self.core.http_stats.record_retry(str(response.status_code))
+                                span.record_error(f"retrying after HTTP {response.status_code}")
+                                delay = self._retry_delay(attempt, response)
+                            else:
+                                response.raise_for_status()
+
+                                error = self.core._check_headers(response.headers)
+                                if error:
+                                    span.record_error(error)
+                                    return None, None, error
+
+                                html = bytearray()
+                                with stage_timer(stats, "download"):
+                                    async for chunk in response.aiter_bytes(64 * 1024):
+                                        if self.core._append_chunk(html, chunk, url):
+                                            break
+                                span.set_attribute("http.response_bytes", len(html))
+                                content_type = response.headers.get('Content-Type', '')
+                                final_url = str(response.url)
+                                break
+                except (httpx.ConnectError, httpx.ConnectTimeout) as e:
+                    # Connection failures are retried like in the requests session
+                    if not retrying:
+                        raise
+                    self.core.http_stats.record_retry(type(e).__name__)
+                    delay = self._retry_delay(attempt, None)
+                await asyncio.sleep(delay)
+
+            html = bytes(html)
+            record_bytes(stats, len(html))
+            title, content = await asyncio.to_thread(self.core._parse_page, html, content_type, stats)
+            await asyncio.to_thread(self.core._remember_canonical, url, final_url, html, content)
+            return title, content, None
+
+        except httpx.TimeoutException:
+            return None, None, "Request timeout - the website took too long to respond"
+        except httpx.ConnectError:
+            return None, None, "Connection error - unable to reach the website"
+        except httpx.HTTPStatusError as e:
+            return None, None, f"HTTP error {e.response.status_code} - {e.response.reason_phrase}"
+        except Exception as e:
+            logger.error(f"Fallback extraction error for {url}: {str(e)}")
+            return None, None, f"Error extracting content: {str(e)}"
+        finally:
+            semaphore.release()
+
+    async def _extract_hedged(self, url: str, stats: Optional[Dict[str, Any]] = None) -> Tuple[Optional[str], Optional[str], Optional[str], str]:
+        """Race Firecrawl against basic scraping and return the first usable result."""
+        # Each leg records into its own stats and only the returned leg's are
+        # merged; Firecrawl's worker thread outlives a cancelled task
+        firecrawl_stats = {} if stats is not None else None
+        firecrawl_task = asyncio.create_task(self._attempt("firecrawl", url, firecrawl_stats))
+        done, _ = await asyncio.wait({firecrawl_task}, timeout=self.core.hedge_delay)
+        if done:
+            leg_result = firecrawl_task.result()
+            result = self.core._accept_leg(leg_result, "Firecrawl", firecrawl_stats, stats)
+            if result is not None:
+                return result
+            annotate({"extraction.fallback_reason": self.core._fallback_reason(*leg_result[1:])})
+            pending = {}
+        else:
+            annotate({"extraction.fallback_reason": "hedge_delay"})
+            pending = {firecrawl_task: ("Firecrawl", firecrawl_stats)}
+
+        fallback_stats = {} if stats is not None else None
+        fallback_task = asyncio.create_task(self._attempt("fallback", url, fallback_stats))
+        pending[fallback_task] = ("Basic Scraping", fallback_stats)
+
+        fallback_result = None
+        remaining = set(pending)
+        while remaining:
+            done, remaining = await asyncio.wait(remaining, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                method_used, leg_stats = pending[task]
+                result = self.core._accept_leg(task.result(), method_used, leg_stats, stats)
+                if result is not None:
+                    # Unlike threads, the losing coroutine can really be cancelled
+                    for other in remaining:
+                        other.cancel()
+                    return result
+                if task is fallback_task:
+                    fallback_result = task.result()
+
+        merge_stats(stats, fallback_stats)
+        title, content, error = fallback_result
+        return title, content, error, "Basic Scraping"
+
+    async def extract_content(self, url: str, stats: Optional[Dict[str, Any]] = None) -> Tuple[Optional[str], Optional[str], Optional[str], str]:
+        """Extract content using the best available method, sharing concurrent extractions of a URL."""
+        start = time.perf_counter()
+        with tracer.span("extract_content", {"url.host": urlparse(url).netloc.lower()}) as span, \
+                IN_PROGRESS.track(operation="extraction"):
+            result, shared = await self.async_extraction_flights.do(canonicalize_url(url), self._extract_content, url, stats)
+            self.core._finish_extraction(span, result, shared, start)
+        return result
+
+    async def _attempt(self, extractor: str, url: str, stats: Optional[Dict[str, Any]] = None) -> Tuple[Optional[str], Optional[str], Optional[str]]:
+        """Run one extractor ("firecrawl" or "fallback") in its own trace span."""
+        extract = self.extract_with_firecrawl if extractor == "firecrawl" else self.extract_with_fallback
+        with tracer.span(f"extract.{extractor}", {"url.host": urlparse(url).netloc.lower()}) as span:
+            title, content, error = await extract(url, stats)
+            self.core._finish_attempt(span, content, error)
+        return title, content, error
+
+    async def _extract_content(self, url: str, stats: Optional[Dict[str, Any]] = None) -> Tuple[Optional[str], Optional[str], Optional[str], str]:
+        """Extract content without coalescing."""
+        route, skip_reason = self.core._extraction_route()
+        if route == "hedged":
+            return await self._extract_hedged(url, stats)
+
+        if route == "firecrawl":
+            title, content, error = await self._attempt("firecrawl", url, stats)
+            if self.core._is_usable(content, error):
+                return title, content, None, "Firecrawl"
+            skip_reason = self.core._fallback_reason(content, error)
+
+        annotate({"extraction.fallback_reason": skip_reason})
+        title, content, error = await self._attempt("fallback", url, stats)
+        return title, content, error, "Basic Scraping"
+
+    async def _create_completion(self, messages: List[Dict[str, str]], max_tokens: int, temperature: float,
+                                 stats: Optional[Dict[str, Any]] = None, response_format: Optional[Dict[str, str]] = None) -> Any:
+        """Call Groq once the rate limit scheduler admits the request."""
+        reserved_tokens = estimate_message_tokens(messages) + max_tokens
+        queue_wait = self.core.scheduler.reserve(reserved_tokens)
+        if queue_wait > 0:
+            with stage_timer(stats, "rate_limit_wait"):
+                await asyncio.sleep(queue_wait)
+        if stats is not None:
+            stats["queue_wait"] = stats.get("queue_wait", 0.0) + queue_wait
+
+        options = {"response_format": response_format} if response_format else {}
+        attributes = {"llm.model": MODEL_NAME, "llm.max_tokens": max_tokens, "llm.stream": False, "llm.queue_wait": queue_wait}
+        with tracer.span("groq.completion", attributes) as span:
+            try:
+                with stage_timer(stats, "groq_request"), IN_PROGRESS.track(operation="groq_request"):
+                    raw_response = await self.async_groq_client.chat.completions.with_raw_response.create(
+                        messages=messages,
+                        model=MODEL_NAME,
+                        temperature=temperature,
+                        max_tokens=max_tokens,
+                        **options
+                    )
+            except RateLimitError as e:
+                GROQ_REQUESTS.inc(outcome="rate_limited")
+                self.core.scheduler.update_from_headers(e.response.headers, rate_limited=True)
+                raise
+            except Exception:
+                GROQ_REQUESTS.inc(outcome="error")
+                raise
+
+            GROQ_REQUESTS.inc(outcome="success")
+            self.core.scheduler.update_from_headers(raw_response.headers)
+            response = await raw_response.parse()
+            if response.usage:
+                self.core.scheduler.settle(reserved_tokens, response.usage.total_tokens)
+                record_tokens(stats, response.usage.prompt_tokens, response.usage.completion_tokens)
+                span.set_attributes({
+                    "llm.prompt_tokens": response.usage.prompt_tokens,
+                    "llm.completion_tokens": response.usage.completion_tokens,
+                })
+        return response
+
+    async def _summarize_chunk(self, title: str, chunk: str) -> str:
+        """Summarize one section of a long article, reusing cached section summaries."""
+        cache_key = self.core._cache_key(chunk, "chunk")
+        if cache_key:
+            cached = await asyncio.to_thread(self.core.cache.get, cache_key)
+            if cached is not None:
+                return cached
+
+        async with self.chunk_semaphore:
+            response = await self._create_completion(
+                self.core._build_chunk_messages(title, chunk),
+                max_tokens=OUTPUT_TOKEN_BUDGET["chunk"],
+                temperature=0.3
+            )
+
+        summary = response.choices[0].message.content.strip()
+        if cache_key:
+            await asyncio.to_thread(self.core.cache.set, cache_key, summary)
+        return summary
+
+    async def _condense_content(self, title: str, content: str, summary_length: str, stats: Optional[Dict[str, Any]] = None) -> Tuple[str, bool]:
+        """Fit the content into a single prompt, map-summarizing long articles chunk by chunk."""
+        from_sections = False
+        for _ in range(CONDENSE_ROUNDS):
+            chunks = self.core._chunks_to_condense(title, content, summary_length, from_sections, stats)
+            if chunks is None:
+                break
+
+            with stage_timer(stats, "chunk_summaries"):
+                partials = await asyncio.gather(*(self._summarize_chunk(title, chunk) for chunk in chunks))
+            content = join_sections(partials)
+            from_sections = True
+
+        return content, from_sections
+
+    async def summarize_content(self, title: str, content: str, summary_length: str = "medium", stats: Optional[Dict[str, Any]] = None) -> Tuple[Optional[str], Optional[str]]:
+        """Summarize the extracted content using Groq."""
+        try:
+            cached = await asyncio.to_thread(self.core._cached_result, content, summary_length, stats)
+            if cached is not None:
+                return cached, None
+
+            generated_length = self.core._generated_length(summary_length)
+            result, shared = await self.async_summary_flights.do(
+                self.core._summary_key(content, generated_length),
+                self._generate_summary, title, content, generated_length, stats
+            )
+            return self.core._pick_summary(result, summary_length, shared, stats), None
+
+        except Exception as e:
+            logger.error(f"Error generating summary: {str(e)}")
+            return None, f"Error generating summary: {str(e)}"
+
+    async def _generate_summary(self, title: str, content: str, summary_length: str,
+                                stats: Optional[Dict[str, Any]] = None) -> Union[str, Dict[str, str]]:
+        """Call Groq for the summary, or every length if ``summary_length`` is "all", and cache it."""
+        prompt_content = await asyncio.to_thread(self.core._precompress, content, stats)
+        prompt_content, from_sections = await self._condense_content(title, prompt_content, summary_length, stats)
+        messages = self.core._summary_messages(title, prompt_content, summary_length, from_sections, stats)
+        response = await self._create_completion(messages, stats=stats, **self.core._summary_options(summary_length))
+        return await asyncio.to_thread(self.core._store_generated, content, summary_length, response.choices[0].message.content)
+
+    async def summarize_url(self, url: str, summary_length: str = "medium", stats: Optional[Dict[str, Any]] = None) -> Tuple[Optional[str], Optional[str], Optional[str], str]:
+        """Extract and summarize a URL in one call; returns (title, summary, error, method)."""
+        stats = stats if stats is not None else {}
+        with tracer.span("summarize_url", {"url.host": urlparse(url).netloc.lower(), "summary.length": summary_length}) as span:
+            stats["trace_id"] = span.trace_id
+            # cProfile follows the loop thread, so a profile here also shows other requests' work
+            with self.core.profile_request("summarize_url", span.trace_id):
+                title, summary, error, method = await self._summarize_url(url, summary_length, stats)
+            span.set_attributes({"extraction.method": method, "cached": stats.get("cached", False)})
+            if error:
+                span.record_error(error)
+        return title, summary, error, method
+
+    async def _summarize_url(self, url: str, summary_length: str, stats: Dict[str, Any]) -> Tuple[Optional[str], Optional[str], Optional[str], str]:
+        """Untraced body of summarize_url()."""
+        result = await asyncio.to_thread(self.core._url_preflight, url, summary_length, stats)
+        if result is not None:
+            return result
+
+        start = time.perf_counter()
+        title, content, error, method = await self.extract_content(url, stats)
+        stats["extract_time"] = time.perf_counter() - start
+        result = self.core._unsummarizable(title, content, error, method, stats)
+        if result is not None:
+            return result
+
+        start = time.perf_counter()
+        summary, error = await self.summarize_content(title or "Untitled Article", content, summary_length, stats=stats)
+        stats["summarize_time"] = time.perf_counter() - start
+        if summary:
+            await asyncio.to_thread(self.core.cache_url_summaries, url, summary_length, title, summary, method, content, stats)
+        return title, summary, error, method
+
+
+def create_async_summarizer(groq_api_key: str, firecrawl_api_key: Optional[str] = None) -> AsyncBlogSummarizer:
+    """Build an AsyncBlogSummarizer configured from environment variables."""
+    if tracer.exporter is None:
+        tracer.exporter = exporter_from_env()
+    return AsyncBlogSummarizer(groq_api_key, firecrawl_api_key, **summarizer_options_from_env())
@@ -0,0 +1,257 @@
+"""Benchmark the basic-scraping HTML parser backends and content extractors.
+
+Usage:
+    python bench_extraction.py [--runs N] [PATH ...]
+
+PATH may be HTML files or directories of *.html files. Without paths a
+synthetic corpus of news-style pages (about 100 KB, 1 MB and 3 MB) is
+generated, plus a 1 MB page whose generic ``.content`` wrapper also holds a
+long comment thread, the case where the first matching selector is not the
+article. For each page, backend and extractor the median parse time is
+reported, along with the peak resident memory of a fresh process parsing
+that page once (lxml allocates outside the Python heap, so tracemalloc
+would miss it). When a page has a sidecar .txt file with its article
+text, the word-level F1 score of the extracted content is reported too.
+"""
+import argparse
+import glob
+import os
+import random
+import resource
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from collections import Counter
+from typing import List, Optional, Tuple
+
+from extractors import CONTENT_EXTRACTORS, PARSER_BACKENDS, parse_html
+
+WORDS = (
+    "latency throughput cache server request kernel memory thread queue "
+    "engineer release deploy database index query network packet buffer "
+    "the a of and to in is that for on with as by this we it"
+).split()
+
+
+def _sentence(rng: random.Random) -> str:
+    """Return a random filler sentence."""
+    words = [rng.choice(WORDS) for _ in range(rng.randint(8, 20))]
+    return " ".join(words).capitalize() + "."
+
+
+def generate_page(target_bytes: int, seed: int = 0, layout: str = "article") -> Tuple[str, str]:
+    """Build a news-style page with chrome, sidebars and one long article.
+
+    With ``layout="comments"`` there is no <article>: the story sits in a
+    ``.content`` wrapper next to a comment thread twice its length.
+    Returns the HTML and the plain text of the article body.
+    """
+    rng = random.Random(seed)
+    nav = "".join(f'<li><a href="/section/{i}">Section {i}</a></li>' for i in range(40))
+    cards = [
+        f'<div class="card"><a href="/story/{i}">{_sentence(rng)}</a><span class="byline">Staff</span></div>'
+        for i in range(60)
+    ]
+    related = "".join(cards)
+    rail = "".join(cards[:10])
+    scripts = "".join(f"<script>window.__data{i} = {{\"k\": \"{'x' * 200}\"}};</script>" for i in range(20))
+
+    paragraphs = []
+    expected = []
+    size = 0
+    while size < target_bytes:
+        text = " ".join(_sentence(rng) for _ in range(5))
+        paragraph = f"<p>{text} <a href=\"/ref/{size}\">source</a></p>"
+        paragraphs.append(paragraph)
+        expected.append(f"{text} source")
+        size += len(paragraph) + len(rail) // 20
+
+    # Interleave related-story rails so the page is not one flat article
+    article_parts = []
+    for i, paragraph in enumerate(paragraphs):
+        article_parts.append(paragraph)
+        if i % 20 == 19:
+            article_parts.append(f'<aside class="related">{rail}</aside>')
+
+    if layout == "comments":
+        comments = []
+        comment_size = 0
+        while comment_size < 2 * size:
+            comment = (
+                f'<div class="comment"><span class="author">Reader {len(comments)}</span>'
+                f'<div class="comment-body"><p>{_sentence(rng)} {_sentence(rng)}</p></div></div>'
+            )
+            comments.append(comment)
+            comment_size += len(comment)
+        main = (
+            f"<div class=\"content\"><h1 class=\"headline\">Benchmark Article</h1>"
+            f"<div class=\"story\">{''.join(article_parts)}</div>"
+            f"<section class=\"comments\">{''.join(comments)}</section></div>"
+        )
+    else:
+        main = (
+            f"<article class=\"post\"><h1 class=\"post-title\">Benchmark Article</h1>"
+            f"<div class=\"post-content\">{''.join(article_parts)}</div></article>"
+            f"<div class=\"comments\">{related}</div>"
+        )
+
+    html = (
+        "<!DOCTYPE html><html><head><meta charset=\"utf-8\">"
+        "<title>Benchmark Article</title>"
+        "<meta property=\"og:title\" content=\"Benchmark Article\">"
+        f"{scripts}</head><body>"
+        f"<header><nav><ul>{nav}</ul></nav></header>"
+        f"<div class=\"layout\"><div class=\"sidebar\">{related}</div>{main}</div>"
+        "<footer>Copyright Example Media. All rights reserved.</footer>"
+        "</body></html>"
+    )
+    return html, " ".join(expected)
+
+
+def collect_paths(paths: List[str]) -> List[str]:
+    """Expand directories to the HTML files they contain."""
+    files = []
+    for path in paths:
+        if os.path.isdir(path):
+            files.extend(sorted(glob.glob(os.path.join(path, "*.html")) + glob.glob(os.path.join(path, "*.htm"))))
+        else:
+            files.append(path)
+    return files
+
+
+def write_synthetic_corpus(directory: str) -> List[str]:
+    """Write the generated pages to ``directory`` and return their paths."""
+    files = []
+    pages = [
+        ("100kb", 100_000, "article"),
+        ("1mb", 1_000_000, "article"),
+        ("3mb", 3_000_000, "article"),
+        ("comments-1mb", 1_000_000, "comments"),
+    ]
+    for label, target, layout in pages:
+        html, expected = generate_page(target, layout=layout)
+        path = os.path.join(directory, f"synthetic-{label}.html")
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(html)
+        with open(os.path.join(directory, f"synthetic-{label}.txt"), "w", encoding="utf-8") as f:
+            f.write(expected)
+        files.append(path)
+    return files
+
+
+def load_expected(path: str) -> Optional[str]:
+    """Return the article text from the page's sidecar .txt file, if there is one."""
+    expected_path = os.path.splitext(path)[0] + ".txt"
+    if not os.path.exists(expected_path):
+        return None
+    with open(expected_path, encoding="utf-8") as f:
+        return f.read()
+
+
+def word_f1(extracted: Optional[str], expected: str) -> float:
+    """Word-level F1 score of extracted text against the expected article text."""
+    extracted_words = Counter((extracted or "").lower().split())
+    expected_words = Counter(expected.lower().split())
+    overlap = sum((extracted_words & expected_words).values())
+    if not overlap:
+        return 0.0
+    precision = overlap / sum(extracted_words.values())
+    recall = overlap / sum(expected_words.values())
+    return 2 * precision * recall / (precision + recall)
+
+
+def measure_peak_memory(backend: str, extractor: str, path: str) -> float:
+    """Parse ``path`` once in a fresh process and return its peak RSS growth in MB."""
+    result = subprocess.run(
+        [sys.executable, os.path.abspath(__file__), "--measure-memory", backend, extractor, path],
+        capture_output=True, text=True, check=True
+    )
+    return float(result.stdout.strip())
+
+
+def _reset_peak_rss() -> bool:
+    """Reset this process's RSS high-water mark; returns False where Linux /proc is unavailable.
+
+    ru_maxrss survives fork and exec, so without a reset a child started by a
+    parent that already parsed large pages reports the parent's peak.
+    """
+    try:
+        with open("/proc/self/clear_refs", "w") as f:
+            f.write("5")
+        return True
+    except OSError:
+        return False
+
+
+def _peak_rss_mb(reset: bool) -> float:
+    """Return the RSS high-water mark in MB, since the reset if there was one."""
+    if reset:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1]) / 1024
+    # Linux reports ru_maxrss in KB, macOS in bytes
+    scale = 1024 * 1024 if sys.platform == "darwin" else 1024
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / scale
+
+
+def _measure_memory_child(backend: str, extractor: str, path: str) -> None:
+    """Child-process side of measure_peak_memory()."""
+    with open(path, "rb") as f:
+        html = f.read()
+    reset = _reset_peak_rss()
+    baseline = _peak_rss_mb(reset)
+    parse_html(html, backend, extractor=extractor)
+    peak = _peak_rss_mb(reset)
+    print(f"{peak - baseline:.1f}")
+
+
+def benchmark(files: List[str], runs: int) -> None:
+    """Print parse time, peak memory, extracted length and accuracy per page, backend and extractor."""
+    print(
+        f"{'page':<28} {'backend':<12} {'extractor':<10} {'size':>9} {'median ms':>10} "
+        f"{'peak MB':>8} {'content chars':>14} {'F1':>6}"
+    )
+    for path in files:
+        with open(path, "rb") as f:
+            html = f.read()
+        expected = load_expected(path)
+        for backend in PARSER_BACKENDS:
+            for extractor in CONTENT_EXTRACTORS:
+                timings = []
+                content = None
+                for _ in range(runs):
+                    start = time.perf_counter()
+                    _, content = parse_html(html, backend, extractor=extractor)
+                    timings.append(time.perf_counter() - start)
+                peak = measure_peak_memory(backend, extractor, path)
+                f1 = f"{word_f1(content, expected):.3f}" if expected is not None else "-"
+                print(
+                    f"{os.path.basename(path)[:28]:<28} {backend:<12} {extractor:<10} {len(html) / 1024:>7.0f}KB "
+                    f"{statistics.median(timings) * 1000:>10.1f} {peak:>8.1f} {len(content or ''):>14,} {f1:>6}"
+                )
+
+
+def main() -> None:
+    """Run the benchmark, or the memory probe when invoked as a child process."""
+    if len(sys.argv) == 5 and sys.argv[1] == "--measure-memory":
+        _measure_memory_child(sys.argv[2], sys.argv[3], sys.argv[4])
+        return
+
+    parser = argparse.ArgumentParser(description="Benchmark HTML parser backends and content extractors for basic scraping.")
+    parser.add_argument("paths", nargs="*", help="HTML files or directories (default: synthetic corpus)")
+    parser.add_argument("--runs", type=int, default=5, help="timed runs per page and backend")
+    args = parser.parse_args()
+
+    if args.paths:
+        benchmark(collect_paths(args.paths), args.runs)
+        return
+
+    with tempfile.TemporaryDirectory() as directory:
+        benchmark(write_synthetic_corpus(directory), args.runs)
+
+
+if __name__ == "__main__":
+    main()
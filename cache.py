@@ -0,0 +1,120 @@
+import hashlib
+import logging
+import os
+import sqlite3
+import threading
+import time
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+
+def content_digest(content: str) -> str:
+    """Return a stable hex digest of extracted article content."""
+    return hashlib.sha256(content.encode("utf-8")).hexdigest()
+
+
+def make_key(digest: str, summary_length: str, model: str, prompt_version: str) -> str:
+    """Build a cache key from a content digest and the summary parameters."""
+    raw = "\0".join([digest, summary_length, model, prompt_version])
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+def url_key(canonical_url: str, summary_length: str, model: str, prompt_version: str) -> str:
+    """Build the key of a URL's cached summary, which skips extraction entirely."""
+    return make_key(content_digest("url\0" + canonical_url), summary_length, model, prompt_version)
+
+
+def alias_key(canonical_url: str) -> str:
+    """Build the key under which a URL's rel=canonical or redirect target is stored."""
+    return content_digest("alias\0" + canonical_url)
+
+
+class SummaryCache:
+    """Disk-backed LRU cache of summaries with a byte budget and a TTL."""
+
+    def __init__(self, path: str, max_bytes: int = 64 * 1024 * 1024, ttl: Optional[float] = 7 * 24 * 3600):
+        """Open (or create) the SQLite cache database at ``path``."""
+        self.path = path
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self._lock = threading.Lock()
+
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            """CREATE TABLE IF NOT EXISTS summaries (
+                key TEXT PRIMARY KEY,
+                value TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                created REAL NOT NULL,
+                accessed REAL NOT NULL
+            )"""
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS summaries_accessed ON summaries (accessed)")
+
+    def get(self, key: str) -> Optional[str]:
+        """Return the cached value for ``key``, or None if missing or expired."""
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, created FROM summaries WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+
+            value, created = row
+            if self.ttl is not None and now - created > self.ttl:
+                self._conn.execute("DELETE FROM summaries WHERE key = ?", (key,))
+                return None
+
+            self._conn.execute("UPDATE summaries SET accessed = ? WHERE key = ?", (now, key))
+            return value
+
+    def set(self, key: str, value: str) -> None:
+        """Store ``value`` under ``key`` and evict old entries over the byte budget."""
+        now = time.time()
+        size = len(value.encode("utf-8"))
+        if size > self.max_bytes:
+            return
+
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO summaries (key, value, size, created, accessed) VALUES (?, ?, ?, ?, ?)",
+                (key, value, size, now, now)
+            )
+            self._evict(now)
+
+    def _evict(self, now: float) -> None:
+        """Drop expired entries, then least recently used ones until under budget."""
+        if self.ttl is not None:
+            self._conn.execute("DELETE FROM summaries WHERE created < ?", (now - self.ttl,))
+
+        total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM summaries").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+
+        rows = self._conn.execute("SELECT key, size FROM summaries ORDER BY accessed ASC").fetchall()
+        evicted = []
+        for key, size in rows:
+            if total <= self.max_bytes:
+                break
+            evicted.append((key,))
+            total -= size
+
+        self._conn.executemany("DELETE FROM summaries WHERE key = ?", evicted)
+        logger.info(f"Evicted {len(evicted)} cached summaries to stay under {self.max_bytes} bytes")
+
+    def clear(self) -> None:
+        """Remove every cached entry."""
+        with self._lock:
+            self._conn.execute("DELETE FROM summaries")
+
+    def close(self) -> None:
+        """Close the underlying database connection."""
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,132 @@
+import re
+from html import unescape
+from typing import Optional
+from urllib.parse import parse_qsl, urlencode, urljoin, urlsplit, urlunsplit
+
+# Query parameters that identify the click or campaign, never the article
+TRACKING_PARAMS = frozenset([
+    "fbclid", "gclid", "dclid", "gbraid", "wbraid", "msclkid", "yclid", "twclid", "igshid",
+    "mc_cid", "mc_eid", "_hsenc", "_hsmi", "mkt_tok", "oly_anon_id", "oly_enc_id",
+    "vero_id", "wickedid", "ref_src", "ref_url", "cmpid", "share", "s_cid",
+])
+TRACKING_PREFIXES = ("utm_", "pk_", "__twitter_impression")
+
+# AMP variants of an article: /amp, /amp/, .amp and ?amp=1 / ?outputType=amp
+AMP_PATH_PATTERN = re.compile(r'/amp/?$|\.amp(?=(?:\.html?)?$)', re.IGNORECASE)
+AMP_PARAMS = {"amp": {"", "1", "true"}, "outputtype": {"amp"}}
+AMP_CACHE_SUFFIX = ".cdn.ampproject.org"
+
+DEFAULT_PORTS = {"http": 80, "https": 443}
+
+LINK_TAG_PATTERN = re.compile(rb'<link\s[^>]*?rel\s*=\s*["\']?canonical\b[^>]*>', re.IGNORECASE)
+HREF_PATTERN = re.compile(rb'href\s*=\s*(?:"([^"]*)"|\'([^\']*)\'|([^\s>]+))', re.IGNORECASE)
+HEAD_CLOSE_PATTERN = re.compile(rb'</head\s*>', re.IGNORECASE)
+
+
+def _is_tracking_param(name: str) -> bool:
+    """Check whether a query parameter only tracks the visit."""
+    name = name.lower()
+    return name in TRACKING_PARAMS or name.startswith(TRACKING_PREFIXES)
+
+
+def _is_amp_param(name: str, value: str) -> bool:
+    """Check whether a query parameter only selects the AMP rendering."""
+    values = AMP_PARAMS.get(name.lower())
+    return values is not None and value.lower() in values
+
+
+def _unwrap_amp_cache(scheme: str, host: str, path: str) -> Optional[str]:
+    """Return the origin URL behind a Google AMP cache URL, if this is one.
+
+    AMP cache URLs look like https://example-com.cdn.ampproject.org/c/s/example.com/post
+    where /c/ serves pages and an extra /s/ marks an https origin.
+    """
+    if not host.endswith(AMP_CACHE_SUFFIX):
+        return None
+    parts = path.split("/", 4)
+    if len(parts) < 4 or parts[1] not in ("c", "v"):
+        return None
+    if parts[2] == "s":
+        return "https://" + "/".join(parts[3:])
+    return "http://" + "/".join(parts[2:])
+
+
+def canonicalize_url(url: str) -> str:
+    """Normalize a URL so that variants of the same article compare equal.
+
+    Lowercases the scheme and host, treats http as https, drops default ports,
+    fragments, tracking parameters (utm_*, fbclid, gclid, ...), AMP markers and
+    trailing slashes, and sorts the remaining query parameters. The result is
+    meant as a cache and deduplication key; fetch the URL the user gave.
+    """
+    parts = urlsplit(url.strip())
+    scheme = parts.scheme.lower()
+    host = (parts.hostname or "").rstrip(".")
+    path, query = parts.path, parts.query
+
+    origin = _unwrap_amp_cache(scheme, host, path)
+    if origin is not None:
+        return canonicalize_url(origin + (f"?{query}" if query else ""))
+
+    if scheme == "http":
+        scheme = "https"
+
+    if host.startswith("amp."):
+        host = host[len("amp."):]
+    try:
+        port = parts.port
+    except ValueError:
+        port = None
+    if port and port not in DEFAULT_PORTS.values():
+        host = f"{host}:{port}"
+
+    path = AMP_PATH_PATTERN.sub("", path)
+    path = path.rstrip("/") or "/"
+
+    params = [
+        (name, value) for name, value in parse_qsl(query, keep_blank_values=True)
+        if not _is_tracking_param(name) and not _is_amp_param(name, value)
+    ]
+    query = urlencode(sorted(params))
+
+    return urlunsplit((scheme, host, path, query, ""))
+
+
+def _same_site(a: str, b: str) -> bool:
+    """Check whether two hosts belong to the same site, ignoring www. prefixes."""
+    def strip(host: str) -> str:
+        return host[len("www."):] if host.startswith("www.") else host
+    return strip(a) == strip(b)
+
+
+def find_canonical_link(html: bytes, page_url: str) -> Optional[str]:
+    """Return the page's <link rel="canonical"> target, canonicalized.
+
+    Only the document head is searched. Links to another site are ignored,
+    since trusting them would let any page claim another site's cache entry,
+    and so are links from an inner page to the home page, a common template
+    default that says nothing about the article.
+    """
+    head_end = HEAD_CLOSE_PATTERN.search(html)
+    head = html[:head_end.start()] if head_end else html[:64 * 1024]
+
+    match = LINK_TAG_PATTERN.search(head)
+    if not match:
+        return None
+    href = HREF_PATTERN.search(match.group())
+    if not href:
+        return None
+    target = unescape(next(group for group in href.groups() if group is not None).decode("utf-8", "replace")).strip()
+    if not target:
+        return None
+
+    target = urljoin(page_url, target)
+    if urlsplit(target).scheme not in ("http", "https"):
+        return None
+    canonical = urlsplit(canonicalize_url(target))
+    page = urlsplit(canonicalize_url(page_url))
+    if not _same_site(canonical.netloc, page.netloc):
+        return None
+    if canonical.path == "/" and not canonical.query and page.path != "/":
+        return None
+    return urlunsplit(canonical)
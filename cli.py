@@ -0,0 +1,139 @@
+"""Summarize a file of URLs without the Streamlit UI.
+
+Usage:
+    python cli.py urls.txt -o summaries.jsonl --concurrency 8
+    cat urls.txt | python cli.py - --summary-length short --preserve-order
+
+Reads one URL per line (blank lines and lines starting with # are skipped)
+and writes one JSON object per URL as soon as it completes. Exits with
+status 1 if any URL failed, so scheduled runs can alert on it.
+"""
+import argparse
+import json
+import logging
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Any, Dict, Iterable, List, TextIO
+
+from dotenv import load_dotenv
+
+import metrics
+from summarizer import BlogSummarizer, create_summarizer
+
+logger = logging.getLogger(__name__)
+
+
+def read_urls(lines: Iterable[str]) -> List[str]:
+    """Return the URLs in ``lines``, skipping blanks and comments."""
+    urls = []
+    for line in lines:
+        line = line.strip()
+        if line and not line.startswith("#"):
+            urls.append(line)
+    return urls
+
+
+def process_url(summarizer: BlogSummarizer, url: str, summary_length: str) -> Dict[str, Any]:
+    """Summarize one URL and return its JSON record."""
+    stats: Dict[str, Any] = {}
+    start = time.perf_counter()
+    try:
+        title, summary, error, method = summarizer.summarize_url(url, summary_length, stats=stats)
+    except Exception as e:
+        logger.error(f"Unexpected error for {url}: {str(e)}")
+        title, summary, error, method = None, None, f"Unexpected error: {str(e)}", "unknown"
+
+    return {
+        "url": url,
+        "title": title,
+        "summary": summary,
+        "method": method,
+        "timings": {
+            "extract": stats.get("extract_time"),
+            "summarize": stats.get("summarize_time"),
+            "total": time.perf_counter() - start,
+        },
+        "stages": stats.get("timings", {}),
+        "bytes_downloaded": stats.get("bytes_downloaded"),
+        "token_usage": stats.get("token_usage"),
+        "trace_id": stats.get("trace_id"),
+        "error": error,
+    }
+
+
+def run(summarizer: BlogSummarizer, urls: List[str], output: TextIO, summary_length: str = "medium",
+        concurrency: int = 4, preserve_order: bool = False) -> int:
+    """Summarize ``urls`` concurrently, writing JSON lines to ``output``; returns the error count."""
+    errors = 0
+    pending: Dict[int, Dict[str, Any]] = {}
+    next_index = 0
+
+    def write(record: Dict[str, Any]) -> None:
+        output.write(json.dumps(record, ensure_ascii=False) + "\n")
+        output.flush()
+
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        futures = {
+            executor.submit(process_url, summarizer, url, summary_length): index
+            for index, url in enumerate(urls)
+        }
+        for future in as_completed(futures):
+            record = future.result()
+            if record["error"]:
+                errors += 1
+
+            if not preserve_order:
+                write(record)
+                continue
+
+            # Hold completed records until every earlier URL has been written
+            pending[futures[future]] = record
+            while next_index in pending:
+                write(pending.pop(next_index))
+                next_index += 1
+
+    return errors
+
+
+def main() -> int:
+    """Command-line entry point."""
+    parser = argparse.ArgumentParser(description="Summarize blog posts and articles from a list of URLs.")
+    parser.add_argument("input", nargs="?", default="-", help="file with one URL per line, or - for stdin (default)")
+    parser.add_argument("-o", "--output", default="-", help="JSON Lines output file, or - for stdout (default)")
+    parser.add_argument("-c", "--concurrency", type=int, default=4, help="URLs processed at once (default: 4)")
+    parser.add_argument("-l", "--summary-length", choices=["short", "medium", "long"], default="medium")
+    parser.add_argument("--preserve-order", action="store_true", help="write results in input order")
+    args = parser.parse_args()
+
+    load_dotenv()
+    logging.basicConfig(level=logging.INFO, stream=sys.stderr)
+
+    groq_api_key = os.getenv("GROQ_API_KEY")
+    if not groq_api_key:
+        parser.error("GROQ_API_KEY is not set. Add it to the environment or the .env file.")
+
+    if args.input == "-":
+        urls = read_urls(sys.stdin)
+    else:
+        with open(args.input, encoding="utf-8") as f:
+            urls = read_urls(f)
+
+    summarizer = create_summarizer(groq_api_key, os.getenv("FIRECRAWL_API_KEY"))
+    metrics.start_http_server_from_env()
+
+    output = sys.stdout if args.output == "-" else open(args.output, "w", encoding="utf-8")
+    try:
+        start = time.perf_counter()
+        errors = run(summarizer, urls, output, args.summary_length, args.concurrency, args.preserve_order)
+    finally:
+        if output is not sys.stdout:
+            output.close()
+
+    logger.info(f"Summarized {len(urls) - errors}/{len(urls)} URLs in {time.perf_counter() - start:.1f}s")
+    return 1 if errors else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,153 @@
+import re
+from typing import List, Tuple
+
+import numpy as np
+
+from text_utils import PARAGRAPH_BOUNDARY, SENTENCE_BOUNDARY, estimate_tokens
+
+WORD_PATTERN = re.compile(r'\w+', re.UNICODE)
+
+# Fragments this short ("Share this", "Read more") are chrome, not content,
+# unless they are headings
+MIN_SENTENCE_WORDS = 4
+
+# Terms used by a single sentence add nothing to sentence similarity; of the
+# rest, only the most widespread are kept to bound the matrix size
+MAX_FEATURES = 4096
+
+# Longer texts are ranked in windows of this many consecutive sentences, so
+# the similarity matrix stays at most 2000 x 2000 (16 MB) however long the
+# text; that is some 150 KB of prose per window
+MAX_SENTENCES = 2000
+
+DAMPING = 0.85
+MAX_ITERATIONS = 100
+TOLERANCE = 1e-6
+
+
+def split_sentences(text: str) -> List[Tuple[int, str]]:
+    """Split text into (paragraph index, sentence) pairs, dropping repeats and short fragments."""
+    sentences = []
+    seen = set()
+    for paragraph_index, paragraph in enumerate(PARAGRAPH_BOUNDARY.split(text)):
+        for sentence in SENTENCE_BOUNDARY.split(paragraph.strip()):
+            sentence = sentence.strip()
+            if not sentence:
+                continue
+            if len(sentence.split()) < MIN_SENTENCE_WORDS and not sentence.startswith("#"):
+                continue
+            key = " ".join(WORD_PATTERN.findall(sentence.lower()))
+            if key in seen:
+                continue
+            seen.add(key)
+            sentences.append((paragraph_index, sentence))
+    return sentences
+
+
+def textrank(sentences: List[str]) -> np.ndarray:
+    """Score sentences by TextRank over their TF-IDF cosine similarity graph.
+
+    Beyond MAX_SENTENCES the text is ranked window by window; scores are
+    scaled by window size so they stay comparable across windows.
+    """
+    count = len(sentences)
+    if count <= MAX_SENTENCES:
+        return _textrank(sentences)
+    scores = np.empty(count)
+    for start in range(0, count, MAX_SENTENCES):
+        window = sentences[start:start + MAX_SENTENCES]
+        scores[start:start + len(window)] = _textrank(window) * len(window) / count
+    return scores
+
+
+def _textrank(sentences: List[str]) -> np.ndarray:
+    """TextRank scores of one window of sentences; see textrank()."""
+    count = len(sentences)
+    if count < 3:
+        return np.ones(count)
+
+    vocabulary = {}
+    rows, columns = [], []
+    for i, sentence in enumerate(sentences):
+        for word in WORD_PATTERN.findall(sentence.lower()):
+            rows.append(i)
+            columns.append(vocabulary.setdefault(word, len(vocabulary)))
+    if not vocabulary:
+        return np.ones(count)
+
+    # Term counts per (sentence, term) pair, without a sentences x vocabulary matrix
+    pairs, term_counts = np.unique(
+        np.array(rows, dtype=np.int64) * len(vocabulary) + np.array(columns, dtype=np.int64),
+        return_counts=True
+    )
+    pair_rows, pair_columns = np.divmod(pairs, len(vocabulary))
+    document_frequency = np.bincount(pair_columns, minlength=len(vocabulary))
+
+    features = np.flatnonzero(document_frequency > 1)
+    if features.size == 0:
+        return np.ones(count)
+    if features.size > MAX_FEATURES:
+        features = features[np.argsort(-document_frequency[features], kind="stable")[:MAX_FEATURES]]
+    idf = np.log((1 + count) / (1 + document_frequency[features])) + 1
+
+    # Only the kept feature columns are allocated
+    feature_index = np.full(len(vocabulary), -1)
+    feature_index[features] = np.arange(features.size)
+    kept = feature_index[pair_columns] >= 0
+    kept_columns = feature_index[pair_columns[kept]]
+
+    # Sublinear TF-IDF, L2-normalized so the dot product is cosine similarity
+    weights = np.zeros((count, features.size), dtype=np.float32)
+    weights[pair_rows[kept], kept_columns] = np.log1p(term_counts[kept]) * idf[kept_columns]
+    norms = np.linalg.norm(weights, axis=1, keepdims=True)
+    weights /= np.where(norms > 0, norms, 1)
+    similarity = weights @ weights.T
+    np.fill_diagonal(similarity, 0)
+
+    # Row-normalize into a transition matrix; isolated sentences link to all
+    totals = similarity.sum(axis=1, keepdims=True)
+    transition = np.where(totals > 0, similarity / np.where(totals > 0, totals, 1), 1 / count)
+
+    scores = np.full(count, 1 / count)
+    for _ in range(MAX_ITERATIONS):
+        updated = (1 - DAMPING) / count + DAMPING * (transition.T @ scores)
+        if np.abs(updated - scores).sum() < TOLERANCE:
+            scores = updated
+            break
+        scores = updated
+    return scores
+
+
+def compress_to_budget(text: str, max_tokens: int) -> Tuple[str, float]:
+    """Keep the highest-ranked sentences, in their original order, within ``max_tokens``.
+
+    Repeated sentences and short fragments are dropped first. Returns the
+    compressed text and the compression ratio (output tokens / input tokens).
+    """
+    original_tokens = estimate_tokens(text)
+    if not original_tokens:
+        return text, 1.0
+
+    sentences = split_sentences(text)
+    costs = np.array([estimate_tokens(sentence) for _, sentence in sentences])
+    if costs.sum() > max_tokens:
+        scores = textrank([sentence for _, sentence in sentences])
+        keep = np.zeros(len(sentences), dtype=bool)
+        used = 0
+        # Highest score first; earlier sentences win ties
+        for index in np.argsort(-scores, kind="stable"):
+            if used + costs[index] <= max_tokens:
+                keep[index] = True
+                used += costs[index]
+        sentences = [sentence for sentence, kept in zip(sentences, keep) if kept]
+
+    paragraphs = []
+    last_paragraph = None
+    for paragraph_index, sentence in sentences:
+        if paragraph_index == last_paragraph:
+            paragraphs[-1] += " " + sentence
+        else:
+            paragraphs.append(sentence)
+            last_paragraph = paragraph_index
+    compressed = "\n\n".join(paragraphs)
+    return compressed, estimate_tokens(compressed) / original_tokens
@@ -0,0 +1,561 @@
+import codecs
+import json
+import re
+from contextlib import nullcontext
+from html import unescape
+from typing import Any, Callable, ContextManager, Dict, Iterator, List, Optional, Tuple
+
+from bs4 import BeautifulSoup, NavigableString, Tag
+from bs4.element import PreformattedString
+import lxml.html
+from lxml import etree
+
+from text_utils import normalize_whitespace
+
+# Elements that never contain article text
+UNWANTED_TAGS = ["script", "style", "nav", "footer", "header", "aside", "iframe", "noscript"]
+
+TITLE_SELECTORS = [
+    'title', 'h1', '.post-title', '.entry-title', '.article-title',
+    '[property="og:title"]', '.headline', '.page-title'
+]
+
+CONTENT_SELECTORS = [
+    'article', '.post-content', '.entry-content', '.article-content',
+    '.content', 'main', '.post', '.blog-post', '[role="main"]',
+    '.story-body', '.article-body', '.post-body'
+]
+
+# Minimum characters for a selector match to count as the article body
+MIN_CONTENT_LENGTH = 200
+
+# Stage timers take a stage name and return a context manager timing the block
+StageTimer = Callable[[str], ContextManager[None]]
+
+
+def no_timer(stage: str) -> ContextManager[None]:
+    """Stage timer that records nothing."""
+    return nullcontext()
+
+
+BOILERPLATE_PATTERN = re.compile(r'(Skip to content|Copyright|All rights reserved|Privacy Policy|Terms of Service).*', re.IGNORECASE | re.DOTALL)
+
+
+def clean_content(content: Optional[str]) -> Optional[str]:
+    """Collapse whitespace within paragraphs and cut trailing site boilerplate."""
+    if not content:
+        return content
+    content = normalize_whitespace(content)
+    content = BOILERPLATE_PATTERN.sub('', content)
+    return content.strip()
+
+
+def _join_blocks(fragments: List[Optional[str]]) -> str:
+    """Join text fragments into paragraphs separated by blank lines; None marks a block boundary.
+
+    Within a paragraph fragments are joined like get_text(separator=' ', strip=True).
+    """
+    paragraphs = []
+    current: List[str] = []
+    for fragment in fragments + [None]:
+        if fragment is not None:
+            current.append(fragment)
+        elif current:
+            paragraph = ' '.join(' '.join(current).split())
+            if paragraph:
+                paragraphs.append(paragraph)
+            current = []
+    return '\n\n'.join(paragraphs)
+
+
+def _soup_block_text(element: Tag) -> str:
+    """Text of a BeautifulSoup element with a blank line around each block-level element."""
+    fragments: List[Optional[str]] = []
+    stack: List[Any] = [element]
+    while stack:
+        item = stack.pop()
+        if item is None:
+            fragments.append(None)
+        elif isinstance(item, Tag):
+            if item.name in BLOCK_TAGS:
+                fragments.append(None)
+                stack.append(None)
+            stack.extend(reversed(item.contents))
+        elif isinstance(item, NavigableString) and not isinstance(item, PreformattedString):
+            fragments.append(item)
+    return _join_blocks(fragments)
+
+
+def parse_with_soup(html: bytes, features: str = 'html.parser', encoding: Optional[str] = None,
+                    extractor: str = 'density', timer: StageTimer = no_timer) -> Tuple[Optional[str], Optional[str]]:
+    """Extract title and content with BeautifulSoup and the given tree builder."""
+    with timer("parse_tree"):
+        soup = BeautifulSoup(html, features, from_encoding=encoding)
+
+        # Remove unwanted elements
+        for element in soup(UNWANTED_TAGS):
+            element.decompose()
+
+    with timer("extract_content"):
+        if extractor == 'density':
+            title, content = _density_extract_soup(soup)
+        else:
+            title, content = _selector_extract_soup(soup)
+
+    with timer("clean_content"):
+        return title, clean_content(content)
+
+
+def _selector_extract_soup(soup: BeautifulSoup) -> Tuple[Optional[str], Optional[str]]:
+    """Find the title and main content by trying each selector in turn."""
+    # Extract title
+    title = None
+    for selector in TITLE_SELECTORS:
+        title_elem = soup.select_one(selector)
+        if title_elem:
+            title = title_elem.get('content', '').strip() if title_elem.name == 'meta' else title_elem.get_text().strip()
+            if title:
+                break
+
+    # Extract main content
+    content = None
+    for selector in CONTENT_SELECTORS:
+        content_elem = soup.select_one(selector)
+        if content_elem:
+            content = _soup_block_text(content_elem)
+            if len(content) > MIN_CONTENT_LENGTH:  # Ensure substantial content
+                break
+
+    # Final fallback to body content
+    if not content or len(content) < MIN_CONTENT_LENGTH:
+        body = soup.find('body')
+        if body:
+            content = _soup_block_text(body)
+
+    return title, content
+
+
+def _selector_to_xpath(selector: str) -> etree.XPath:
+    """Compile one of the simple tag, class or attribute selectors above to XPath."""
+    if selector.startswith('.'):
+        expression = f"//*[contains(concat(' ', normalize-space(@class), ' '), ' {selector[1:]} ')]"
+    elif selector.startswith('['):
+        name, value = selector[1:-1].split('=', 1)
+        expression = f"//*[@{name}={value}]"
+    else:
+        expression = f"//{selector}"
+    return etree.XPath(f"({expression})[1]")
+
+
+TITLE_XPATHS = [_selector_to_xpath(selector) for selector in TITLE_SELECTORS]
+CONTENT_XPATHS = [_selector_to_xpath(selector) for selector in CONTENT_SELECTORS]
+
+
+def _element_text(element: etree._Element) -> str:
+    """Join stripped text fragments like BeautifulSoup's get_text(separator=' ', strip=True)."""
+    return ' '.join(fragment.strip() for fragment in element.itertext() if fragment.strip())
+
+
+def _lxml_block_text(element: etree._Element) -> str:
+    """Text of an lxml element with a blank line around each block-level element."""
+    fragments: List[Optional[str]] = []
+    for event, item in etree.iterwalk(element, events=('start', 'end')):
+        # Comments and processing instructions contribute only their tails
+        is_element = isinstance(item.tag, str)
+        if is_element and item.tag in BLOCK_TAGS:
+            fragments.append(None)
+        if event == 'start':
+            if is_element and item.text:
+                fragments.append(item.text)
+        elif item is not element and item.tail:
+            fragments.append(item.tail)
+    return _join_blocks(fragments)
+
+
+def parse_with_lxml(html: bytes, encoding: Optional[str] = None, extractor: str = 'density',
+                    timer: StageTimer = no_timer) -> Tuple[Optional[str], Optional[str]]:
+    """Extract title and content with lxml.html and precompiled XPath selectors."""
+    with timer("parse_tree"):
+        parser = lxml.html.HTMLParser(encoding=encoding, remove_comments=True) if encoding else lxml.html.HTMLParser(remove_comments=True)
+        try:
+            doc = lxml.html.document_fromstring(html, parser=parser)
+        except etree.ParserError:
+            return None, None
+
+        # Remove unwanted elements, keeping the text that follows them
+        etree.strip_elements(doc, *UNWANTED_TAGS, with_tail=False)
+
+    with timer("extract_content"):
+        if extractor == 'density':
+            title, content = _density_extract_lxml(doc)
+        else:
+            title, content = _selector_extract_lxml(doc)
+
+    with timer("clean_content"):
+        return title, clean_content(content)
+
+
+def _selector_extract_lxml(doc: etree._Element) -> Tuple[Optional[str], Optional[str]]:
+    """Find the title and main content by trying each compiled XPath in turn."""
+    # Extract title
+    title = None
+    for xpath in TITLE_XPATHS:
+        matches = xpath(doc)
+        if matches:
+            title_elem = matches[0]
+            title = (title_elem.get('content') or '').strip() if title_elem.tag == 'meta' else _element_text(title_elem)
+            if title:
+                break
+
+    # Extract main content
+    content = None
+    for xpath in CONTENT_XPATHS:
+        matches = xpath(doc)
+        if matches:
+            content = _lxml_block_text(matches[0])
+            if len(content) > MIN_CONTENT_LENGTH:
+                break
+
+    # Final fallback to body content
+    if not content or len(content) < MIN_CONTENT_LENGTH:
+        body = doc.find('body')
+        if body is not None:
+            content = _lxml_block_text(body)
+
+    return title, content
+
+
+# Single-pass density scoring, a compact take on Readability's heuristics.
+# Every block of running text scores points for its parent and half as many
+# for its grandparent; candidates are then weighted by tag semantics and
+# class/id hints and discounted by their link density.
+BLOCK_TAGS = frozenset([
+    'address', 'article', 'aside', 'blockquote', 'body', 'dd', 'details', 'div', 'dl', 'dt',
+    'fieldset', 'figcaption', 'figure', 'footer', 'form', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6',
+    'header', 'li', 'main', 'nav', 'ol', 'p', 'pre', 'section', 'table', 'tbody', 'td',
+    'tfoot', 'th', 'thead', 'tr', 'ul'
+])
+
+TAG_WEIGHTS = {
+    'article': 10, 'main': 5, 'div': 5, 'section': 3, 'pre': 3, 'td': 3, 'blockquote': 3,
+    'address': -3, 'ol': -3, 'ul': -3, 'dl': -3, 'dd': -3, 'dt': -3, 'li': -3, 'form': -3,
+    'h1': -5, 'h2': -5, 'h3': -5, 'h4': -5, 'h5': -5, 'h6': -5, 'th': -5
+}
+
+POSITIVE_HINTS = re.compile(r'article|body|content|entry|hentry|main|page|post|text|blog|story', re.IGNORECASE)
+NEGATIVE_HINTS = re.compile(
+    r'comment|contact|foot|masthead|media|meta|outbrain|promo|related|scroll|share|shoutbox|'
+    r'sidebar|sponsor|shopping|tags|tool|widget|nav|menu|advert|byline|card|popup|subscribe',
+    re.IGNORECASE
+)
+
+# Minimum characters of running text for a block to count as a paragraph
+PARAGRAPH_MIN_LENGTH = 25
+
+# Title selectors above, split by what they match on
+TITLE_TAG_SLOTS = {selector: i for i, selector in enumerate(TITLE_SELECTORS) if selector.isalnum()}
+TITLE_CLASS_SLOTS = {selector[1:]: i for i, selector in enumerate(TITLE_SELECTORS) if selector.startswith('.')}
+TITLE_ATTRIBUTE_SLOTS = {
+    tuple(part.strip('"') for part in selector[1:-1].split('=', 1)): i
+    for i, selector in enumerate(TITLE_SELECTORS) if selector.startswith('[')
+}
+
+
+class _Node:
+    """Running totals for one element during the density walk."""
+    __slots__ = ('element', 'parent', 'tag', 'weight', 'text', 'links', 'inline', 'commas', 'score')
+
+    def __init__(self, element: Any, parent: Optional['_Node'], tag: str):
+        self.element = element
+        self.parent = parent
+        self.tag = tag
+        self.weight = 0
+        self.text = 0      # characters of text anywhere inside the element
+        self.links = 0     # of which inside links
+        self.inline = 0    # characters of text not inside a nested block
+        self.commas = 0    # commas in that inline text
+        self.score = 0.0   # points received from child paragraphs
+
+
+def _hint_weight(tag: str, class_and_id: str) -> int:
+    """Weight a block by its tag and class/id names."""
+    weight = TAG_WEIGHTS.get(tag, 0)
+    if class_and_id:
+        if POSITIVE_HINTS.search(class_and_id):
+            weight += 25
+        if NEGATIVE_HINTS.search(class_and_id):
+            weight -= 25
+    return weight
+
+
+def _add_text(node: _Node, text: Optional[str]) -> None:
+    """Count a text fragment that sits directly inside ``node``."""
+    if text:
+        length = len(text.strip())
+        if length:
+            node.text += length
+            node.inline += length
+            node.commas += text.count(',')
+
+
+def _finish(node: _Node, candidates: set) -> None:
+    """Post-order step: score paragraphs and roll totals up into the parent."""
+    if node.tag == 'a':
+        node.links = node.text
+
+    parent = node.parent
+    if parent is None:
+        return
+
+    if node.tag in BLOCK_TAGS and node.inline >= PARAGRAPH_MIN_LENGTH:
+        points = 1 + node.commas + min(node.inline // 100, 3)
+        parent.score += points
+        candidates.add(parent)
+        if parent.parent is not None:
+            parent.parent.score += points / 2
+            candidates.add(parent.parent)
+
+    parent.text += node.text
+    parent.links += node.links
+    if node.tag not in BLOCK_TAGS:
+        parent.inline += node.inline
+        parent.commas += node.commas
+
+
+def _best_candidate(candidates: set) -> Optional[_Node]:
+    """Pick the candidate with the highest link-discounted score."""
+    best = None
+    best_score = 0.0
+    for node in candidates:
+        if not node.text:
+            continue
+        score = (node.score + node.weight) * (1 - node.links / node.text)
+        if score > best_score:
+            best, best_score = node, score
+    return best
+
+
+def _match_title(titles: Dict[int, Any], element: Any, tag: str, classes: List[str]) -> None:
+    """Remember the first element matching each title selector."""
+    slot = TITLE_TAG_SLOTS.get(tag)
+    if slot is not None and slot not in titles:
+        titles[slot] = element
+    for name in classes:
+        slot = TITLE_CLASS_SLOTS.get(name)
+        if slot is not None and slot not in titles:
+            titles[slot] = element
+    for (name, value), slot in TITLE_ATTRIBUTE_SLOTS.items():
+        if slot not in titles and element.get(name) == value:
+            titles[slot] = element
+
+
+def _density_extract_soup(soup: BeautifulSoup) -> Tuple[Optional[str], Optional[str]]:
+    """Find the title and main content of a BeautifulSoup tree in one walk."""
+    titles: Dict[int, Tag] = {}
+    candidates: set = set()
+    stack: List[Tuple[Any, Optional[_Node]]] = [(soup, None)]
+    while stack:
+        item, parent = stack.pop()
+        if isinstance(item, _Node):
+            _finish(item, candidates)
+        elif isinstance(item, Tag):
+            node = _Node(item, parent, item.name)
+            classes = item.get('class') or []
+            _match_title(titles, item, item.name, classes)
+            if item.name in BLOCK_TAGS:
+                node.weight = _hint_weight(item.name, f"{' '.join(classes)} {item.get('id', '')}")
+            stack.append((node, None))
+            stack.extend((child, node) for child in reversed(item.contents))
+        elif isinstance(item, NavigableString) and not isinstance(item, PreformattedString) and parent is not None:
+            _add_text(parent, item)
+
+    title = None
+    for slot in sorted(titles):
+        element = titles[slot]
+        title = element.get('content', '').strip() if element.name == 'meta' else element.get_text().strip()
+        if title:
+            break
+
+    best = _best_candidate(candidates)
+    content = _soup_block_text(best.element) if best else None
+    if not content or len(content) < MIN_CONTENT_LENGTH:
+        body = soup.find('body')
+        if body:
+            content = _soup_block_text(body)
+
+    return title, content
+
+
+def _density_extract_lxml(doc: etree._Element) -> Tuple[Optional[str], Optional[str]]:
+    """Find the title and main content of an lxml.html tree in one walk."""
+    titles: Dict[int, etree._Element] = {}
+    candidates: set = set()
+    stack: List[Tuple[Any, Optional[_Node]]] = [(doc, None)]
+    while stack:
+        item, parent = stack.pop()
+        if isinstance(item, _Node):
+            _finish(item, candidates)
+            continue
+
+        tag = item.tag
+        if not isinstance(tag, str):
+            continue  # comments and processing instructions
+
+        node = _Node(item, parent, tag)
+        classes = (item.get('class') or '').split()
+        _match_title(titles, item, tag, classes)
+        if tag in BLOCK_TAGS:
+            node.weight = _hint_weight(tag, f"{' '.join(classes)} {item.get('id', '')}")
+
+        # An element owns its own text and the tails of its children
+        _add_text(node, item.text)
+        for child in item:
+            _add_text(node, child.tail)
+
+        stack.append((node, None))
+        stack.extend((child, node) for child in reversed(item))
+
+    title = None
+    for slot in sorted(titles):
+        element = titles[slot]
+        title = (element.get('content') or '').strip() if element.tag == 'meta' else _element_text(element)
+        if title:
+            break
+
+    best = _best_candidate(candidates)
+    content = _lxml_block_text(best.element) if best else None
+    if not content or len(content) < MIN_CONTENT_LENGTH:
+        body = doc.find('body')
+        if body is not None:
+            content = _lxml_block_text(body)
+
+    return title, content
+
+
+# Structured-data fast path: many CMSs embed the full article as JSON-LD, so
+# the raw bytes can be scanned for it without building a tree at all
+JSON_LD_PATTERN = re.compile(
+    rb'<script[^>]+type\s*=\s*["\']?application/ld\+json["\']?[^>]*>(.*?)</script\s*>',
+    re.IGNORECASE | re.DOTALL
+)
+META_TAG_PATTERN = re.compile(rb'<meta\s[^>]*?(?:property|name)\s*=\s*["\']?og:[^>]*>', re.IGNORECASE)
+ATTRIBUTE_PATTERN = re.compile(rb'([\w:-]+)\s*=\s*(?:"([^"]*)"|\'([^\']*)\'|([^\s>]+))')
+TAG_PATTERN = re.compile(r'<[^>]+>')
+
+# articleBody shorter than this is usually a teaser rather than the full text
+MIN_STRUCTURED_LENGTH = 500
+
+
+def _open_graph(html: bytes, encoding: str) -> Dict[str, str]:
+    """Collect og: meta properties from the raw document."""
+    properties = {}
+    for match in META_TAG_PATTERN.finditer(html):
+        attributes = {}
+        for name, double, single, bare in ATTRIBUTE_PATTERN.findall(match.group()):
+            attributes[name.lower().decode('ascii', 'ignore')] = (double or single or bare).decode(encoding, 'replace')
+        key = attributes.get('property') or attributes.get('name')
+        if key and 'content' in attributes:
+            properties.setdefault(key, unescape(attributes['content']).strip())
+    return properties
+
+
+def _iter_json_ld_items(data: Any) -> Iterator[Dict[str, Any]]:
+    """Yield every JSON-LD object, descending into lists and @graph containers."""
+    if isinstance(data, list):
+        for item in data:
+            yield from _iter_json_ld_items(item)
+    elif isinstance(data, dict):
+        yield data
+        if '@graph' in data:
+            yield from _iter_json_ld_items(data['@graph'])
+
+
+def _is_article(item: Dict[str, Any]) -> bool:
+    """Check whether a JSON-LD object is some kind of article or blog post."""
+    types = item.get('@type', [])
+    if isinstance(types, str):
+        types = [types]
+    return any(isinstance(t, str) and ('Article' in t or 'Posting' in t) for t in types)
+
+
+def known_encoding(name: Optional[str]) -> Optional[str]:
+    """Return ``name`` if Python knows the codec, else None (e.g. charset=utf8mb4 from a MySQL-backed CMS)."""
+    if not name:
+        return None
+    try:
+        codecs.lookup(name)
+    except LookupError:
+        return None
+    return name
+
+
+def extract_structured_data(html: bytes, encoding: Optional[str] = None) -> Tuple[Optional[str], Optional[str]]:
+    """Extract title and content from JSON-LD articleBody and Open Graph tags.
+
+    Returns (None, None) unless the document carries a complete article body.
+    """
+    encoding = known_encoding(encoding) or 'utf-8'
+    for match in JSON_LD_PATTERN.finditer(html):
+        try:
+            data = json.loads(match.group(1).decode(encoding, 'replace'))
+        except ValueError:
+            continue
+
+        for item in _iter_json_ld_items(data):
+            body = item.get('articleBody')
+            if not _is_article(item) or not isinstance(body, str):
+                continue
+
+            content = TAG_PATTERN.sub(' ', unescape(body)).strip()
+            if len(content) < MIN_STRUCTURED_LENGTH:
+                continue
+
+            # Publishers that truncate articleBody usually still report the full wordCount
+            word_count = item.get('wordCount')
+            if isinstance(word_count, (int, str)) and str(word_count).isdigit() and len(content.split()) < 0.8 * int(word_count):
+                continue
+
+            title = item.get('headline') or item.get('name')
+            if not isinstance(title, str) or not title.strip():
+                title = _open_graph(html, encoding).get('og:title')
+            return unescape(title).strip() if title else None, content
+
+    return None, None
+
+
+PARSER_BACKENDS: Dict[str, Callable[..., Tuple[Optional[str], Optional[str]]]] = {
+    'html.parser': lambda html, encoding=None, extractor='density', timer=no_timer: parse_with_soup(html, 'html.parser', encoding, extractor, timer),
+    'lxml': lambda html, encoding=None, extractor='density', timer=no_timer: parse_with_soup(html, 'lxml', encoding, extractor, timer),
+    'lxml-raw': parse_with_lxml,
+}
+
+# How the main content block is located: one density-scoring walk over the
+# tree, or the original selector-by-selector search. The walk costs a few
+# milliseconds per 100 KB of HTML more than the search (about 45 ms on a 3 MB
+# page with lxml), small next to building the tree and cleaning the text, and
+# it stays on the article when a generic selector such as .content wraps the
+# comments too, where the search returns the whole thread
+CONTENT_EXTRACTORS = ('density', 'selectors')
+
+
+def parse_html(html: bytes, backend: str = 'lxml', encoding: Optional[str] = None,
+               extractor: str = 'density', structured_data: bool = True,
+               timer: StageTimer = no_timer) -> Tuple[Optional[str], Optional[str]]:
+    """Extract title and content from an HTML document with the named parser backend and extractor.
+
+    With ``structured_data`` a complete JSON-LD article body is returned
+    directly, without parsing the document. ``timer`` is entered around each
+    stage (structured_data, parse_tree, extract_content, clean_content).
+    """
+    if backend not in PARSER_BACKENDS:
+        raise ValueError(f"Unknown parser backend '{backend}'. Choose from: {', '.join(PARSER_BACKENDS)}")
+    if extractor not in CONTENT_EXTRACTORS:
+        raise ValueError(f"Unknown content extractor '{extractor}'. Choose from: {', '.join(CONTENT_EXTRACTORS)}")
+
+    if structured_data:
+        with timer("structured_data"):
+            title, content = extract_structured_data(html, encoding)
+            if content:
+                return title, clean_content(content)
+
+    return PARSER_BACKENDS[backend](html, encoding=encoding, extractor=extractor, timer=timer)
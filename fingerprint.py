@@ -0,0 +1,160 @@
+import hashlib
+import logging
+import os
+import re
+import sqlite3
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+WORD_PATTERN = re.compile(r'\w+', re.UNICODE)
+SHINGLE_SIZE = 3
+FINGERPRINT_BITS = 64
+BIT_SHIFTS = np.arange(FINGERPRINT_BITS, dtype=np.uint64)
+
+# Below this many shingles a fingerprint says little about the article
+MIN_SHINGLES = 50
+
+
+def simhash(text: str) -> Optional[int]:
+    """Return the 64-bit SimHash of the text's word 3-shingles, or None if it is too short.
+
+    Similar texts get fingerprints that differ in few bits, so the Hamming
+    distance between fingerprints approximates how much the texts differ.
+    """
+    words = WORD_PATTERN.findall(text.lower())
+    # Distinct shingles only, so repeated boilerplate cannot outvote the article
+    shingles = {" ".join(words[i:i + SHINGLE_SIZE]) for i in range(len(words) - SHINGLE_SIZE + 1)}
+    count = len(shingles)
+    if count < MIN_SHINGLES:
+        return None
+
+    hashes = np.fromiter(
+        (int.from_bytes(hashlib.blake2b(shingle.encode("utf-8"), digest_size=8).digest(), "little") for shingle in shingles),
+        dtype=np.uint64,
+        count=count
+    )
+    # Each bit of the fingerprint is the majority vote of that bit over all shingle hashes
+    ones = ((hashes[:, None] >> BIT_SHIFTS) & np.uint64(1)).sum(axis=0)
+    bits = (ones * 2 > count).astype(np.uint64)
+    return int((bits << BIT_SHIFTS).sum())
+
+
+def hamming_distance(a: int, b: int) -> int:
+    """Number of differing bits between two fingerprints."""
+    return bin(a ^ b).count("1")
+
+
+class FingerprintIndex:
+    """LSH index from SimHash fingerprints to the content digests they came from.
+
+    Fingerprints are split into ``max_distance + 1`` bands; by the pigeonhole
+    principle two fingerprints within ``max_distance`` bits agree on at least
+    one whole band, so a lookup only compares against the entries sharing a
+    band value instead of scanning the index. With 16-bit bands a million
+    entries leave a few dozen candidates per lookup.
+
+    With a ``path`` the index is persisted in SQLite (the summary cache
+    database can be shared) and loaded into memory on start. The oldest
+    entries are dropped beyond ``max_entries``.
+    """
+
+    def __init__(self, path: Optional[str] = None, max_distance: int = 3, max_entries: int = 2_000_000):
+        if not 0 <= max_distance < FINGERPRINT_BITS // 4:
+            raise ValueError(f"max_distance must be between 0 and {FINGERPRINT_BITS // 4 - 1}")
+        self.max_distance = max_distance
+        self.max_entries = max_entries
+        self.bands = max_distance + 1
+        self.band_bits = FINGERPRINT_BITS // self.bands
+        self._band_mask = (1 << self.band_bits) - 1
+
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[str, int]" = OrderedDict()
+        self._buckets: List[Dict[int, List[str]]] = [{} for _ in range(self.bands)]
+
+        self._conn = None
+        if path:
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+            self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                """CREATE TABLE IF NOT EXISTS fingerprints (
+                    digest TEXT PRIMARY KEY,
+                    fingerprint INTEGER NOT NULL,
+                    created REAL NOT NULL DEFAULT (julianday('now'))
+                )"""
+            )
+            for digest, fingerprint in self._conn.execute("SELECT digest, fingerprint FROM fingerprints ORDER BY created"):
+                # SQLite integers are signed; fingerprints are stored as their signed 64-bit value
+                self._insert(digest, fingerprint & (2 ** FINGERPRINT_BITS - 1))
+            logger.info(f"Loaded {len(self._entries):,} content fingerprints")
+
+    def _band_values(self, fingerprint: int) -> List[int]:
+        """Split a fingerprint into its band values."""
+        return [(fingerprint >> (band * self.band_bits)) & self._band_mask for band in range(self.bands)]
+
+    def _insert(self, digest: str, fingerprint: int) -> None:
+        """Add an entry to the in-memory index (lock held)."""
+        if digest in self._entries:
+            return
+        self._entries[digest] = fingerprint
+        for buckets, value in zip(self._buckets, self._band_values(fingerprint)):
+            buckets.setdefault(value, []).append(digest)
+
+    def _remove(self, digest: str) -> None:
+        """Drop an entry from the in-memory index (lock held)."""
+        fingerprint = self._entries.pop(digest)
+        for buckets, value in zip(self._buckets, self._band_values(fingerprint)):
+            bucket = buckets[value]
+            bucket.remove(digest)
+            if not bucket:
+                del buckets[value]
+
+    def add(self, digest: str, fingerprint: int) -> None:
+        """Index the fingerprint of the content with this digest."""
+        with self._lock:
+            if digest in self._entries:
+                return
+            self._insert(digest, fingerprint)
+            evicted = []
+            while len(self._entries) > self.max_entries:
+                oldest = next(iter(self._entries))
+                self._remove(oldest)
+                evicted.append(oldest)
+
+            if self._conn is not None:
+                signed = fingerprint - 2 ** FINGERPRINT_BITS if fingerprint >= 2 ** (FINGERPRINT_BITS - 1) else fingerprint
+                self._conn.execute(
+                    "INSERT OR IGNORE INTO fingerprints (digest, fingerprint) VALUES (?, ?)",
+                    (digest, signed)
+                )
+                if evicted:
+                    self._conn.executemany("DELETE FROM fingerprints WHERE digest = ?", [(d,) for d in evicted])
+
+    def find(self, fingerprint: int, exclude: Optional[str] = None) -> Optional[Tuple[str, int]]:
+        """Return the (digest, distance) of the closest entry within ``max_distance`` bits, if any."""
+        best = None
+        with self._lock:
+            for buckets, value in zip(self._buckets, self._band_values(fingerprint)):
+                for digest in buckets.get(value, ()):
+                    if digest == exclude:
+                        continue
+                    distance = hamming_distance(fingerprint, self._entries[digest])
+                    if distance <= self.max_distance and (best is None or distance < best[1]):
+                        best = (digest, distance)
+        return best
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+    def close(self) -> None:
+        """Close the database connection."""
+        if self._conn is not None:
+            with self._lock:
+                self._conn.close()
+                self._conn = None
@@ -0,0 +1,336 @@
+import bisect
+import logging
+import math
+import os
+import threading
+import time
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, ContextManager, Dict, Iterator, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Prometheus text exposition format
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Bucket upper bounds, in seconds, bytes and tokens
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+SIZE_BUCKETS = tuple(1024 * 4 ** i for i in range(9))
+TOKEN_BUCKETS = tuple(2 ** i for i in range(6, 15))
+
+
+class Metric:
+    """Base for thread-safe metrics whose series are keyed by label values."""
+
+    kind = "untyped"
+
+    def __init__(self, name: str, description: str, label_names: Sequence[str] = ()):
+        self.name = name
+        self.description = description
+        self.label_names = tuple(label_names)
+        self._lock = threading.Lock()
+        self._series: Dict[Tuple[str, ...], Any] = {}
+
+    def _key(self, labels: Dict[str, Any]) -> Tuple[str, ...]:
+        return tuple(str(labels.get(name, "")) for name in self.label_names)
+
+    def snapshot(self) -> Dict[Tuple[str, ...], Any]:
+        """Return the current value per label combination."""
+        with self._lock:
+            return dict(self._series)
+
+
+class Counter(Metric):
+    """Monotonically increasing count, e.g. requests or tokens."""
+
+    kind = "counter"
+
+    def inc(self, amount: float = 1.0, **labels: Any) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._series[key] = self._series.get(key, 0.0) + amount
+
+
+class Gauge(Metric):
+    """Value that goes up and down, e.g. operations in progress.
+
+    With a ``function`` the value is computed from it (returning values per
+    label combination) whenever the gauge is read.
+    """
+
+    kind = "gauge"
+
+    def __init__(self, name: str, description: str, label_names: Sequence[str] = (),
+                 function: Optional[Callable[[], Dict[Tuple[str, ...], float]]] = None):
+        super().__init__(name, description, label_names)
+        self.function = function
+
+    def inc(self, amount: float = 1.0, **labels: Any) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._series[key] = self._series.get(key, 0.0) + amount
+
+    def dec(self, amount: float = 1.0, **labels: Any) -> None:
+        self.inc(-amount, **labels)
+
+    @contextmanager
+    def track(self, **labels: Any) -> Iterator[None]:
+        """Count the block as in progress while it runs."""
+        self.inc(**labels)
+        try:
+            yield
+        finally:
+            self.dec(**labels)
+
+    def snapshot(self) -> Dict[Tuple[str, ...], float]:
+        if self.function is not None:
+            return self.function()
+        return super().snapshot()
+
+
+class Histogram(Metric):
+    """Thread-safe cumulative histogram with optional labels, in the Prometheus model."""
+
+    kind = "histogram"
+
+    def __init__(self, name: str, description: str, buckets: Sequence[float], label_names: Sequence[str] = ()):
+        super().__init__(name, description, label_names)
+        self.buckets = tuple(sorted(buckets))
+        # Series values are [per-bucket counts (plus +Inf), sum, count]
+
+    def observe(self, value: float, **labels: Any) -> None:
+        """Record one observation."""
+        key = self._key(labels)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            series[0][index] += 1
+            series[1] += value
+            series[2] += 1
+
+    def snapshot(self) -> Dict[Tuple[str, ...], Dict[str, Any]]:
+        """Return cumulative bucket counts, sum and count per label combination."""
+        with self._lock:
+            result = {}
+            for key, (counts, total, count) in self._series.items():
+                cumulative = []
+                running = 0
+                for bucket_count in counts:
+                    running += bucket_count
+                    cumulative.append(running)
+                result[key] = {"buckets": cumulative, "sum": total, "count": count}
+            return result
+
+
+STAGE_SECONDS = Histogram(
+    "blog_summarizer_stage_seconds", "Time spent in each stage of extraction and summarization.",
+    LATENCY_BUCKETS, ("stage",)
+)
+DOWNLOAD_BYTES = Histogram(
+    "blog_summarizer_download_bytes", "Bytes of HTML read per fetched page.", SIZE_BUCKETS
+)
+LLM_TOKENS = Histogram(
+    "blog_summarizer_llm_tokens", "Tokens per Groq call, by kind.", TOKEN_BUCKETS, ("kind",)
+)
+EXTRACTION_SECONDS = Histogram(
+    "blog_summarizer_extraction_seconds", "End-to-end content extraction time, by method.",
+    LATENCY_BUCKETS, ("method",)
+)
+EXTRACTIONS = Counter(
+    "blog_summarizer_extractions_total", "Content extractions performed (not coalesced callers), by method and outcome.", ("method", "outcome")
+)
+GROQ_REQUESTS = Counter(
+    "blog_summarizer_groq_requests_total", "Groq completion requests, by outcome.", ("outcome",)
+)
+TOKENS = Counter(
+    "blog_summarizer_llm_tokens_total", "Tokens Groq reported as used, by kind.", ("kind",)
+)
+CACHE_LOOKUPS = Counter(
+    "blog_summarizer_cache_lookups_total", "Summary cache lookups, by cache and result.", ("cache", "result")
+)
+IN_PROGRESS = Gauge(
+    "blog_summarizer_in_progress", "Operations currently running, by operation.", ("operation",)
+)
+
+
+def _cache_hit_ratios() -> Dict[Tuple[str, ...], float]:
+    """Share of lookups per cache that found a summary (exact or near duplicate)."""
+    totals: Dict[str, float] = {}
+    hits: Dict[str, float] = {}
+    for (cache, result), count in CACHE_LOOKUPS.snapshot().items():
+        totals[cache] = totals.get(cache, 0.0) + count
+        if result != "miss":
+            hits[cache] = hits.get(cache, 0.0) + count
+    return {(cache,): hits.get(cache, 0.0) / total for cache, total in totals.items() if total}
+
+
+CACHE_HIT_RATIO = Gauge(
+    "blog_summarizer_cache_hit_ratio", "Share of summary cache lookups that were hits since start, by cache.",
+    ("cache",), function=_cache_hit_ratios
+)
+
+REGISTRY: List[Metric] = [
+    EXTRACTIONS, EXTRACTION_SECONDS, STAGE_SECONDS, DOWNLOAD_BYTES, GROQ_REQUESTS, TOKENS, LLM_TOKENS,
+    CACHE_LOOKUPS, CACHE_HIT_RATIO, IN_PROGRESS,
+]
+
+
+@contextmanager
+def stage_timer(stats: Optional[Dict[str, Any]], stage: str) -> Iterator[None]:
+    """Time the block on the monotonic clock as ``stage``.
+
+    The duration is observed in the stage histogram and, when ``stats`` is
+    given, added to ``stats["timings"][stage]`` (stages can repeat, e.g. one
+    Groq call per chunk).
+    """
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        record_stage(stats, stage, time.perf_counter() - start)
+
+
+def record_stage(stats: Optional[Dict[str, Any]], stage: str, seconds: float) -> None:
+    """Record a stage duration measured by the caller; see stage_timer()."""
+    STAGE_SECONDS.observe(seconds, stage=stage)
+    if stats is not None:
+        timings = stats.setdefault("timings", {})
+        timings[stage] = timings.get(stage, 0.0) + seconds
+
+
+def timer_for(stats: Optional[Dict[str, Any]]) -> Callable[[str], ContextManager[None]]:
+    """Return a stage timer bound to ``stats``, for code that should not know about stats dicts."""
+    return lambda stage: stage_timer(stats, stage)
+
+
+def record_bytes(stats: Optional[Dict[str, Any]], size: int) -> None:
+    """Record the size of a downloaded page."""
+    DOWNLOAD_BYTES.observe(size)
+    if stats is not None:
+        stats["bytes_downloaded"] = stats.get("bytes_downloaded", 0) + size
+
+
+def merge_stats(stats: Optional[Dict[str, Any]], other: Optional[Dict[str, Any]]) -> None:
+    """Add stats recorded in a separate dict, e.g. by one leg of a hedged call, to ``stats``.
+
+    Timings, byte and token counts are summed; anything else is overwritten.
+    Nothing is observed in the histograms again.
+    """
+    if stats is None or not other:
+        return
+    for key, value in other.items():
+        if key in ("timings", "token_usage"):
+            totals = stats.setdefault(key, {})
+            for name, amount in value.items():
+                totals[name] = totals.get(name, 0) + amount
+        elif key == "bytes_downloaded":
+            stats[key] = stats.get(key, 0) + value
+        else:
+            stats[key] = value
+
+
+def record_tokens(stats: Optional[Dict[str, Any]], prompt_tokens: int, completion_tokens: int) -> None:
+    """Record the token usage Groq reported for one call."""
+    LLM_TOKENS.observe(prompt_tokens, kind="prompt")
+    LLM_TOKENS.observe(completion_tokens, kind="completion")
+    TOKENS.inc(prompt_tokens, kind="prompt")
+    TOKENS.inc(completion_tokens, kind="completion")
+    if stats is not None:
+        usage = stats.setdefault("token_usage", {"prompt": 0, "completion": 0})
+        usage["prompt"] += prompt_tokens
+        usage["completion"] += completion_tokens
+
+
+def record_cache_lookup(cache: str, result: str) -> None:
+    """Count a summary cache lookup; ``result`` is hit, near_duplicate or miss."""
+    CACHE_LOOKUPS.inc(cache=cache, result=result)
+
+
+def record_extraction(method: str, error: Optional[str], content: Optional[str], seconds: float) -> None:
+    """Count one extraction by method and outcome and observe its duration."""
+    if error:
+        outcome = "error"
+    elif not content or len(content.strip()) < 100:
+        outcome = "insufficient_content"
+    else:
+        outcome = "success"
+    EXTRACTIONS.inc(method=method, outcome=outcome)
+    EXTRACTION_SECONDS.observe(seconds, method=method)
+
+
+def snapshot() -> Dict[str, Any]:
+    """Return every metric as plain data, keyed by name and comma-joined label values."""
+    result = {}
+    for metric in REGISTRY:
+        series = {",".join(key): value for key, value in metric.snapshot().items()}
+        result[metric.name] = {"buckets": list(metric.buckets), "series": series} if isinstance(metric, Histogram) else series
+    return result
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    return repr(float(value))
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str]) -> str:
+    if not names:
+        return ""
+    escaped = (value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n") for value in values)
+    return "{" + ",".join(f'{name}="{value}"' for name, value in zip(names, escaped)) + "}"
+
+
+def render() -> str:
+    """Render every metric in the Prometheus text exposition format."""
+    lines = []
+    for metric in REGISTRY:
+        lines.append(f"# HELP {metric.name} {metric.description}")
+        lines.append(f"# TYPE {metric.name} {metric.kind}")
+        for key, value in sorted(metric.snapshot().items()):
+            if not isinstance(metric, Histogram):
+                lines.append(f"{metric.name}{_format_labels(metric.label_names, key)} {_format_value(value)}")
+                continue
+            names = metric.label_names + ("le",)
+            for bound, count in zip(metric.buckets + (math.inf,), value["buckets"]):
+                labels = _format_labels(names, key + (_format_value(bound),))
+                lines.append(f"{metric.name}_bucket{labels} {count}")
+            labels = _format_labels(metric.label_names, key)
+            lines.append(f"{metric.name}_sum{labels} {_format_value(value['sum'])}")
+            lines.append(f"{metric.name}_count{labels} {value['count']}")
+    return "\n".join(lines) + "\n"
+
+
+class MetricsHandler(BaseHTTPRequestHandler):
+    """Serves render() at /metrics."""
+
+    def do_GET(self) -> None:
+        if self.path.split("?", 1)[0] != "/metrics":
+            self.send_error(404)
+            return
+        payload = render().encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", CONTENT_TYPE)
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, format: str, *args: Any) -> None:
+        logger.debug(f"{self.address_string()} {format % args}")
+
+
+def start_http_server(port: int, host: str = "127.0.0.1") -> ThreadingHTTPServer:
+    """Serve /metrics on a daemon thread, for processes without an HTTP server of their own."""
+    server = ThreadingHTTPServer((host, port), MetricsHandler)
+    threading.Thread(target=server.serve_forever, name="metrics-exporter", daemon=True).start()
+    logger.info(f"Serving metrics on http://{host}:{server.server_port}/metrics")
+    return server
+
+
+def start_http_server_from_env() -> Optional[ThreadingHTTPServer]:
+    """Start the exporter on METRICS_PORT (and METRICS_HOST) if set."""
+    port = os.getenv("METRICS_PORT")
+    if not port:
+        return None
+    return start_http_server(int(port), os.getenv("METRICS_HOST", "127.0.0.1"))
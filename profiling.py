@@ -0,0 +1,174 @@
+import cProfile
+import io
+import itertools
+import logging
+import os
+import pstats
+import re
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+from typing import Callable, ContextManager, Iterator, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Lines of the hottest functions and allocation sites in the text report
+REPORT_LINES = 40
+UNSAFE_NAME_CHARACTERS = re.compile(r'[^\w.-]+')
+
+
+class Profiler:
+    """Captures cProfile and tracemalloc data for a sample of requests.
+
+    Every ``sample_every``-th request is profiled and kept. With a
+    ``latency_threshold`` (seconds) every request is profiled, since slowness
+    is only known at the end, and kept only if it took at least that long;
+    that costs the profiling overhead on all requests, so prefer sampling in
+    steady state.
+
+    For each kept request ``directory`` gets ``<time>-<trace id>-<name>.prof``
+    (load it with pstats or snakeviz) and a ``.txt`` report with the hottest
+    functions, the tracemalloc peak, the largest allocation sites at each
+    snapshot_memory() point (e.g. once the document tree is built) and the
+    allocations that survived the request. Only the newest ``keep`` captures
+    are retained.
+
+    cProfile sees only the thread that entered profile() (hedged extraction
+    and chunk summaries run on pool threads), and tracemalloc is process-wide,
+    so one request is profiled at a time; requests arriving meanwhile run
+    unprofiled.
+    """
+
+    def __init__(self, directory: str, sample_every: int = 0, latency_threshold: Optional[float] = None,
+                 keep: int = 50, trace_memory: bool = True):
+        self.directory = directory
+        self.sample_every = sample_every
+        self.latency_threshold = latency_threshold
+        self.keep = keep
+        self.trace_memory = trace_memory
+        self._requests = itertools.count(1)
+        self._busy = threading.Lock()
+        # Trace ID of the request being profiled and its mid-request snapshots
+        self._profiling: Optional[str] = None
+        self._snapshots: List[Tuple[str, tracemalloc.Snapshot]] = []
+
+    @contextmanager
+    def profile(self, name: str, trace_id: Optional[str] = None) -> Iterator[None]:
+        """Profile the block if this request is sampled or might exceed the threshold."""
+        sampled = bool(self.sample_every) and next(self._requests) % self.sample_every == 0
+        if not (sampled or self.latency_threshold is not None) or not self._busy.acquire(blocking=False):
+            yield
+            return
+
+        started_tracing = False
+        self._profiling = trace_id
+        self._snapshots = []
+        try:
+            if self.trace_memory:
+                if not tracemalloc.is_tracing():
+                    tracemalloc.start()
+                    started_tracing = True
+                tracemalloc.reset_peak()
+
+            profiler = cProfile.Profile()
+            start = time.perf_counter()
+            profiler.enable()
+            try:
+                yield
+            finally:
+                profiler.disable()
+                elapsed = time.perf_counter() - start
+                if sampled or elapsed >= self.latency_threshold:
+                    self._save(name, trace_id, elapsed, profiler, sampled)
+        finally:
+            self._profiling = None
+            self._snapshots = []
+            if started_tracing:
+                tracemalloc.stop()
+            self._busy.release()
+
+    def snapshot_memory(self, label: str, trace_id: Optional[str]) -> None:
+        """Snapshot allocations for the report if ``trace_id`` is the request being profiled.
+
+        Call it where the interesting allocations are still alive; by the end
+        of the request most of them have been freed.
+        """
+        if trace_id is None or trace_id != self._profiling or not tracemalloc.is_tracing():
+            return
+        self._snapshots.append((label, tracemalloc.take_snapshot()))
+
+    def snapshot_after(self, timer: Callable[[str], ContextManager[None]], stage: str,
+                       trace_id: Optional[str]) -> Callable[[str], ContextManager[None]]:
+        """Wrap a stage timer to call snapshot_memory() as ``stage`` ends, outside its timing."""
+        @contextmanager
+        def timed(name: str) -> Iterator[None]:
+            with timer(name):
+                yield
+            if name == stage:
+                self.snapshot_memory(f"end of {stage}", trace_id)
+
+        return timed
+
+    def _save(self, name: str, trace_id: Optional[str], elapsed: float, profiler: cProfile.Profile, sampled: bool) -> None:
+        """Write the profile and report, then drop the oldest captures."""
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            base = "-".join([
+                time.strftime("%Y%m%dT%H%M%S"),
+                trace_id or "untraced",
+                UNSAFE_NAME_CHARACTERS.sub("_", name),
+            ])
+            path = os.path.join(self.directory, base)
+            profiler.dump_stats(path + ".prof")
+
+            report = io.StringIO()
+            report.write(f"{name} trace_id={trace_id} elapsed={elapsed:.3f}s reason={'sampled' if sampled else 'slow'}\n\n")
+            stats = pstats.Stats(profiler, stream=report)
+            stats.sort_stats(pstats.SortKey.CUMULATIVE).print_stats(REPORT_LINES)
+            if tracemalloc.is_tracing():
+                current, peak = tracemalloc.get_traced_memory()
+                report.write(f"tracemalloc: peak {peak:,} bytes, {current:,} bytes still allocated at the end\n")
+                snapshots = self._snapshots + [("end of request (surviving allocations only)", tracemalloc.take_snapshot())]
+                for label, snapshot in snapshots:
+                    report.write(f"\nLargest allocation sites at {label}:\n")
+                    for statistic in snapshot.statistics("lineno")[:REPORT_LINES]:
+                        report.write(f"{statistic}\n")
+            with open(path + ".txt", "w", encoding="utf-8") as f:
+                f.write(report.getvalue())
+
+            logger.info(f"Saved profile of {name} ({elapsed:.3f}s) to {path}.prof")
+            self._rotate()
+        except Exception as e:
+            logger.warning(f"Could not save profile of {name}: {str(e)}")
+
+    def _rotate(self) -> None:
+        """Delete all but the newest ``keep`` captures."""
+        captures = sorted(
+            (entry for entry in os.scandir(self.directory) if entry.name.endswith(".prof")),
+            key=lambda entry: entry.stat().st_mtime
+        )
+        for entry in captures[:max(0, len(captures) - self.keep)]:
+            base = entry.path[:-len(".prof")]
+            for path in (base + ".prof", base + ".txt"):
+                if os.path.exists(path):
+                    os.remove(path)
+
+
+def profiler_from_env() -> Optional[Profiler]:
+    """Build a Profiler from PROFILE_SAMPLE_EVERY and PROFILE_LATENCY_THRESHOLD, if either is set.
+
+    PROFILE_DIR (default "profiles"), PROFILE_KEEP (default 50) and
+    PROFILE_MEMORY (default on) tune where and what is captured.
+    """
+    sample_every = int(os.getenv("PROFILE_SAMPLE_EVERY", "0") or 0)
+    threshold = os.getenv("PROFILE_LATENCY_THRESHOLD")
+    if sample_every <= 0 and not threshold:
+        return None
+    return Profiler(
+        os.getenv("PROFILE_DIR", "profiles"),
+        sample_every=max(0, sample_every),
+        latency_threshold=float(threshold) if threshold else None,
+        keep=int(os.getenv("PROFILE_KEEP", "50")),
+        trace_memory=os.getenv("PROFILE_MEMORY", "true").lower() in ("1", "true", "yes")
+    )
@@ -0,0 +1,144 @@
+import re
+import threading
+import time
+from typing import Any, Dict, Mapping, Optional
+
+DURATION_PART = re.compile(r'(\d+(?:\.\d+)?)(ms|h|m|s)')
+DURATION_UNITS = {"ms": 0.001, "s": 1.0, "m": 60.0, "h": 3600.0}
+
+
+def parse_duration(value: Optional[str]) -> Optional[float]:
+    """Parse Groq reset durations such as "7.66s", "2m59.56s" or "120ms" into seconds."""
+    if not value:
+        return None
+    try:
+        return float(value)
+    except ValueError:
+        pass
+    parts = DURATION_PART.findall(value)
+    if not parts:
+        return None
+    return sum(float(amount) * DURATION_UNITS[unit] for amount, unit in parts)
+
+
+class TokenBucket:
+    """A bucket that refills continuously and may go into debt to queue callers in order."""
+
+    def __init__(self, capacity: float, refill_per_second: float):
+        self.capacity = capacity
+        self.refill_per_second = refill_per_second
+        self.level = capacity
+        self.updated = time.monotonic()
+
+    def _refill(self, now: float) -> None:
+        """Add the capacity accrued since the last update."""
+        self.level = min(self.capacity, self.level + (now - self.updated) * self.refill_per_second)
+        self.updated = now
+
+    def take(self, amount: float, now: float) -> float:
+        """Take ``amount`` and return how many seconds until the bucket is out of debt."""
+        self._refill(now)
+        self.level -= min(amount, self.capacity)
+        if self.level >= 0:
+            return 0.0
+        return -self.level / self.refill_per_second
+
+    def give_back(self, amount: float, now: float) -> None:
+        """Return unused capacity from an over-estimated reservation."""
+        self._refill(now)
+        self.level = min(self.capacity, self.level + amount)
+
+    def sync(self, capacity: Optional[float], remaining: Optional[float], now: float) -> None:
+        """Align with the server's view; never assume more headroom than it reports."""
+        self._refill(now)
+        if capacity:
+            self.capacity = capacity
+            self.refill_per_second = capacity / 60
+        if remaining is not None:
+            self.level = min(self.level, remaining)
+
+
+class RateLimitScheduler:
+    """Queues Groq calls so they stay within the requests and tokens per minute quotas.
+
+    Each call reserves one request and its estimated tokens up front; callers
+    that would exceed the quota wait their turn. Groq's x-ratelimit-* response
+    headers (or a 429's retry-after) keep the buckets in sync with the server.
+    """
+
+    def __init__(self, requests_per_minute: int = 30, tokens_per_minute: int = 30000):
+        self._lock = threading.Lock()
+        self.requests = TokenBucket(requests_per_minute, requests_per_minute / 60)
+        self.tokens = TokenBucket(tokens_per_minute, tokens_per_minute / 60)
+        self.paused_until = 0.0
+
+        # Queue wait metrics
+        self.calls = 0
+        self.waited_calls = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+
+    def reserve(self, tokens: int) -> float:
+        """Reserve quota for one call and return the seconds to wait before making it."""
+        with self._lock:
+            now = time.monotonic()
+            delay = max(
+                self.requests.take(1, now),
+                self.tokens.take(tokens, now),
+                self.paused_until - now
+            )
+            delay = max(delay, 0.0)
+            self.calls += 1
+            if delay > 0:
+                self.waited_calls += 1
+                self.total_wait += delay
+                self.max_wait = max(self.max_wait, delay)
+            return delay
+
+    def acquire(self, tokens: int) -> float:
+        """Block until the call may be made; returns the time spent queued."""
+        delay = self.reserve(tokens)
+        if delay > 0:
+            time.sleep(delay)
+        return delay
+
+    def settle(self, reserved_tokens: int, used_tokens: int) -> None:
+        """Refund the difference once the actual token usage is known."""
+        if used_tokens < reserved_tokens:
+            with self._lock:
+                self.tokens.give_back(reserved_tokens - used_tokens, time.monotonic())
+
+    def update_from_headers(self, headers: Mapping[str, str], rate_limited: bool = False) -> None:
+        """Sync bucket state from Groq's rate limit headers."""
+        def number(name: str) -> Optional[float]:
+            value = headers.get(name)
+            try:
+                return float(value) if value is not None else None
+            except ValueError:
+                return None
+
+        with self._lock:
+            now = time.monotonic()
+            self.tokens.sync(number("x-ratelimit-limit-tokens"), number("x-ratelimit-remaining-tokens"), now)
+
+            # Groq's request headers count requests per day; only an exhausted
+            # daily quota needs handling, by pausing until it resets
+            if number("x-ratelimit-remaining-requests") == 0:
+                reset = parse_duration(headers.get("x-ratelimit-reset-requests"))
+                if reset:
+                    self.paused_until = max(self.paused_until, now + reset)
+
+            if rate_limited:
+                retry_after = parse_duration(headers.get("retry-after")) or parse_duration(headers.get("x-ratelimit-reset-tokens"))
+                if retry_after:
+                    self.paused_until = max(self.paused_until, now + retry_after)
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Return queue wait metrics."""
+        with self._lock:
+            return {
+                "calls": self.calls,
+                "waited_calls": self.waited_calls,
+                "total_wait_seconds": self.total_wait,
+                "max_wait_seconds": self.max_wait,
+            }
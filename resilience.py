@@ -0,0 +1,201 @@
+import random
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Any, Deque, Dict, Iterator, Optional, Tuple
+
+from urllib3.util.retry import Retry
+
+# Responses worth retrying: rate limiting and transient server-side failures
+RETRYABLE_STATUSES = (429, 500, 502, 503, 504)
+
+
+class HTTPStats:
+    """Thread-safe counters for retries and connection pool waits."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.retries = 0
+        self.retries_by_reason: Dict[str, int] = {}
+        self.pool_waits = 0
+        self.pool_wait_seconds = 0.0
+
+    def record_retry(self, reason: str) -> None:
+        """Count one retry, keyed by status code or error type."""
+        with self._lock:
+            self.retries += 1
+            self.retries_by_reason[reason] = self.retries_by_reason.get(reason, 0) + 1
+
+    def record_pool_wait(self, seconds: float) -> None:
+        """Count one request that had to wait for a free per-host connection."""
+        with self._lock:
+            self.pool_waits += 1
+            self.pool_wait_seconds += seconds
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Return a consistent copy of the counters."""
+        with self._lock:
+            return {
+                "retries": self.retries,
+                "retries_by_reason": dict(self.retries_by_reason),
+                "pool_waits": self.pool_waits,
+                "pool_wait_seconds": self.pool_wait_seconds,
+            }
+
+
+class JitteredRetry(Retry):
+    """urllib3 Retry with jittered exponential backoff, a Retry-After cap and retry counting.
+
+    Retry-After is honoured for 413, 429 and 503 responses (urllib3's default)
+    but never waits longer than ``max_retry_after`` seconds.
+    """
+
+    def __init__(self, *args, stats: Optional[HTTPStats] = None, max_retry_after: float = 30.0, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.stats = stats
+        self.max_retry_after = max_retry_after
+
+    def new(self, **kwargs) -> "JitteredRetry":
+        # urllib3 rebuilds the Retry object after every attempt; keep our settings
+        retry = super().new(**kwargs)
+        retry.stats = self.stats
+        retry.max_retry_after = self.max_retry_after
+        return retry
+
+    def get_backoff_time(self) -> float:
+        # "Equal jitter": half the exponential delay plus a random share of the other half
+        backoff = super().get_backoff_time()
+        return backoff / 2 + random.uniform(0, backoff / 2) if backoff else 0
+
+    def get_retry_after(self, response) -> Optional[float]:
+        retry_after = super().get_retry_after(response)
+        if retry_after is None:
+            return None
+        return min(retry_after, self.max_retry_after)
+
+    def increment(self, method=None, url=None, response=None, error=None, _pool=None, _stacktrace=None) -> "JitteredRetry":
+        retry = super().increment(method, url, response, error, _pool, _stacktrace)
+        if not self.stats:
+            return retry
+        # Redirects also pass through here; only count real retries
+        if error is not None:
+            self.stats.record_retry(type(error).__name__)
+        elif response is not None and response.status in (self.status_forcelist or ()):
+            self.stats.record_retry(str(response.status))
+        return retry
+
+
+class HostLimiter:
+    """Caps concurrent requests per host and counts the requests that had to wait."""
+
+    def __init__(self, max_per_host: int, stats: HTTPStats):
+        self.max_per_host = max_per_host
+        self.stats = stats
+        self._lock = threading.Lock()
+        self._slots: Dict[str, threading.BoundedSemaphore] = {}
+
+    @contextmanager
+    def slot(self, host: str) -> Iterator[None]:
+        """Hold one of the host's connection slots for the duration of the block."""
+        with self._lock:
+            semaphore = self._slots.get(host)
+            if semaphore is None:
+                semaphore = self._slots[host] = threading.BoundedSemaphore(self.max_per_host)
+
+        if not semaphore.acquire(blocking=False):
+            start = time.perf_counter()
+            semaphore.acquire()
+            self.stats.record_pool_wait(time.perf_counter() - start)
+        try:
+            yield
+        finally:
+            semaphore.release()
+
+
+class CircuitBreaker:
+    """Stops calling a degraded dependency until it recovers.
+
+    While closed, outcomes and latencies of calls in the last ``window_seconds``
+    are tracked; once at least ``min_calls`` were made and the share of
+    failures or of calls slower than ``slow_call_seconds`` reaches its
+    threshold, the breaker opens and rejects calls for ``cooldown_seconds``.
+    After that it is half-open: a single probe is let through, and its outcome
+    closes the breaker again or re-opens it for another cooldown.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half-open"
+
+    def __init__(self, window_seconds: float = 60.0, min_calls: int = 5, failure_rate: float = 0.5,
+                 slow_call_seconds: float = 15.0, slow_call_rate: float = 0.5, cooldown_seconds: float = 30.0):
+        self.window_seconds = window_seconds
+        self.min_calls = min_calls
+        self.failure_rate = failure_rate
+        self.slow_call_seconds = slow_call_seconds
+        self.slow_call_rate = slow_call_rate
+        self.cooldown_seconds = cooldown_seconds
+
+        self._lock = threading.Lock()
+        self._state = self.CLOSED
+        self._opened_at = 0.0
+        self._probe_in_flight = False
+        self._calls: Deque[Tuple[float, bool, bool]] = deque()
+
+    @property
+    def state(self) -> str:
+        """Current state, moving from open to half-open once the cooldown is over."""
+        with self._lock:
+            self._check_cooldown(time.monotonic())
+            return self._state
+
+    def _check_cooldown(self, now: float) -> None:
+        """Move from open to half-open when the cooldown has elapsed."""
+        if self._state == self.OPEN and now - self._opened_at >= self.cooldown_seconds:
+            self._state = self.HALF_OPEN
+            self._probe_in_flight = False
+
+    def _open(self, now: float) -> None:
+        """Start a cooldown, forgetting the calls that led to it."""
+        self._state = self.OPEN
+        self._opened_at = now
+        self._calls.clear()
+
+    def allow(self) -> bool:
+        """Return whether a call may be made now."""
+        with self._lock:
+            self._check_cooldown(time.monotonic())
+            if self._state == self.CLOSED:
+                return True
+            if self._state == self.HALF_OPEN and not self._probe_in_flight:
+                self._probe_in_flight = True
+                return True
+            return False
+
+    def record(self, success: bool, latency: float) -> None:
+        """Record the outcome of a call made after allow() returned True."""
+        now = time.monotonic()
+        slow = latency >= self.slow_call_seconds
+        with self._lock:
+            if self._state == self.HALF_OPEN:
+                self._probe_in_flight = False
+                if success and not slow:
+                    self._state = self.CLOSED
+                else:
+                    self._open(now)
+                return
+            if self._state == self.OPEN:
+                return  # a call that started before the breaker opened
+
+            self._calls.append((now, not success, slow))
+            while self._calls and now - self._calls[0][0] > self.window_seconds:
+                self._calls.popleft()
+
+            total = len(self._calls)
+            if total < self.min_calls:
+                return
+            failures = sum(1 for _, failed, _ in self._calls if failed)
+            slow_calls = sum(1 for _, _, was_slow in self._calls if was_slow)
+            if failures / total >= self.failure_rate or slow_calls / total >= self.slow_call_rate:
+                self._open(now)
@@ -0,0 +1,329 @@
+"""Serve the summarizer over HTTP for other services.
+
+Usage:
+    python server.py --port 8080 --workers 4 --queue-size 32
+
+Endpoints:
+    POST /summarize   {"url": ..., "summary_length": "medium", "timeout": 60}
+                      Summarize and answer once done; 504 (with the job id to
+                      poll) if the deadline passes first.
+    POST /jobs        Same body; answers 202 with a job id straight away.
+    GET  /jobs/{id}   Job status, and the result once it has finished.
+    GET  /healthz     200 while accepting work, 503 while draining.
+    GET  /stats       Per-stage latency, page size and token histograms,
+                      plus HTTP, rate limit and coalescing counters.
+    GET  /metrics     The same metrics in the Prometheus text format.
+
+Requests run on a bounded worker pool. Once every worker is busy and
+--queue-size jobs are waiting, new work is rejected with 429 and a
+Retry-After header; during shutdown it is rejected with 503. Groq and
+Firecrawl can be pointed at local stand-ins with the GROQ_BASE_URL and
+FIRECRAWL_API_URL environment variables, or by passing client objects to
+BlogSummarizer.
+"""
+import argparse
+import json
+import logging
+import os
+import signal
+import sys
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, Optional, Tuple
+
+from dotenv import load_dotenv
+
+import metrics
+from cli import process_url
+from summarizer import INVALID_URL_ERROR, SUMMARY_LENGTHS, BlogSummarizer, create_summarizer
+
+logger = logging.getLogger(__name__)
+
+
+class ServiceUnavailable(Exception):
+    """Raised when a job cannot be admitted; carries the HTTP status to answer with."""
+
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+
+
+class Job:
+    """One summarization request and its eventual JSON record."""
+
+    def __init__(self, url: str, summary_length: str):
+        self.id = uuid.uuid4().hex
+        self.url = url
+        self.summary_length = summary_length
+        self.status = "queued"
+        self.created = time.time()
+        self.finished: Optional[float] = None
+        self.future: Future = Future()
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Return the job's status, plus its result once it has finished."""
+        data = {
+            "id": self.id,
+            "url": self.url,
+            "summary_length": self.summary_length,
+            "status": self.status,
+            "created": self.created,
+            "finished": self.finished,
+        }
+        if self.future.done():
+            data["result"] = self.future.result()
+        return data
+
+
+class SummaryService:
+    """Runs summarization jobs on a bounded worker pool with admission control.
+
+    At most ``workers`` jobs run at once and at most ``queue_size`` more wait
+    for a worker; submit() rejects anything beyond that instead of letting the
+    backlog (and every caller's latency) grow without bound. Finished jobs are
+    kept for ``job_ttl`` seconds, up to ``max_jobs``, so they can be polled.
+    """
+
+    def __init__(self, summarizer: BlogSummarizer, workers: int = 4, queue_size: int = 32,
+                 job_ttl: float = 3600.0, max_jobs: int = 10000):
+        self.summarizer = summarizer
+        self.workers = workers
+        self.queue_size = queue_size
+        self.job_ttl = job_ttl
+        self.max_jobs = max_jobs
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="summary-job")
+
+        self._lock = threading.Lock()
+        self._jobs: "OrderedDict[str, Job]" = OrderedDict()
+        self._admitted = 0
+        self.draining = False
+
+    def submit(self, url: str, summary_length: str) -> Job:
+        """Admit a job and queue it for a worker, or raise ServiceUnavailable."""
+        with self._lock:
+            if self.draining:
+                raise ServiceUnavailable(503, "Server is shutting down")
+            if self._admitted >= self.workers + self.queue_size:
+                raise ServiceUnavailable(429, "Too many requests in progress, retry later")
+            self._admitted += 1
+            job = Job(url, summary_length)
+            self._jobs[job.id] = job
+            self._prune(time.time())
+
+        self.executor.submit(self._run, job)
+        return job
+
+    def _run(self, job: Job) -> None:
+        """Worker side of submit()."""
+        job.status = "running"
+        try:
+            with metrics.IN_PROGRESS.track(operation="job"):
+                record = process_url(self.summarizer, job.url, job.summary_length)
+        finally:
+            with self._lock:
+                self._admitted -= 1
+        job.status = "failed" if record["error"] else "done"
+        job.finished = time.time()
+        job.future.set_result(record)
+
+    def _prune(self, now: float) -> None:
+        """Forget expired finished jobs, and the oldest ones beyond ``max_jobs``."""
+        for job_id, job in list(self._jobs.items()):
+            expired = job.finished is not None and now - job.finished > self.job_ttl
+            if not expired and len(self._jobs) <= self.max_jobs:
+                break
+            if job.finished is not None:
+                del self._jobs[job_id]
+
+    def get(self, job_id: str) -> Optional[Job]:
+        """Return the job with this id, if it is still known."""
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def stats(self) -> Dict[str, Any]:
+        """Return queue occupancy."""
+        with self._lock:
+            return {
+                "workers": self.workers,
+                "queue_size": self.queue_size,
+                "admitted": self._admitted,
+                "draining": self.draining,
+            }
+
+    def metrics(self) -> Dict[str, Any]:
+        """Return the process-wide histograms and the summarizer's counters."""
+        summarizer = self.summarizer
+        return {
+            "service": self.stats(),
+            "metrics": metrics.snapshot(),
+            "http": summarizer.http_stats.snapshot(),
+            "rate_limit": summarizer.scheduler.snapshot(),
+            "flights": {
+                "extraction": summarizer.extraction_flights.snapshot(),
+                "summary": summarizer.summary_flights.snapshot(),
+            },
+        }
+
+    def shutdown(self) -> None:
+        """Stop admitting jobs and wait for the admitted ones to finish."""
+        with self._lock:
+            self.draining = True
+        self.executor.shutdown(wait=True)
+
+
+class RequestHandler(BaseHTTPRequestHandler):
+    """JSON API over a SummaryService."""
+
+    service: SummaryService
+    default_timeout: float = 60.0
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format: str, *args: Any) -> None:
+        logger.info("%s - %s", self.address_string(), format % args)
+
+    def _send_json(self, status: int, body: Dict[str, Any], headers: Optional[Dict[str, str]] = None) -> None:
+        """Write a JSON response."""
+        payload = json.dumps(body, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(payload)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def _send_error(self, status: int, message: str, headers: Optional[Dict[str, str]] = None) -> None:
+        self._send_json(status, {"error": message}, headers)
+
+    def _read_request(self) -> Tuple[Optional[Dict[str, Any]], Optional[str]]:
+        """Parse and validate the JSON body; returns (body, error)."""
+        try:
+            length = int(self.headers.get("Content-Length") or 0)
+            body = json.loads(self.rfile.read(length) or b"{}")
+        except (ValueError, UnicodeDecodeError):
+            return None, "Request body must be JSON"
+        if not isinstance(body, dict):
+            return None, "Request body must be a JSON object"
+
+        url = body.get("url")
+        if not isinstance(url, str) or not self.service.summarizer.is_valid_url(url):
+            return None, INVALID_URL_ERROR
+        body.setdefault("summary_length", "medium")
+        body.setdefault("timeout", self.default_timeout)
+        if body["summary_length"] not in SUMMARY_LENGTHS:
+            return None, f"summary_length must be one of: {', '.join(SUMMARY_LENGTHS)}"
+        if not isinstance(body["timeout"], (int, float)) or body["timeout"] <= 0:
+            return None, "timeout must be a positive number of seconds"
+        return body, None
+
+    def _submit(self) -> Tuple[Optional[Job], float]:
+        """Validate the request and admit a job; answers the error response and returns no job if that fails."""
+        body, error = self._read_request()
+        if error:
+            self._send_error(400, error)
+            return None, 0.0
+        try:
+            job = self.service.submit(body["url"], body["summary_length"])
+        except ServiceUnavailable as e:
+            headers = {"Retry-After": "1"} if e.status == 429 else None
+            self._send_error(e.status, str(e), headers)
+            return None, 0.0
+        return job, body["timeout"]
+
+    def do_POST(self) -> None:
+        if self.path == "/summarize":
+            job, timeout = self._submit()
+            if job is None:
+                return
+            try:
+                record = job.future.result(timeout=timeout)
+            except FutureTimeoutError:
+                self._send_json(504, {"error": "Deadline exceeded", "job": job.to_dict()},
+                                {"Location": f"/jobs/{job.id}"})
+                return
+            self._send_json(200, record)
+        elif self.path == "/jobs":
+            job, _ = self._submit()
+            if job is None:
+                return
+            self._send_json(202, job.to_dict(), {"Location": f"/jobs/{job.id}"})
+        else:
+            self._send_error(404, "Not found")
+
+    def do_GET(self) -> None:
+        if self.path.startswith("/jobs/"):
+            job = self.service.get(self.path[len("/jobs/"):])
+            if job is None:
+                self._send_error(404, "Unknown job")
+                return
+            self._send_json(200, job.to_dict())
+        elif self.path == "/healthz":
+            stats = self.service.stats()
+            self._send_json(503 if stats["draining"] else 200, stats)
+        elif self.path == "/stats":
+            self._send_json(200, self.service.metrics())
+        elif self.path == "/metrics":
+            payload = metrics.render().encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", metrics.CONTENT_TYPE)
+            self.send_header("Content-Length", str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+        else:
+            self._send_error(404, "Not found")
+
+
+def make_server(service: SummaryService, host: str = "127.0.0.1", port: int = 8080,
+                default_timeout: float = 60.0) -> ThreadingHTTPServer:
+    """Build an HTTP server bound to ``service``; call serve_forever() to run it."""
+    handler = type("BoundRequestHandler", (RequestHandler,), {
+        "service": service,
+        "default_timeout": default_timeout,
+    })
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    return server
+
+
+def main() -> int:
+    """Command-line entry point."""
+    parser = argparse.ArgumentParser(description="Serve the blog post summarizer over HTTP.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("-w", "--workers", type=int, default=4, help="jobs summarized at once (default: 4)")
+    parser.add_argument("-q", "--queue-size", type=int, default=32, help="jobs waiting for a worker before 429 (default: 32)")
+    parser.add_argument("--timeout", type=float, default=60.0, help="default /summarize deadline in seconds (default: 60)")
+    args = parser.parse_args()
+
+    load_dotenv()
+    logging.basicConfig(level=logging.INFO, stream=sys.stderr)
+
+    groq_api_key = os.getenv("GROQ_API_KEY")
+    if not groq_api_key:
+        parser.error("GROQ_API_KEY is not set. Add it to the environment or the .env file.")
+
+    summarizer = create_summarizer(groq_api_key, os.getenv("FIRECRAWL_API_KEY"))
+    service = SummaryService(summarizer, workers=args.workers, queue_size=args.queue_size)
+    server = make_server(service, args.host, args.port, args.timeout)
+
+    def drain(signum, frame) -> None:
+        # Refuse new work at once, finish admitted jobs, then stop serving
+        logger.info("Draining before shutdown")
+        threading.Thread(target=lambda: (service.shutdown(), server.shutdown()), daemon=True).start()
+
+    signal.signal(signal.SIGTERM, drain)
+    signal.signal(signal.SIGINT, drain)
+
+    logger.info(f"Listening on http://{args.host}:{args.port}")
+    server.serve_forever()
+    server.server_close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,129 @@
+import asyncio
+import threading
+from typing import Any, Awaitable, Callable, Dict, Hashable, Tuple
+
+
+class FlightAbandoned(Exception):
+    """The leader of a flight gave up without a result; waiting callers should retry."""
+
+
+class Flight:
+    """One in-flight call whose result is shared by every caller of the same key."""
+
+    def __init__(self):
+        self._done = threading.Event()
+        self._result: Any = None
+        self._error: BaseException = None
+
+    def wait(self) -> Any:
+        """Block until the leader finishes and return its result or raise its error."""
+        self._done.wait()
+        if self._error is not None:
+            raise self._error
+        return self._result
+
+
+class SingleFlight:
+    """Coalesces concurrent calls for the same key into a single execution.
+
+    The first caller for a key becomes the leader and does the work; callers
+    arriving before it finishes wait and receive the same result (or
+    exception). Nothing is remembered afterwards, so this complements the
+    summary cache rather than replacing it.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._flights: Dict[Hashable, Flight] = {}
+        self.executions = 0
+        self.coalesced = 0
+
+    def join(self, key: Hashable) -> Tuple[Flight, bool]:
+        """Return the flight for ``key`` and whether the caller leads it.
+
+        A leader must call finish() exactly once, even when it fails.
+        """
+        with self._lock:
+            flight = self._flights.get(key)
+            if flight is not None:
+                self.coalesced += 1
+                return flight, False
+            flight = self._flights[key] = Flight()
+            self.executions += 1
+            return flight, True
+
+    def finish(self, key: Hashable, flight: Flight, result: Any = None, error: BaseException = None) -> None:
+        """Publish the leader's outcome to the waiting callers."""
+        with self._lock:
+            if self._flights.get(key) is flight:
+                del self._flights[key]
+        flight._result = result
+        flight._error = error
+        flight._done.set()
+
+    def do(self, key: Hashable, fn: Callable[..., Any], *args: Any, **kwargs: Any) -> Tuple[Any, bool]:
+        """Run ``fn`` once for all concurrent callers of ``key``; returns (result, shared)."""
+        while True:
+            flight, leader = self.join(key)
+            if not leader:
+                try:
+                    return flight.wait(), True
+                except FlightAbandoned:
+                    continue
+
+            try:
+                result = fn(*args, **kwargs)
+            except BaseException as e:
+                self.finish(key, flight, error=e)
+                raise
+            self.finish(key, flight, result=result)
+            return result, False
+
+    def snapshot(self) -> Dict[str, int]:
+        """Return execution and coalescing counts."""
+        with self._lock:
+            return {
+                "executions": self.executions,
+                "coalesced": self.coalesced,
+                "in_flight": len(self._flights),
+            }
+
+
+class AsyncSingleFlight:
+    """SingleFlight for coroutines sharing one event loop."""
+
+    def __init__(self):
+        self._flights: Dict[Hashable, asyncio.Future] = {}
+        self.executions = 0
+        self.coalesced = 0
+
+    async def do(self, key: Hashable, fn: Callable[..., Awaitable[Any]], *args: Any, **kwargs: Any) -> Tuple[Any, bool]:
+        """Await ``fn`` once for all concurrent callers of ``key``; returns (result, shared)."""
+        while True:
+            future = self._flights.get(key)
+            if future is not None:
+                self.coalesced += 1
+                try:
+                    # Shield so one waiter being cancelled does not cancel the leader's result
+                    return await asyncio.shield(future), True
+                except FlightAbandoned:
+                    continue
+
+            future = self._flights[key] = asyncio.get_running_loop().create_future()
+            self.executions += 1
+            try:
+                result = await fn(*args, **kwargs)
+            except asyncio.CancelledError:
+                future.set_exception(FlightAbandoned())
+                raise
+            except BaseException as e:
+                future.set_exception(e)
+                raise
+            else:
+                future.set_result(result)
+                return result, False
+            finally:
+                del self._flights[key]
+                # Keep asyncio from warning about exceptions nobody waited for
+                if future.done() and not future.cancelled():
+                    future.exception()
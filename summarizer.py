@@ -0,0 +1,1080 @@
+import json
+import requests
+from requests.adapters import HTTPAdapter
+import re
+from urllib.parse import urlparse
+import time
+from groq import Groq, RateLimitError
+import os
+from typing import Optional, Tuple, Dict, Any, ContextManager, Generator, Iterator, List, Union
+import logging
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError, as_completed
+from contextlib import ExitStack, nullcontext
+from firecrawl import FirecrawlApp
+from cache import SummaryCache, alias_key, content_digest, make_key, url_key
+from canonical import canonicalize_url, find_canonical_link
+from compression import compress_to_budget
+from fingerprint import FingerprintIndex, simhash
+from metrics import (
+    GROQ_REQUESTS, IN_PROGRESS, merge_stats, record_bytes, record_cache_lookup, record_extraction,
+    record_stage, record_tokens, stage_timer, timer_for
+)
+from profiling import Profiler, profiler_from_env
+from ratelimit import RateLimitScheduler
+from singleflight import FlightAbandoned, SingleFlight
+from resilience import RETRYABLE_STATUSES, CircuitBreaker, HostLimiter, HTTPStats, JitteredRetry
+from extractors import CONTENT_EXTRACTORS, PARSER_BACKENDS, known_encoding, parse_html
+from text_utils import split_into_chunks, estimate_tokens, estimate_message_tokens, normalize_whitespace, truncate_to_tokens
+from tracing import annotate, current_span, exporter_from_env, in_current_span, tracer
+
+logger = logging.getLogger(__name__)
+
+MODEL_NAME = "llama3-8b-8192"
+# Bump whenever the summarization prompt changes so stale cached summaries are not served
+PROMPT_VERSION = "2"
+CONTEXT_WINDOW = 8192
+# Completion tokens reserved out of the context window for each kind of summary
+OUTPUT_TOKEN_BUDGET = {"short": 256, "medium": 512, "long": 1024, "chunk": 512, "all": 1792}
+SUMMARY_LENGTHS = ("short", "medium", "long")
+# Rounds of map-summarizing chunks before the rest is truncated to fit
+CONDENSE_ROUNDS = 3
+HTML_MEDIA_TYPES = ("text/html", "application/xhtml+xml")
+BODY_CLOSE_PATTERN = re.compile(rb'</body\s*>', re.IGNORECASE)
+USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+INVALID_URL_ERROR = "Please enter a valid URL (including http:// or https://)"
+INSUFFICIENT_CONTENT_ERROR = "Unable to extract sufficient content from this URL. The page might be behind a paywall, require JavaScript, or have content protection."
+
+class BlogSummarizer:
+    def __init__(self, groq_api_key: str, firecrawl_api_key: Optional[str] = None, cache: Optional[SummaryCache] = None,
+                 chunk_size: int = 6000, chunk_concurrency: int = 4, hedge_delay: Optional[float] = None,
+                 parser: str = "lxml", content_extractor: str = "density", structured_data: bool = True,
+                 max_download_bytes: int = 5 * 1024 * 1024, pool_connections: int = 20, max_connections_per_host: int = 10,
+                 max_retries: int = 3, backoff_factor: float = 0.5, scheduler: Optional[RateLimitScheduler] = None,
+                 firecrawl_breaker: Optional[CircuitBreaker] = None, groq_client: Optional[Groq] = None,
+                 firecrawl_client: Optional[FirecrawlApp] = None, resolve_canonical: bool = False,
+                 fingerprints: Optional[FingerprintIndex] = None, precompress_ratio: Optional[float] = None,
+                 multi_length: bool = False, profiler: Optional[Profiler] = None,
+                 hedge_firecrawl_workers: int = 16, hedge_fallback_workers: int = 32):
+        """Initialize the BlogSummarizer with API keys, an optional summary cache and tuning options.
+        
+        ``hedge_delay`` enables hedged extraction: basic scraping starts this many
+        seconds after Firecrawl (0 runs both at once) and the first acceptable
+        result wins. None keeps the sequential Firecrawl-then-fallback order.
+        Each leg runs on its own pool (``hedge_firecrawl_workers`` and
+        ``hedge_fallback_workers`` threads), so losing Firecrawl calls that are
+        still running can never hold up basic scraping.
+        
+        ``parser`` selects the HTML backend for basic scraping: "html.parser",
+        "lxml" (BeautifulSoup on lxml) or "lxml-raw" (lxml.html with XPath).
+        ``content_extractor`` locates the article body: "density" scores every
+        block in one walk of the tree, "selectors" tries known selectors in turn;
+        the walk is slightly slower but does not pick up comment threads that
+        share a wrapper with the article.
+        ``structured_data`` takes a complete JSON-LD articleBody straight from the
+        raw page without parsing it. Basic scraping streams pages and stops
+        reading after ``max_download_bytes``.
+        
+        The scraping session keeps pools for up to ``pool_connections`` hosts,
+        allows at most ``max_connections_per_host`` concurrent requests per host,
+        and retries 429/5xx responses and connection errors up to ``max_retries``
+        times with jittered exponential backoff that honours Retry-After.
+        
+        Every Groq call goes through ``scheduler`` so requests and tokens per
+        minute stay within quota. ``firecrawl_breaker`` skips Firecrawl entirely
+        while it is failing or slow.
+        
+        ``groq_client`` and ``firecrawl_client`` replace the clients built from
+        the API keys, e.g. with local stand-ins.
+        
+        URLs are canonicalized (tracking parameters, fragments, AMP variants and
+        so on removed) before they are used as cache or coalescing keys. With
+        ``resolve_canonical`` and a cache, a scraped page's rel=canonical link or
+        final redirect target is remembered too, and a URL-cache miss is served
+        the target's cached summary if it was made from the same content. Many
+        sites point every page's canonical at a section or the home page, so
+        the target alone is never trusted.
+        
+        With ``fingerprints`` and a cache, content that is a near duplicate of
+        already summarized content (the same wire story on another site, say)
+        is served that content's cached summary instead of calling Groq.
+        
+        ``precompress_ratio`` (e.g. 0.5) enables extractive pre-compression:
+        repeated sentences and fragments are dropped and only the top TextRank
+        sentences, up to that share of the content's tokens, are sent to Groq.
+        
+        With ``multi_length`` one JSON-mode Groq call writes the short, medium and
+        long summaries together and all three are cached, so asking for another
+        length of the same content needs no further call.
+        
+        ``profiler`` captures cProfile and tracemalloc data for the summarize_url()
+        calls it samples, named after their trace IDs.
+        """
+        self.groq_client = groq_client or Groq(api_key=groq_api_key)
+        if firecrawl_client is None and firecrawl_api_key:
+            firecrawl_client = FirecrawlApp(api_key=firecrawl_api_key)
+        self.firecrawl_client = firecrawl_client
+        self.firecrawl_breaker = firecrawl_breaker or CircuitBreaker()
+        self.cache = cache
+        self.fingerprints = fingerprints
+        self.scheduler = scheduler or RateLimitScheduler()
+        
+        # Concurrent requests for the same URL or content share one fetch and one Groq call
+        self.extraction_flights = SingleFlight()
+        self.summary_flights = SingleFlight()
+        
+        # Articles that do not fit the context window are summarized chunk by
+        # chunk; the shared pool caps in-flight chunk calls across all requests
+        self.chunk_size = chunk_size
+        if precompress_ratio is not None and not 0 < precompress_ratio <= 1:
+            raise ValueError("precompress_ratio must be between 0 and 1")
+        self.precompress_ratio = precompress_ratio
+        self.multi_length = multi_length
+        self.profiler = profiler
+        self.chunk_executor = ThreadPoolExecutor(max_workers=chunk_concurrency, thread_name_prefix="summarize-chunk")
+        
+        self.hedge_delay = hedge_delay
+        self.firecrawl_executor = ThreadPoolExecutor(max_workers=hedge_firecrawl_workers, thread_name_prefix="extract-firecrawl")
+        self.fallback_executor = ThreadPoolExecutor(max_workers=hedge_fallback_workers, thread_name_prefix="extract-fallback")
+        
+        # Fallback session and parser for basic scraping
+        if parser not in PARSER_BACKENDS:
+            raise ValueError(f"Unknown HTML parser '{parser}'. Choose from: {', '.join(PARSER_BACKENDS)}")
+        if content_extractor not in CONTENT_EXTRACTORS:
+            raise ValueError(f"Unknown content extractor '{content_extractor}'. Choose from: {', '.join(CONTENT_EXTRACTORS)}")
+        self.parser = parser
+        self.content_extractor = content_extractor
+        self.structured_data = structured_data
+        self.resolve_canonical = resolve_canonical
+        self.max_download_bytes = max_download_bytes
+        self.max_connections_per_host = max_connections_per_host
+        self.max_retries = max_retries
+        self.backoff_factor = backoff_factor
+        self.http_stats = HTTPStats()
+        self.host_limiter = HostLimiter(max_connections_per_host, self.http_stats)
+        retry = JitteredRetry(
+            total=max_retries,
+            backoff_factor=backoff_factor,
+            status_forcelist=RETRYABLE_STATUSES,
+            allowed_methods=frozenset(["GET", "HEAD"]),
+            raise_on_status=False,
+            stats=self.http_stats
+        )
+        adapter = HTTPAdapter(
+            pool_connections=pool_connections,
+            pool_maxsize=max_connections_per_host,
+            pool_block=True,
+            max_retries=retry
+        )
+        self.session = requests.Session()
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self.session.headers.update({
+            'User-Agent': USER_AGENT
+        })
+    
+    def is_valid_url(self, url: str) -> bool:
+        """Validate URL format."""
+        try:
+            result = urlparse(url)
+            return all([result.scheme, result.netloc])
+        except Exception:
+            return False
+    
+    def extract_with_firecrawl(self, url: str, stats: Optional[Dict[str, Any]] = None) -> Tuple[Optional[str], Optional[str], Optional[str]]:
+        """Extract content using Firecrawl API."""
+        start = time.perf_counter()
+        try:
+            # Scrape the URL with Firecrawl, reporting service health to the breaker
+            try:
+                with stage_timer(stats, "firecrawl_request"):
+                    scrape_result = self.firecrawl_client.scrape_url(
+                        url,
+                        params={
+                            'formats': ['markdown', 'html'],
+                            'onlyMainContent': True,
+                            'includeTags': ['title', 'h1', 'h2', 'h3', 'p', 'article'],
+                            'excludeTags': ['nav', 'footer', 'header', 'aside', 'script', 'style'],
+                            'waitFor': 3000,  # Wait for dynamic content
+                            'timeout': 30000  # 30 second timeout
+                        }
+                    )
+            except Exception:
+                self.firecrawl_breaker.record(False, time.perf_counter() - start)
+                raise
+            self.firecrawl_breaker.record(scrape_result.get('success', False), time.perf_counter() - start)
+            
+            if not scrape_result.get('success', False):
+                return None, None, f"Firecrawl failed to scrape the URL: {scrape_result.get('error', 'Unknown error')}"
+            
+            data = scrape_result.get('data', {})
+            
+            # Extract title and content
+            title = data.get('title') or data.get('metadata', {}).get('title')
+            
+            # Prefer markdown content, fallback to cleaned HTML
+            content = data.get('markdown')
+            if not content:
+                content = data.get('content')
+            
+            if not content:
+                return None, None, "No content could be extracted from the page"
+            
+            # Clean markdown content if needed
+            if content:
+                # Remove excessive whitespace, keeping paragraph breaks for the chunker
+                with stage_timer(stats, "clean_content"):
+                    content = normalize_whitespace(content)
+            
+            return title, content, None
+            
+        except Exception as e:
+            logger.error(f"Extraction error for {url}: {str(e)}")
+            return None, None, f"Firecrawl error: {str(e)}"
+    
+    def _check_headers(self, headers: Any) -> Optional[str]:
+        """Reject non-HTML and oversized responses from the headers alone."""
+        media_type = headers.get('Content-Type', '').split(';')[0].strip().lower()
+        if media_type and media_type not in HTML_MEDIA_TYPES:
+            return f"Unsupported content type '{media_type}' - only HTML pages can be summarized"
+        
+        content_length = headers.get('Content-Length', '')
+        if content_length.isdigit() and int(content_length) > self.max_download_bytes:
+            return f"Page too large ({int(content_length):,} bytes) - the limit is {self.max_download_bytes:,} bytes"
+        return None
+    
+    def _append_chunk(self, html: bytearray, chunk: bytes, url: str) -> bool:
+        """Add a downloaded chunk; returns True once there is nothing more worth reading."""
+        html.extend(chunk)
+        if len(html) >= self.max_download_bytes:
+            logger.info(f"Stopped reading {url} at the {self.max_download_bytes:,} byte limit")
+            del html[self.max_download_bytes:]
+            return True
+        # Nothing after </body> matters; look only where this chunk could have completed it
+        return BODY_CLOSE_PATTERN.search(html, max(0, len(html) - len(chunk) - 16)) is not None
+    
+    def _read_html(self, response: requests.Response) -> bytes:
+        """Read a streamed HTML response until the body closes or the byte budget runs out."""
+        html = bytearray()
+        for chunk in response.iter_content(chunk_size=64 * 1024):
+            if self._append_chunk(html, chunk, response.url):
+                break
+        return bytes(html)
+    
+    def _parse_page(self, html: bytes, content_type: str, stats: Optional[Dict[str, Any]] = None) -> Tuple[Optional[str], Optional[str]]:
+        """Parse a downloaded page with the configured backend and extractor."""
+        # Honour an explicit charset from the headers; otherwise (or if Python
+        # has no such codec) let the parser sniff it
+        charset = re.search(r'charset=([\w-]+)', content_type)
+        encoding = known_encoding(charset.group(1)) if charset else None
+        timer = timer_for(stats)
+        span = current_span()
+        if self.profiler is not None and span is not None:
+            # A profiled request's report also shows allocations while the tree is alive
+            timer = self.profiler.snapshot_after(timer, "parse_tree", span.trace_id)
+        with tracer.span("html.parse", {"parser": self.parser, "html.bytes": len(html)}):
+            return parse_html(
+                html,
+                self.parser,
+                encoding,
+                self.content_extractor,
+                self.structured_data,
+                timer
+            )
+    
+    def extract_with_fallback(self, url: str, stats: Optional[Dict[str, Any]] = None) -> Tuple[Optional[str], Optional[str], Optional[str]]:
+        """Fallback content extraction by fetching the page and parsing it locally.
+        
+        requests resolves, connects and sends in one step, so DNS and connect
+        time are part of the ``fetch_headers`` stage rather than stages of their own.
+        """
+        try:
+            # Hold a per-host slot until the streamed body has been read
+            with ExitStack() as stack:
+                host = urlparse(url).netloc.lower()
+                with stage_timer(stats, "connection_slot"):
+                    stack.enter_context(self.host_limiter.slot(host))
+                span = stack.enter_context(tracer.span("http.fetch", {"url.host": host}))
+                with stage_timer(stats, "fetch_headers"):
+                    response = stack.enter_context(self.session.get(url, timeout=15, stream=True))
+                span.set_attribute("http.status_code", response.status_code)
+                response.raise_for_status()
+                
+                error = self._check_headers(response.headers)
+                if error:
+                    span.record_error(error)
+                    return None, None, error
+                
+                with stage_timer(stats, "download"):
+                    html = self._read_html(response)
+                span.set_attribute("http.response_bytes", len(html))
+                record_bytes(stats, len(html))
+            
+            title, content = self._parse_page(html, response.headers.get('Content-Type', ''), stats)
+            self._remember_canonical(url, response.url, html, content)
+            return title, content, None
+            
+        except requests.exceptions.Timeout:
+            return None, None, "Request timeout - the website took too long to respond"
+        except requests.exceptions.ConnectionError:
+            return None, None, "Connection error - unable to reach the website"
+        except requests.exceptions.HTTPError as e:
+            return None, None, f"HTTP error {e.response.status_code} - {e.response.reason}"
+        except Exception as e:
+            logger.error(f"Fallback extraction error for {url}: {str(e)}")
+            return None, None, f"Error extracting content: {str(e)}"
+    
+    def _remember_canonical(self, url: str, final_url: str, html: bytes, content: Optional[str]) -> None:
+        """Record where a fetched URL really points and the digest of the content it had."""
+        if not (self.cache and self.resolve_canonical and content):
+            return
+        canonical = canonicalize_url(url)
+        target = find_canonical_link(html, final_url) or canonicalize_url(final_url)
+        if target != canonical:
+            self.cache.set(alias_key(canonical), json.dumps({"url": target, "digest": content_digest(content)}))
+    
+    def _alias(self, canonical: str) -> Optional[Dict[str, str]]:
+        """Return the remembered target URL and content digest of a canonical URL, if any."""
+        raw = self.cache.get(alias_key(canonical))
+        if raw is None:
+            return None
+        try:
+            alias = json.loads(raw)
+        except ValueError:
+            return None  # a bare target URL, stored before aliases carried a digest
+        return alias if isinstance(alias, dict) and "url" in alias and "digest" in alias else None
+    
+    def _is_usable(self, content: Optional[str], error: Optional[str]) -> bool:
+        """Check whether an extraction result is good enough to summarize."""
+        return not error and bool(content) and len(content.strip()) > 100
+    
+    def _extract_hedged(self, url: str, stats: Optional[Dict[str, Any]] = None) -> Tuple[Optional[str], Optional[str], Optional[str], str]:
+        """Race Firecrawl against basic scraping and return the first usable result."""
+        # Each leg records into its own stats; only the returned leg's are merged,
+        # so a loser still running in the background never touches the caller's
+        firecrawl_stats = {} if stats is not None else None
+        firecrawl_future = self.firecrawl_executor.submit(in_current_span(self._attempt), "firecrawl", url, firecrawl_stats)
+        try:
+            leg_result = firecrawl_future.result(timeout=self.hedge_delay)
+            result = self._accept_leg(leg_result, "Firecrawl", firecrawl_stats, stats)
+            if result is not None:
+                return result
+            annotate({"extraction.fallback_reason": self._fallback_reason(*leg_result[1:])})
+            pending = {}
+        except FutureTimeoutError:
+            annotate({"extraction.fallback_reason": "hedge_delay"})
+            pending = {firecrawl_future: ("Firecrawl", firecrawl_stats)}
+        
+        # Firecrawl is slow or failed: start (or join) the basic scraping leg
+        fallback_stats = {} if stats is not None else None
+        fallback_future = self.fallback_executor.submit(in_current_span(self._attempt), "fallback", url, fallback_stats)
+        pending[fallback_future] = ("Basic Scraping", fallback_stats)
+        
+        fallback_result = None
+        for future in as_completed(pending):
+            method_used, leg_stats = pending[future]
+            result = self._accept_leg(future.result(), method_used, leg_stats, stats)
+            if result is not None:
+                # Threads cannot be interrupted; the losing leg finishes in the
+                # background and its result is discarded
+                for other in pending:
+                    if other is not future:
+                        other.cancel()
+                return result
+            if future is fallback_future:
+                fallback_result = future.result()
+        
+        merge_stats(stats, fallback_stats)
+        title, content, error = fallback_result
+        return title, content, error, "Basic Scraping"
+    
+    def _accept_leg(self, leg_result: Tuple[Optional[str], Optional[str], Optional[str]], method: str,
+                    leg_stats: Optional[Dict[str, Any]], stats: Optional[Dict[str, Any]]) -> Optional[Tuple[Optional[str], Optional[str], Optional[str], str]]:
+        """Return a finished hedged leg's extraction result if it is usable, merging its stats into ``stats``."""
+        title, content, error = leg_result
+        if not self._is_usable(content, error):
+            return None
+        merge_stats(stats, leg_stats)
+        return title, content, None, method
+    
+    def extract_content(self, url: str, stats: Optional[Dict[str, Any]] = None) -> Tuple[Optional[str], Optional[str], Optional[str], str]:
+        """Extract content using the best available method.
+        
+        Concurrent calls for the same canonical URL share a single extraction.
+        When ``stats`` is given, per-stage ``timings`` in seconds and
+        ``bytes_downloaded`` are recorded in it by the call doing the work.
+        """
+        start = time.perf_counter()
+        with tracer.span("extract_content", {"url.host": urlparse(url).netloc.lower()}) as span, \
+                IN_PROGRESS.track(operation="extraction"):
+            # Aliases are not followed here: until the page is fetched nothing
+            # shows that the target is the same article
+            result, shared = self.extraction_flights.do(canonicalize_url(url), self._extract_content, url, stats)
+            self._finish_extraction(span, result, shared, start)
+        return result
+    
+    def _finish_extraction(self, span: Any, result: Tuple[Optional[str], Optional[str], Optional[str], str],
+                           shared: bool, start: float) -> None:
+        """Record an extraction's method and outcome on its span and, unless it was coalesced, in the metrics."""
+        title, content, error, method = result
+        span.set_attributes({
+            "extraction.method": method,
+            "extraction.coalesced": shared,
+            "content.length": len(content or ""),
+        })
+        if error:
+            span.record_error(error)
+        # Coalesced callers did no extraction of their own
+        if not shared:
+            record_extraction(method, error, content, time.perf_counter() - start)
+    
+    def _fallback_reason(self, content: Optional[str], error: Optional[str]) -> str:
+        """Describe why a Firecrawl result was not used."""
+        return error or "insufficient content"
+    
+    def _extraction_route(self) -> Tuple[str, Optional[str]]:
+        """Decide how to extract: "hedged", "firecrawl" first, or "fallback" only, with why Firecrawl is skipped."""
+        if not self.firecrawl_client:
+            return "fallback", "firecrawl not configured"
+        # Skip Firecrawl while its circuit breaker is open
+        if not self.firecrawl_breaker.allow():
+            return "fallback", "firecrawl circuit open"
+        return ("hedged" if self.hedge_delay is not None else "firecrawl"), None
+    
+    def _attempt(self, extractor: str, url: str, stats: Optional[Dict[str, Any]] = None) -> Tuple[Optional[str], Optional[str], Optional[str]]:
+        """Run one extractor ("firecrawl" or "fallback") in its own trace span."""
+        extract = self.extract_with_firecrawl if extractor == "firecrawl" else self.extract_with_fallback
+        with tracer.span(f"extract.{extractor}", {"url.host": urlparse(url).netloc.lower()}) as span:
+            title, content, error = extract(url, stats)
+            self._finish_attempt(span, content, error)
+        return title, content, error
+    
+    def _finish_attempt(self, span: Any, content: Optional[str], error: Optional[str]) -> None:
+        """Record one extractor's outcome on its span."""
+        span.set_attribute("content.length", len(content or ""))
+        if error:
+            span.record_error(error)
+    
+    def _extract_content(self, url: str, stats: Optional[Dict[str, Any]] = None) -> Tuple[Optional[str], Optional[str], Optional[str], str]:
+        """Extract content without coalescing; see extract_content()."""
+        route, skip_reason = self._extraction_route()
+        if route == "hedged":
+            return self._extract_hedged(url, stats)
+        
+        # Try Firecrawl first if available
+        if route == "firecrawl":
+            title, content, error = self._attempt("firecrawl", url, stats)
+            if self._is_usable(content, error):
+                return title, content, None, "Firecrawl"
+            skip_reason = self._fallback_reason(content, error)
+        
+        # Fallback to basic scraping
+        annotate({"extraction.fallback_reason": skip_reason})
+        title, content, error = self._attempt("fallback", url, stats)
+        return title, content, error, "Basic Scraping"
+    
+    def _summary_key(self, content: str, summary_length: str) -> str:
+        """Return the key identifying the summary of this content at this length."""
+        return make_key(content_digest(content), summary_length, MODEL_NAME, PROMPT_VERSION)
+    
+    def get_cached_summary(self, url: str, summary_length: str) -> Optional[Dict[str, Any]]:
+        """Return the cached title, summary, method and content_length for a URL, if any.
+        
+        With ``resolve_canonical`` a miss falls back to the entry of the URL's
+        remembered canonical or redirect target, provided both were made from
+        the same content.
+        """
+        if not self.cache:
+            return None
+        canonical = canonicalize_url(url)
+        entry = self._url_entry(canonical, summary_length)
+        if entry is None and self.resolve_canonical:
+            alias = self._alias(canonical)
+            target_entry = self._url_entry(alias["url"], summary_length) if alias else None
+            if target_entry is not None and target_entry.get("digest") == alias["digest"]:
+                entry = target_entry
+        record_cache_lookup("url", "hit" if entry is not None else "miss")
+        return entry
+    
+    def _url_entry(self, canonical: str, summary_length: str) -> Optional[Dict[str, Any]]:
+        """Return the URL-cache entry stored under exactly this canonical URL."""
+        cached = self.cache.get(url_key(canonical, summary_length, MODEL_NAME, PROMPT_VERSION))
+        return json.loads(cached) if cached is not None else None
+    
+    def cache_url_summary(self, url: str, summary_length: str, title: Optional[str], summary: str,
+                          method: str, content: str) -> None:
+        """Cache a URL's summary of ``content`` so repeat requests for it skip extraction."""
+        if not self.cache:
+            return
+        entry = {
+            "title": title,
+            "summary": summary,
+            "method": method,
+            "content_length": len(content),
+            "digest": content_digest(content),
+        }
+        self.cache.set(url_key(canonicalize_url(url), summary_length, MODEL_NAME, PROMPT_VERSION), json.dumps(entry))
+    
+    def cache_url_summaries(self, url: str, summary_length: str, title: Optional[str], summary: str, method: str,
+                            content: str, stats: Optional[Dict[str, Any]] = None) -> None:
+        """Cache a URL's summary and any other lengths generated with it (``stats["summaries"]``)."""
+        for length, text in ((stats or {}).get("summaries") or {summary_length: summary}).items():
+            self.cache_url_summary(url, length, title, text, method, content)
+    
+    def _cache_key(self, content: str, summary_length: str) -> Optional[str]:
+        """Return the summary cache key for this content, or None when caching is disabled."""
+        if not self.cache:
+            return None
+        return self._summary_key(content, summary_length)
+    
+    def _cached_summary(self, content: str, summary_length: str, cache_key: Optional[str],
+                        stats: Optional[Dict[str, Any]] = None) -> Optional[str]:
+        """Return the cached summary of this content or, failing that, of a near duplicate."""
+        if not cache_key:
+            return None
+        with stage_timer(stats, "cache_lookup"):
+            return self._lookup_summary(content, summary_length, cache_key, stats)
+    
+    def _lookup_summary(self, content: str, summary_length: str, cache_key: str,
+                        stats: Optional[Dict[str, Any]] = None) -> Optional[str]:
+        """Look up the exact cache entry, then a near duplicate's; see _cached_summary()."""
+        cached = self.cache.get(cache_key)
+        if cached is not None:
+            record_cache_lookup("content", "hit")
+            return cached
+        
+        fingerprint = simhash(content) if self.fingerprints is not None else None
+        match = self.fingerprints.find(fingerprint, exclude=content_digest(content)) if fingerprint is not None else None
+        if match is None:
+            record_cache_lookup("content", "miss")
+            return None
+        digest, distance = match
+        cached = self.cache.get(make_key(digest, summary_length, MODEL_NAME, PROMPT_VERSION))
+        record_cache_lookup("content", "near_duplicate" if cached is not None else "miss")
+        if cached is not None:
+            logger.info(f"Serving the summary of near-duplicate content {digest[:12]} ({distance} bits apart)")
+            if stats is not None:
+                stats["near_duplicate_distance"] = distance
+        return cached
+    
+    def _store_summary(self, cache_key: Optional[str], content: str, summary: str) -> None:
+        """Cache a summary and index its content for near-duplicate lookups."""
+        if not cache_key:
+            return
+        self.cache.set(cache_key, summary)
+        if self.fingerprints is not None:
+            fingerprint = simhash(content)
+            if fingerprint is not None:
+                self.fingerprints.add(content_digest(content), fingerprint)
+    
+    def _build_messages(self, title: str, content: str, summary_length: str, from_sections: bool = False) -> List[Dict[str, str]]:
+        """Build the Groq chat messages for summarizing the content.
+        
+        With ``from_sections`` the content is a list of section summaries to be
+        combined rather than the article text itself.
+        """
+        # Define summary length instructions
+        length_instructions = {
+            "short": "Provide a concise 2-3 sentence summary highlighting only the most important points.",
+            "medium": "Provide a comprehensive summary in 1-2 paragraphs (4-6 sentences) covering the main points and key insights.",
+            "long": "Provide a detailed summary in 2-3 paragraphs (6-10 sentences) covering main points, supporting details, and key takeaways."
+        }
+        length_instructions["all"] = (
+            'Respond with a JSON object with the keys "short", "medium" and "long", each a summary string. '
+            + " ".join(f'For "{length}": {length_instructions[length]}' for length in SUMMARY_LENGTHS)
+        )
+        
+        length_instruction = length_instructions.get(summary_length, length_instructions["medium"])
+        
+        if from_sections:
+            intro = f"The following are summaries of consecutive sections of a long blog post/article. Combine them into a single summary of the whole article. {length_instruction}"
+        else:
+            intro = f"Please summarize the following blog post/article. {length_instruction}"
+        
+        prompt = f"""{intro}
+
+Title: {title or "Article"}
+
+Content: {content}
+
+Focus on:
+- Main arguments or points
+- Key insights or findings  
+- Important conclusions or takeaways
+- Actionable information if present
+
+Summary:"""
+        
+        return [
+            {
+                "role": "system",
+                "content": "You are an expert content summarizer. Create clear, informative summaries that capture the essence of articles while being engaging and easy to understand. Focus on the most valuable information for readers."
+            },
+            {
+                "role": "user",
+                "content": prompt
+            }
+        ]
+    
+    def _content_token_budget(self, title: str, summary_length: str, from_sections: bool = False) -> int:
+        """Return how many content tokens fit beside the prompt and the reserved output."""
+        overhead = estimate_message_tokens(self._build_messages(title, "", summary_length, from_sections))
+        reserve = OUTPUT_TOKEN_BUDGET.get(summary_length, OUTPUT_TOKEN_BUDGET["medium"])
+        return CONTEXT_WINDOW - overhead - reserve
+    
+    def _pack_prompt(self, title: str, content: str, summary_length: str, from_sections: bool = False) -> Tuple[List[Dict[str, str]], int]:
+        """Fit as much of the content as the context window allows into the prompt.
+        
+        Returns the chat messages and their estimated prompt token count.
+        """
+        budget = self._content_token_budget(title, summary_length, from_sections)
+        content, _ = truncate_to_tokens(content, budget)
+        messages = self._build_messages(title, content, summary_length, from_sections)
+        return messages, estimate_message_tokens(messages)
+    
+    def _create_completion(self, messages: List[Dict[str, str]], max_tokens: int, temperature: float,
+                           stream: bool = False, stats: Optional[Dict[str, Any]] = None,
+                           response_format: Optional[Dict[str, str]] = None) -> Any:
+        """Call Groq once the rate limit scheduler admits the request."""
+        reserved_tokens = estimate_message_tokens(messages) + max_tokens
+        with stage_timer(stats, "rate_limit_wait"):
+            queue_wait = self.scheduler.acquire(reserved_tokens)
+        if stats is not None:
+            stats["queue_wait"] = stats.get("queue_wait", 0.0) + queue_wait
+        
+        options = {"response_format": response_format} if response_format else {}
+        attributes = {"llm.model": MODEL_NAME, "llm.max_tokens": max_tokens, "llm.stream": stream, "llm.queue_wait": queue_wait}
+        with tracer.span("groq.completion", attributes) as span:
+            try:
+                # For a stream this covers the time until the response headers arrive
+                with stage_timer(stats, "groq_request"), IN_PROGRESS.track(operation="groq_request"):
+                    raw_response = self.groq_client.chat.completions.with_raw_response.create(
+                        messages=messages,
+                        model=MODEL_NAME,
+                        temperature=temperature,
+                        max_tokens=max_tokens,
+                        stream=stream,
+                        **options
+                    )
+            except RateLimitError as e:
+                GROQ_REQUESTS.inc(outcome="rate_limited")
+                self.scheduler.update_from_headers(e.response.headers, rate_limited=True)
+                raise
+            except Exception:
+                GROQ_REQUESTS.inc(outcome="error")
+                raise
+            
+            GROQ_REQUESTS.inc(outcome="success")
+            self.scheduler.update_from_headers(raw_response.headers)
+            response = raw_response.parse()
+            if not stream and response.usage:
+                self.scheduler.settle(reserved_tokens, response.usage.total_tokens)
+                record_tokens(stats, response.usage.prompt_tokens, response.usage.completion_tokens)
+                span.set_attributes({
+                    "llm.prompt_tokens": response.usage.prompt_tokens,
+                    "llm.completion_tokens": response.usage.completion_tokens,
+                })
+        return response
+    
+    def _build_chunk_messages(self, title: str, chunk: str) -> List[Dict[str, str]]:
+        """Build the Groq chat messages for summarizing one section of a long article."""
+        prompt = f"""This is one section of a longer blog post/article titled "{title or "Article"}". Summarize this section in one dense paragraph, keeping its key facts, arguments, figures and conclusions.
+
+Section: {chunk}
+
+Section summary:"""
+        
+        return [
+            {
+                "role": "system",
+                "content": "You are an expert content summarizer. Summarize article sections faithfully and concisely so they can later be combined into one summary."
+            },
+            {
+                "role": "user",
+                "content": prompt
+            }
+        ]
+    
+    def _summarize_chunk(self, title: str, chunk: str) -> str:
+        """Summarize one section of a long article, reusing cached section summaries."""
+        cache_key = self._cache_key(chunk, "chunk")
+        if cache_key:
+            cached = self.cache.get(cache_key)
+            if cached is not None:
+                return cached
+        
+        response = self._create_completion(
+            self._build_chunk_messages(title, chunk),
+            max_tokens=OUTPUT_TOKEN_BUDGET["chunk"],
+            temperature=0.3
+        )
+        
+        summary = response.choices[0].message.content.strip()
+        if cache_key:
+            self.cache.set(cache_key, summary)
+        return summary
+    
+    def _precompress(self, content: str, stats: Optional[Dict[str, Any]] = None) -> str:
+        """Keep only the top-ranked sentences when pre-compression is enabled."""
+        if self.precompress_ratio is None:
+            return content
+        budget = int(estimate_tokens(content) * self.precompress_ratio)
+        with stage_timer(stats, "precompress"):
+            compressed, ratio = compress_to_budget(content, budget)
+        logger.info(f"Pre-compressed content to {ratio:.0%} of its tokens")
+        if stats is not None:
+            stats["compression_ratio"] = ratio
+        return compressed
+    
+    def _condense_content(self, title: str, content: str, summary_length: str, stats: Optional[Dict[str, Any]] = None) -> Tuple[str, bool]:
+        """Fit the content into a single prompt, map-summarizing long articles chunk by chunk.
+        
+        Returns the content to summarize and whether it now consists of section summaries.
+        """
+        from_sections = False
+        for _ in range(CONDENSE_ROUNDS):
+            chunks = self._chunks_to_condense(title, content, summary_length, from_sections, stats)
+            if chunks is None:
+                break
+            
+            # Summarize all chunks concurrently, bounded by the shared chunk pool
+            with stage_timer(stats, "chunk_summaries"):
+                partials = list(self.chunk_executor.map(in_current_span(lambda chunk: self._summarize_chunk(title, chunk)), chunks))
+            content = join_sections(partials)
+            from_sections = True
+        
+        return content, from_sections
+    
+    def _chunks_to_condense(self, title: str, content: str, summary_length: str, from_sections: bool,
+                            stats: Optional[Dict[str, Any]] = None) -> Optional[List[str]]:
+        """Return the chunks to map-summarize next, or None once the content fits the prompt."""
+        if estimate_tokens(content) <= self._content_token_budget(title, summary_length, from_sections):
+            return None
+        chunks = split_into_chunks(content, self.chunk_size)
+        if stats is not None:
+            stats.setdefault("chunks", len(chunks))
+        return chunks
+    
+    def summarize_content(self, title: str, content: str, summary_length: str = "medium", stats: Optional[Dict[str, Any]] = None) -> Tuple[Optional[str], Optional[str]]:
+        """Summarize the extracted content using Groq.
+        
+        When ``stats`` is given, the estimated ``prompt_tokens`` of the final call
+        and the seconds spent in the rate limit ``queue_wait`` are recorded in it.
+        Concurrent calls for the same content and length share one Groq call;
+        the callers that waited on another get ``stats["coalesced"]``. In
+        multi-length mode every summary known for the content is recorded under
+        ``stats["summaries"]`` by length.
+        """
+        try:
+            # Serve repeat summaries of identical or near-identical content from the cache
+            cached = self._cached_result(content, summary_length, stats)
+            if cached is not None:
+                return cached, None
+            
+            generated_length = self._generated_length(summary_length)
+            result, shared = self.summary_flights.do(
+                self._summary_key(content, generated_length),
+                self._generate_summary, title, content, generated_length, stats
+            )
+            return self._pick_summary(result, summary_length, shared, stats), None
+            
+        except Exception as e:
+            logger.error(f"Error generating summary: {str(e)}")
+            return None, f"Error generating summary: {str(e)}"
+    
+    def _cached_result(self, content: str, summary_length: str, stats: Optional[Dict[str, Any]] = None) -> Optional[str]:
+        """Return the cached summary of this content or a near duplicate; see summarize_content()."""
+        cached = self._cached_summary(content, summary_length, self._cache_key(content, summary_length), stats)
+        if cached is not None and self.multi_length and stats is not None:
+            stats["summaries"] = self._cached_lengths(content)
+        return cached
+    
+    def _generated_length(self, summary_length: str) -> str:
+        """Return the length to generate: "all" in multi-length mode, where one call writes every length."""
+        return "all" if self.multi_length else summary_length
+    
+    def _pick_summary(self, result: Union[str, Dict[str, str]], summary_length: str, shared: bool,
+                      stats: Optional[Dict[str, Any]] = None) -> str:
+        """Return the requested summary out of a generated result, noting the rest in ``stats``."""
+        if stats is not None:
+            if isinstance(result, dict):
+                stats["summaries"] = result
+            if shared:
+                stats["coalesced"] = True
+        return result[summary_length] if isinstance(result, dict) else result
+    
+    def _generate_summary(self, title: str, content: str, summary_length: str,
+                          stats: Optional[Dict[str, Any]] = None) -> Union[str, Dict[str, str]]:
+        """Call Groq for the summary, or every length if ``summary_length`` is "all", and cache it."""
+        prompt_content = self._precompress(content, stats)
+        prompt_content, from_sections = self._condense_content(title, prompt_content, summary_length, stats)
+        messages = self._summary_messages(title, prompt_content, summary_length, from_sections, stats)
+        response = self._create_completion(messages, stats=stats, **self._summary_options(summary_length))
+        return self._store_generated(content, summary_length, response.choices[0].message.content)
+    
+    def _summary_messages(self, title: str, content: str, summary_length: str, from_sections: bool,
+                          stats: Optional[Dict[str, Any]] = None) -> List[Dict[str, str]]:
+        """Pack the prompt, recording its estimated ``prompt_tokens`` in ``stats``."""
+        messages, prompt_tokens = self._pack_prompt(title, content, summary_length, from_sections)
+        if stats is not None:
+            stats["prompt_tokens"] = prompt_tokens
+        return messages
+    
+    def _summary_options(self, summary_length: str) -> Dict[str, Any]:
+        """Return the completion options of a summary call; "all" asks for a JSON object."""
+        options: Dict[str, Any] = {
+            "max_tokens": OUTPUT_TOKEN_BUDGET.get(summary_length, OUTPUT_TOKEN_BUDGET["medium"]),
+            "temperature": 0.5,
+        }
+        if summary_length == "all":
+            options["response_format"] = {"type": "json_object"}
+        return options
+    
+    def _store_generated(self, content: str, summary_length: str, text: str) -> Union[str, Dict[str, str]]:
+        """Parse a generated summary, or the summaries by length for "all", and cache it."""
+        if summary_length == "all":
+            summaries = parse_summaries(text)
+            for length, summary in summaries.items():
+                self._store_summary(self._cache_key(content, length), content, summary)
+            return summaries
+        summary = text.strip()
+        self._store_summary(self._cache_key(content, summary_length), content, summary)
+        return summary
+    
+    def _cached_lengths(self, content: str) -> Dict[str, str]:
+        """Return the cached summaries of this exact content, by length."""
+        summaries = {}
+        for length in SUMMARY_LENGTHS:
+            cache_key = self._cache_key(content, length)
+            cached = self.cache.get(cache_key) if cache_key else None
+            if cached is not None:
+                summaries[length] = cached
+        return summaries
+    
+    def summarize_content_stream(self, title: str, content: str, summary_length: str = "medium", stats: Optional[Dict[str, Any]] = None) -> Iterator[str]:
+        """Stream the summary from Groq, yielding text as it arrives.
+        
+        Errors are not raised; they are recorded under ``stats["error"]`` together
+        with ``stats["time_to_first_token"]`` and ``stats["total_time"]`` in seconds
+        and the estimated ``stats["prompt_tokens"]`` and ``stats["queue_wait"]``.
+        While another call is already generating this summary, the finished
+        summary is yielded in one piece once it is ready. JSON output cannot be
+        shown as it streams, so in multi-length mode the summary also arrives
+        in one piece.
+        """
+        stats = stats if stats is not None else {}
+        stats["error"] = None
+        start = time.perf_counter()
+        if self.multi_length:
+            summary, stats["error"] = self.summarize_content(title, content, summary_length, stats)
+            stats["time_to_first_token"] = stats["total_time"] = time.perf_counter() - start
+            if summary:
+                yield summary
+            return
+        try:
+            cache_key = self._cache_key(content, summary_length)
+            cached = self._cached_summary(content, summary_length, cache_key, stats)
+            if cached is not None:
+                stats["cached"] = True
+                stats["time_to_first_token"] = stats["total_time"] = time.perf_counter() - start
+                yield cached
+                return
+            
+            flight_key = self._summary_key(content, summary_length)
+            while True:
+                flight, leader = self.summary_flights.join(flight_key)
+                if leader:
+                    break
+                try:
+                    summary = flight.wait()
+                except FlightAbandoned:
+                    continue
+                stats["coalesced"] = True
+                stats["time_to_first_token"] = stats["total_time"] = time.perf_counter() - start
+                yield summary
+                return
+            
+            # If the caller stops reading mid-stream, waiting callers start over
+            outcome: Dict[str, Any] = {"error": FlightAbandoned()}
+            try:
+                summary = yield from self._stream_summary(title, content, summary_length, cache_key, stats, start)
+                outcome = {"result": summary}
+            except Exception as e:
+                outcome = {"error": e}
+                raise
+            finally:
+                self.summary_flights.finish(flight_key, flight, **outcome)
+            
+        except Exception as e:
+            logger.error(f"Error generating summary: {str(e)}")
+            stats["error"] = f"Error generating summary: {str(e)}"
+    
+    def _stream_summary(self, title: str, content: str, summary_length: str, cache_key: Optional[str],
+                        stats: Dict[str, Any], start: float) -> Generator[str, None, str]:
+        """Stream the summary from Groq and cache it, returning the full text; see summarize_content_stream()."""
+        prompt_content = self._precompress(content, stats)
+        prompt_content, from_sections = self._condense_content(title, prompt_content, summary_length, stats)
+        messages = self._summary_messages(title, prompt_content, summary_length, from_sections, stats)
+        options = self._summary_options(summary_length)
+        max_tokens = options["max_tokens"]
+        stream = self._create_completion(messages, stream=True, stats=stats, **options)
+        
+        parts = []
+        stream_start = time.perf_counter()
+        for chunk in stream:
+            # Groq reports usage on the last chunk of a stream; only then can
+            # the reservation _create_completion() made be settled
+            usage = getattr(getattr(chunk, "x_groq", None), "usage", None)
+            if usage:
+                self.scheduler.settle(stats["prompt_tokens"] + max_tokens, usage.total_tokens)
+                record_tokens(stats, usage.prompt_tokens, usage.completion_tokens)
+            if not chunk.choices:
+                continue
+            delta = chunk.choices[0].delta.content
+            if not delta:
+                continue
+            if not parts:
+                stats["time_to_first_token"] = time.perf_counter() - start
+                record_stage(stats, "time_to_first_token", stats["time_to_first_token"])
+            parts.append(delta)
+            yield delta
+        # Includes the consumer's time between tokens, as the stream is pulled lazily
+        record_stage(stats, "groq_stream", time.perf_counter() - stream_start)
+        
+        stats["total_time"] = time.perf_counter() - start
+        logger.info(f"Streamed summary: time_to_first_token={stats.get('time_to_first_token', 0):.3f}s total_time={stats['total_time']:.3f}s")
+        summary = "".join(parts).strip()
+        if not summary:
+            raise ValueError("empty response from model")
+        self._store_summary(cache_key, content, summary)
+        return summary
+    
+    def summarize_url(self, url: str, summary_length: str = "medium", stats: Optional[Dict[str, Any]] = None) -> Tuple[Optional[str], Optional[str], Optional[str], str]:
+        """Extract and summarize a URL in one call.
+        
+        Returns (title, summary, error, method). When ``stats`` is given, the
+        ``extract_time`` and ``summarize_time`` in seconds are recorded in it
+        along with the details summarize_content() records. Summaries cached
+        for the canonical URL are returned without fetching the page. Each
+        call is traced as a "summarize_url" span whose ``trace_id`` is recorded
+        in ``stats``.
+        """
+        stats = stats if stats is not None else {}
+        with tracer.span("summarize_url", {"url.host": urlparse(url).netloc.lower(), "summary.length": summary_length}) as span:
+            stats["trace_id"] = span.trace_id
+            with self.profile_request("summarize_url", span.trace_id):
+                title, summary, error, method = self._summarize_url(url, summary_length, stats)
+            span.set_attributes({"extraction.method": method, "cached": stats.get("cached", False)})
+            if error:
+                span.record_error(error)
+        return title, summary, error, method
+    
+    def profile_request(self, name: str, trace_id: Optional[str] = None) -> ContextManager[None]:
+        """Profile a request with the configured profiler, if it samples this one."""
+        return self.profiler.profile(name, trace_id) if self.profiler else nullcontext()
+    
+    def _summarize_url(self, url: str, summary_length: str, stats: Dict[str, Any]) -> Tuple[Optional[str], Optional[str], Optional[str], str]:
+        """Untraced body of summarize_url()."""
+        result = self._url_preflight(url, summary_length, stats)
+        if result is not None:
+            return result
+        
+        start = time.perf_counter()
+        title, content, error, method = self.extract_content(url, stats)
+        stats["extract_time"] = time.perf_counter() - start
+        result = self._unsummarizable(title, content, error, method, stats)
+        if result is not None:
+            return result
+        
+        start = time.perf_counter()
+        summary, error = self.summarize_content(title or "Untitled Article", content, summary_length, stats=stats)
+        stats["summarize_time"] = time.perf_counter() - start
+        if summary:
+            self.cache_url_summaries(url, summary_length, title, summary, method, content, stats)
+        return title, summary, error, method
+    
+    def _url_preflight(self, url: str, summary_length: str, stats: Dict[str, Any]) -> Optional[Tuple[Optional[str], Optional[str], Optional[str], str]]:
+        """Return summarize_url()'s result when no extraction is needed: an invalid URL or a URL-cache hit."""
+        if not self.is_valid_url(url):
+            return None, None, INVALID_URL_ERROR, "unknown"
+        
+        cached = self.get_cached_summary(url, summary_length)
+        if cached is None:
+            return None
+        stats["cached"] = True
+        stats["content_length"] = cached["content_length"]
+        return cached["title"], cached["summary"], None, cached["method"]
+    
+    def _unsummarizable(self, title: Optional[str], content: Optional[str], error: Optional[str], method: str,
+                        stats: Dict[str, Any]) -> Optional[Tuple[Optional[str], Optional[str], Optional[str], str]]:
+        """Return summarize_url()'s result when extraction failed or found too little to summarize."""
+        if error:
+            return title, None, error, method
+        if not content or len(content.strip()) < 100:
+            return title, None, INSUFFICIENT_CONTENT_ERROR, method
+        stats["content_length"] = len(content)
+        return None
+
+
+def join_sections(partials: List[str]) -> str:
+    """Join section summaries into the content of the next summarization round."""
+    return "\n\n".join(f"Section {i}: {partial}" for i, partial in enumerate(partials, 1))
+
+
+def parse_summaries(text: str) -> Dict[str, str]:
+    """Parse the JSON object of summaries by length returned in multi-length mode."""
+    data = json.loads(text)
+    if not isinstance(data, dict):
+        raise ValueError("model did not return a JSON object")
+    summaries = {}
+    for length in SUMMARY_LENGTHS:
+        summary = data.get(length)
+        if not isinstance(summary, str) or not summary.strip():
+            raise ValueError(f"model response has no {length} summary")
+        summaries[length] = summary.strip()
+    return summaries
+
+
+def summarizer_options_from_env() -> Dict[str, Any]:
+    """Read BlogSummarizer keyword arguments from environment variables."""
+    cache = SummaryCache(
+        os.getenv("SUMMARY_CACHE_PATH", ".cache/summaries.db"),
+        max_bytes=int(os.getenv("SUMMARY_CACHE_MAX_BYTES", 64 * 1024 * 1024)),
+        ttl=float(os.getenv("SUMMARY_CACHE_TTL", 7 * 24 * 3600))
+    )
+    near_duplicate_distance = int(os.getenv("NEAR_DUPLICATE_DISTANCE", 3))
+    return dict(
+        cache=cache,
+        multi_length=os.getenv("SUMMARIZE_ALL_LENGTHS", "false").lower() in ("1", "true", "yes"),
+        profiler=profiler_from_env(),
+        precompress_ratio=float(os.environ["PRECOMPRESS_RATIO"]) if os.getenv("PRECOMPRESS_RATIO") else None,
+        fingerprints=FingerprintIndex(cache.path, max_distance=near_duplicate_distance) if near_duplicate_distance >= 0 else None,
+        chunk_concurrency=int(os.getenv("CHUNK_CONCURRENCY", 4)),
+        hedge_delay=float(os.environ["EXTRACTION_HEDGE_DELAY"]) if os.getenv("EXTRACTION_HEDGE_DELAY") else None,
+        hedge_firecrawl_workers=int(os.getenv("EXTRACTION_HEDGE_FIRECRAWL_WORKERS", 16)),
+        hedge_fallback_workers=int(os.getenv("EXTRACTION_HEDGE_FALLBACK_WORKERS", 32)),
+        parser=os.getenv("HTML_PARSER", "lxml"),
+        content_extractor=os.getenv("CONTENT_EXTRACTOR", "density"),
+        structured_data=os.getenv("STRUCTURED_DATA_FAST_PATH", "true").lower() not in ("0", "false", "no"),
+        resolve_canonical=os.getenv("RESOLVE_CANONICAL_LINKS", "false").lower() in ("1", "true", "yes"),
+        max_download_bytes=int(os.getenv("FETCH_MAX_BYTES", 5 * 1024 * 1024)),
+        pool_connections=int(os.getenv("HTTP_POOL_CONNECTIONS", 20)),
+        max_connections_per_host=int(os.getenv("HTTP_MAX_CONNECTIONS_PER_HOST", 10)),
+        max_retries=int(os.getenv("HTTP_MAX_RETRIES", 3)),
+        backoff_factor=float(os.getenv("HTTP_BACKOFF_FACTOR", 0.5)),
+        firecrawl_breaker=CircuitBreaker(
+            failure_rate=float(os.getenv("FIRECRAWL_BREAKER_FAILURE_RATE", 0.5)),
+            slow_call_seconds=float(os.getenv("FIRECRAWL_BREAKER_SLOW_SECONDS", 15)),
+            cooldown_seconds=float(os.getenv("FIRECRAWL_BREAKER_COOLDOWN", 30))
+        ),
+        scheduler=RateLimitScheduler(
+            requests_per_minute=int(os.getenv("GROQ_REQUESTS_PER_MINUTE", 30)),
+            tokens_per_minute=int(os.getenv("GROQ_TOKENS_PER_MINUTE", 30000))
+        )
+    )
+
+
+def create_summarizer(groq_api_key: str, firecrawl_api_key: Optional[str] = None) -> BlogSummarizer:
+    """Build a BlogSummarizer configured from environment variables."""
+    if tracer.exporter is None:
+        tracer.exporter = exporter_from_env()
+    return BlogSummarizer(groq_api_key, firecrawl_api_key, **summarizer_options_from_env())
@@ -0,0 +1,155 @@
+import json
+import os
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional, Tuple
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from groq import Groq  # noqa: E402
+
+
+def article_html(title: str, paragraphs: int = 40, canonical: Optional[str] = None) -> bytes:
+    """A plain article page long enough to be worth summarizing."""
+    body = "".join(
+        f"<p>Paragraph {i} of {title} explains one more detail of the topic at a comfortable length.</p>"
+        for i in range(paragraphs)
+    )
+    link = f'<link rel="canonical" href="{canonical}">' if canonical else ""
+    return (
+        f"<html><head><title>{title}</title>{link}</head>"
+        f"<body><article><h1>{title}</h1>{body}</article></body></html>"
+    ).encode("utf-8")
+
+
+class Recorder:
+    """What a stand-in server saw: request paths and client addresses."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.requests: List[Tuple[str, str]] = []
+        self.client_ports: List[int] = []
+
+    def record(self, method: str, path: str, client_address: Tuple[str, int]) -> None:
+        with self.lock:
+            self.requests.append((method, path))
+            self.client_ports.append(client_address[1])
+
+    def count(self, method: str) -> int:
+        with self.lock:
+            return sum(1 for request_method, _ in self.requests if request_method == method)
+
+
+def _serve(handler: type) -> ThreadingHTTPServer:
+    server = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+@pytest.fixture
+def page_server():
+    """Keep-alive HTTP/1.1 server answering every path with an article page.
+
+    Yields (base_url, recorder, options); set options["delay"] to slow it down
+    and options["canonical"] to give every page that rel=canonical link.
+    """
+    recorder = Recorder()
+    options: Dict[str, Any] = {"delay": 0.0, "canonical": None}
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_GET(self):
+            recorder.record("GET", self.path, self.client_address)
+            if options["delay"]:
+                time.sleep(options["delay"])
+            body = article_html(f"Article {self.path.split('?')[0]}", canonical=options["canonical"])
+            self.send_response(200)
+            self.send_header("Content-Type", "text/html; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    server = _serve(Handler)
+    yield f"http://127.0.0.1:{server.server_port}", recorder, options
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def groq_server():
+    """Stand-in for the Groq chat completions API, streaming included.
+
+    Yields (base_url, recorder, options); options["content"] is the completion
+    text and options["delay"] how long each call takes.
+    """
+    recorder = Recorder()
+    options = {"content": "A short summary of the article.", "delay": 0.0}
+    usage = {"prompt_tokens": 100, "completion_tokens": 20, "total_tokens": 120}
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_POST(self):
+            recorder.record("POST", self.path, self.client_address)
+            request = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+            if options["delay"]:
+                time.sleep(options["delay"])
+            base = {"id": "chatcmpl-test", "created": int(time.time()), "model": request["model"]}
+            if request.get("stream"):
+                self._stream(base)
+                return
+            body = json.dumps({
+                **base,
+                "object": "chat.completion",
+                "choices": [{
+                    "index": 0,
+                    "message": {"role": "assistant", "content": options["content"]},
+                    "finish_reason": "stop",
+                }],
+                "usage": usage,
+            }).encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def _stream(self, base):
+            chunks = [
+                {**base, "object": "chat.completion.chunk",
+                 "choices": [{"index": 0, "delta": {"content": word + " "}, "finish_reason": None}]}
+                for word in options["content"].split()
+            ]
+            chunks.append({**base, "object": "chat.completion.chunk",
+                           "choices": [{"index": 0, "delta": {}, "finish_reason": "stop"}],
+                           "x_groq": {"id": "req-test", "usage": usage}})
+            events = "".join(f"data: {json.dumps(chunk)}\n\n" for chunk in chunks) + "data: [DONE]\n\n"
+            body = events.encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "text/event-stream")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    server = _serve(Handler)
+    yield f"http://127.0.0.1:{server.server_port}", recorder, options
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def groq_client(groq_server):
+    base_url, _, _ = groq_server
+    return Groq(api_key="test-key", base_url=base_url, max_retries=0)
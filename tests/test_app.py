@@ -0,0 +1,20 @@
+import pytest
+
+app = pytest.importorskip("app")
+
+from cache import SummaryCache  # noqa: E402
+from summarizer import BlogSummarizer  # noqa: E402
+
+
+@pytest.mark.parametrize("stream_summary", [False, True])
+def test_cached_url_is_shown_without_extracting(page_server, groq_server, groq_client, tmp_path, stream_summary):
+    base_url, pages, _ = page_server
+    _, completions, _ = groq_server
+    summarizer = BlogSummarizer("test-key", groq_client=groq_client, cache=SummaryCache(str(tmp_path / "summaries.db")))
+
+    app.summarize_and_show(summarizer, base_url + "/post", "short", stream_summary, None)
+    app.summarize_and_show(summarizer, base_url + "/post?utm_source=newsletter", "short", stream_summary, None)
+
+    assert pages.count("GET") == 1
+    assert completions.count("POST") == 1
+    assert summarizer.get_cached_summary(base_url + "/post", "short")["summary"] == "A short summary of the article."
@@ -0,0 +1,120 @@
+import asyncio
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from async_summarizer import AsyncBlogSummarizer
+from cache import SummaryCache
+
+
+class ThreadRecordingCache(SummaryCache):
+    """SummaryCache that notes which threads touch SQLite."""
+
+    def __init__(self, path):
+        super().__init__(path)
+        self.threads = set()
+
+    def get(self, key):
+        self.threads.add(threading.get_ident())
+        return super().get(key)
+
+    def set(self, key, value):
+        self.threads.add(threading.get_ident())
+        return super().set(key, value)
+
+
+def test_async_summarizer_uses_injected_groq_client_and_keeps_cache_off_the_loop(page_server, groq_server, groq_client, tmp_path):
+    base_url, pages, _ = page_server
+    _, completions, _ = groq_server
+    cache = ThreadRecordingCache(str(tmp_path / "summaries.db"))
+
+    async def summarize_twice():
+        summarizer = AsyncBlogSummarizer("test-key", groq_client=groq_client, cache=cache)
+        try:
+            first = await summarizer.summarize_url(base_url + "/post", "short")
+            second = await summarizer.summarize_url(base_url + "/post?utm_source=feed", "short")
+        finally:
+            await summarizer.aclose()
+        return first, second, threading.get_ident()
+
+    first, second, loop_thread = asyncio.run(summarize_twice())
+
+    assert first[1] == "A short summary of the article."
+    assert second[1] == first[1]
+    assert pages.count("GET") == 1
+    assert completions.count("POST") == 1
+    assert cache.threads and loop_thread not in cache.threads
+
+
+def test_async_multi_length_summaries_are_all_cached_for_the_url(page_server, groq_server, groq_client, tmp_path):
+    base_url, pages, _ = page_server
+    _, completions, groq_options = groq_server
+    summaries = {"short": "Short.", "medium": "Medium summary.", "long": "A long summary."}
+    groq_options["content"] = json.dumps(summaries)
+
+    async def run():
+        summarizer = AsyncBlogSummarizer("test-key", groq_client=groq_client, multi_length=True,
+                                         cache=SummaryCache(str(tmp_path / "summaries.db")))
+        try:
+            first = await summarizer.summarize_url(base_url + "/post", "short")
+            stats = {}
+            second = await summarizer.summarize_url(base_url + "/post", "long", stats=stats)
+        finally:
+            await summarizer.aclose()
+        return first, second, stats
+
+    first, second, stats = asyncio.run(run())
+
+    assert first[1] == "Short."
+    assert second[1] == "A long summary." and stats["cached"]
+    assert pages.count("GET") == 1
+    assert completions.count("POST") == 1
+
+
+class SlowFirecrawl:
+    """Firecrawl stand-in that answers only after ``delay`` seconds."""
+
+    def __init__(self, delay):
+        self.delay = delay
+
+    def scrape_url(self, url, params=None):
+        time.sleep(self.delay)
+        return {"success": True, "data": {"title": "Slow", "markdown": "Firecrawl text. " * 50}}
+
+
+def test_slow_firecrawl_calls_do_not_queue_cache_hits(page_server, groq_client, tmp_path):
+    base_url, _, _ = page_server
+
+    async def run():
+        # A one-thread default executor makes any head-of-line blocking obvious
+        asyncio.get_running_loop().set_default_executor(ThreadPoolExecutor(max_workers=1))
+        summarizer = AsyncBlogSummarizer("test-key", groq_client=groq_client, firecrawl_client=SlowFirecrawl(1.5),
+                                         cache=SummaryCache(str(tmp_path / "summaries.db")))
+        try:
+            await asyncio.to_thread(summarizer.core.cache_url_summary, base_url + "/cached", "short",
+                                    "Cached", "Cached summary.", "Firecrawl", "Cached content.")
+            slow = [asyncio.create_task(summarizer.extract_with_firecrawl(f"{base_url}/slow-{i}")) for i in range(4)]
+            await asyncio.sleep(0.1)
+            start = time.perf_counter()
+            _, summary, _, _ = await summarizer.summarize_url(base_url + "/cached", "short")
+            elapsed = time.perf_counter() - start
+            results = await asyncio.gather(*slow)
+        finally:
+            await summarizer.aclose()
+        return summary, elapsed, results
+
+    summary, elapsed, results = asyncio.run(run())
+
+    assert summary == "Cached summary."
+    assert elapsed < 1.0
+    assert all(error is None for _, _, error in results)
+
+
+def test_async_summarizer_has_no_blocking_entry_points(groq_client):
+    summarizer = AsyncBlogSummarizer("test-key", groq_client=groq_client)
+    try:
+        assert not hasattr(summarizer, "summarize_content_stream")
+        assert asyncio.iscoroutinefunction(summarizer.summarize_url)
+    finally:
+        asyncio.run(summarizer.aclose())
@@ -0,0 +1,92 @@
+import pytest
+
+from cache import SummaryCache
+from canonical import canonicalize_url, find_canonical_link
+from summarizer import BlogSummarizer
+
+
+@pytest.mark.parametrize("variant", [
+    "https://example.com/post",
+    "http://example.com/post",
+    "https://EXAMPLE.com/post/",
+    "https://example.com:443/post",
+    "https://example.com/post#comments",
+    "https://example.com/post?utm_source=newsletter&utm_medium=email",
+    "https://example.com/post?fbclid=abc123",
+    "https://example.com/post/amp",
+    "https://example.com/post.amp",
+    "https://example.com/post?amp=1",
+    "https://amp.example.com/post",
+    "https://example-com.cdn.ampproject.org/c/s/example.com/post",
+])
+def test_variants_of_one_article_canonicalize_alike(variant):
+    assert canonicalize_url(variant) == "https://example.com/post"
+
+
+def test_meaningful_query_parameters_are_kept_and_sorted():
+    assert canonicalize_url("https://example.com/search?q=python&page=2&utm_campaign=x") == \
+        "https://example.com/search?page=2&q=python"
+    assert canonicalize_url("https://example.com:8080/post") == "https://example.com:8080/post"
+
+
+def head(link):
+    return f"<html><head><title>Post</title>{link}</head><body></body></html>".encode("utf-8")
+
+
+def test_canonical_link_is_resolved_and_canonicalized():
+    html = head('<link rel="canonical" href="/2024/post/?utm_source=feed">')
+
+    assert find_canonical_link(html, "https://www.example.com/p?id=7") == "https://www.example.com/2024/post"
+
+
+def test_canonical_link_to_another_site_is_ignored():
+    html = head('<link rel="canonical" href="https://other.example/post">')
+
+    assert find_canonical_link(html, "https://example.com/post") is None
+
+
+def test_site_wide_home_page_canonical_is_ignored():
+    html = head('<link rel="canonical" href="/">')
+
+    assert find_canonical_link(html, "https://example.com/alpha") is None
+    assert find_canonical_link(html, "https://example.com/") == "https://example.com/"
+
+
+def test_canonical_link_outside_the_head_is_ignored():
+    html = b'<html><head></head><body><link rel="canonical" href="/elsewhere"></body></html>'
+
+    assert find_canonical_link(html, "https://example.com/post") is None
+
+
+def test_shared_section_canonical_does_not_mix_up_summaries(page_server, groq_server, groq_client, tmp_path):
+    base_url, pages, page_options = page_server
+    _, _, groq_options = groq_server
+    summarizer = BlogSummarizer("test-key", groq_client=groq_client, resolve_canonical=True,
+                                cache=SummaryCache(str(tmp_path / "summaries.db")))
+    # Every page claims the section page as its canonical URL
+    page_options["canonical"] = "/news"
+
+    for path, length in (("/alpha", "short"), ("/beta", "short"), ("/news", "medium")):
+        groq_options["content"] = f"Summary of {path}."
+        _, summary, error, _ = summarizer.summarize_url(base_url + path, length)
+        assert error is None and summary == f"Summary of {path}."
+
+    groq_options["content"] = "Fresh summary."
+    assert summarizer.summarize_url(base_url + "/alpha", "short")[1] == "Summary of /alpha."
+    # /news has a medium summary, but of other content, so /beta is fetched again
+    assert summarizer.summarize_url(base_url + "/beta", "medium")[1] == "Fresh summary."
+    assert pages.count("GET") == 4
+
+
+def test_alias_to_the_same_content_is_followed(page_server, groq_server, groq_client, tmp_path):
+    base_url, pages, page_options = page_server
+    summarizer = BlogSummarizer("test-key", groq_client=groq_client, resolve_canonical=True,
+                                cache=SummaryCache(str(tmp_path / "summaries.db")))
+    page_options["canonical"] = "/post"
+
+    summarizer.summarize_url(base_url + "/post", "medium")
+    summarizer.summarize_url(base_url + "/post?ref=home", "short")
+    _, summary, error, _ = summarizer.summarize_url(base_url + "/post?ref=home", "medium")
+
+    assert error is None and summary == "A short summary of the article."
+    assert pages.count("GET") == 2
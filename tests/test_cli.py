@@ -0,0 +1,33 @@
+import json
+import sys
+
+import cli
+
+
+def run_cli(monkeypatch, tmp_path, groq_server, urls):
+    base_url, _, _ = groq_server
+    monkeypatch.setenv("GROQ_API_KEY", "test-key")
+    monkeypatch.setenv("GROQ_BASE_URL", base_url)
+    monkeypatch.setenv("SUMMARY_CACHE_PATH", str(tmp_path / "summaries.db"))
+    monkeypatch.setenv("HTTP_MAX_RETRIES", "0")
+    monkeypatch.delenv("FIRECRAWL_API_KEY", raising=False)
+    (tmp_path / "urls.txt").write_text("\n".join(urls) + "\n", encoding="utf-8")
+    output = tmp_path / "out.jsonl"
+    monkeypatch.setattr(sys, "argv", ["cli.py", str(tmp_path / "urls.txt"), "-o", str(output), "-l", "short"])
+    status = cli.main()
+    return status, [json.loads(line) for line in output.read_text(encoding="utf-8").splitlines()]
+
+
+def test_exit_status_is_zero_when_every_url_succeeds(monkeypatch, tmp_path, groq_server, page_server):
+    status, records = run_cli(monkeypatch, tmp_path, groq_server, [page_server[0] + "/post"])
+
+    assert status == 0
+    assert [record["error"] for record in records] == [None]
+
+
+def test_exit_status_reports_failed_urls(monkeypatch, tmp_path, groq_server, page_server):
+    # Nothing listens on the discard port, so the second URL fails to download
+    status, records = run_cli(monkeypatch, tmp_path, groq_server, [page_server[0] + "/post", "http://127.0.0.1:9/post"])
+
+    assert status == 1
+    assert sorted(record["error"] is None for record in records) == [False, True]
@@ -0,0 +1,44 @@
+import random
+import tracemalloc
+
+import numpy as np
+
+from compression import MAX_SENTENCES, compress_to_budget, textrank
+from text_utils import estimate_tokens
+
+
+def prose(sentences, vocabulary_size=50000, seed=1):
+    """Sentences drawn from a large vocabulary, the worst case for a dense term matrix."""
+    rng = random.Random(seed)
+    vocabulary = [f"term{i}" for i in range(vocabulary_size)]
+    return [" ".join(rng.choice(vocabulary) for _ in range(12)).capitalize() + "." for _ in range(sentences)]
+
+
+def test_textrank_memory_is_bounded_on_long_text():
+    sentences = prose(2 * MAX_SENTENCES + 500)
+
+    tracemalloc.start()
+    try:
+        scores = textrank(sentences)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    assert scores.shape == (len(sentences),)
+    assert np.all(np.isfinite(scores))
+    # A sentences x vocabulary matrix alone would take 900 MB here
+    assert peak < 150 * 1024 * 1024
+
+
+def test_compress_to_budget_keeps_the_central_sentences_in_order():
+    filler = prose(30)
+    theme = [f"The cache server queue latency rises under load in test {i}." for i in range(5)]
+    text = "\n\n".join(" ".join(filler[i:i + 5] + theme[i // 5:i // 5 + 1]) for i in range(0, 30, 5))
+
+    compressed, ratio = compress_to_budget(text, estimate_tokens(text) // 3)
+
+    assert estimate_tokens(compressed) <= estimate_tokens(text) // 3
+    assert 0 < ratio < 0.4
+    kept = [sentence for sentence in theme if sentence in compressed]
+    assert len(kept) >= 4
+    assert [compressed.index(sentence) for sentence in kept] == sorted(compressed.index(sentence) for sentence in kept)
@@ -0,0 +1,30 @@
+import pytest
+
+app = pytest.importorskip("app")
+
+
+@pytest.fixture
+def shared_summarizer(groq_server, tmp_path, monkeypatch):
+    base_url, _, _ = groq_server
+    monkeypatch.setenv("GROQ_BASE_URL", base_url)
+    monkeypatch.setenv("SUMMARY_CACHE_PATH", str(tmp_path / "summaries.db"))
+    app.get_summarizer.clear()
+    yield app.get_summarizer
+    app.get_summarizer.clear()
+
+
+def test_summarizer_is_shared_across_reruns(shared_summarizer):
+    assert shared_summarizer("test-key") is shared_summarizer("test-key")
+
+
+def test_consecutive_summarizations_reuse_one_connection(shared_summarizer, page_server):
+    base_url, pages, _ = page_server
+
+    for path in ("/first-post", "/second-post"):
+        # Every rerun looks the summarizer up again, as the Streamlit script does
+        title, summary, error, method = shared_summarizer("test-key").summarize_url(base_url + path, "short")
+        assert error is None
+        assert summary
+
+    assert pages.count("GET") == 2
+    assert len(set(pages.client_ports)) == 1
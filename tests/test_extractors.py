@@ -0,0 +1,54 @@
+import pytest
+
+from bench_extraction import generate_page, word_f1
+from extractors import PARSER_BACKENDS, parse_html
+from summarizer import BlogSummarizer
+
+
+@pytest.mark.parametrize("backend", list(PARSER_BACKENDS))
+@pytest.mark.parametrize("extractor", ["density", "selectors"])
+def test_article_layout_is_extracted_exactly(backend, extractor):
+    html, expected = generate_page(50_000)
+
+    title, content = parse_html(html.encode("utf-8"), backend, extractor=extractor)
+
+    assert title == "Benchmark Article"
+    assert word_f1(content, expected) > 0.99
+
+
+@pytest.mark.parametrize("backend", list(PARSER_BACKENDS))
+def test_density_skips_comments_sharing_the_content_wrapper(backend):
+    html, expected = generate_page(50_000, layout="comments")
+
+    _, density = parse_html(html.encode("utf-8"), backend, extractor="density")
+    _, selectors = parse_html(html.encode("utf-8"), backend, extractor="selectors")
+
+    assert word_f1(density, expected) > 0.99
+    # .content matches the wrapper, so the selectors return the thread as well
+    assert len(selectors) > 2.5 * len(density)
+    assert word_f1(selectors, expected) < 0.6
+
+
+def test_structured_data_ignores_unknown_charset():
+    body = "A complete article body from the JSON-LD block. " * 20
+    html = (
+        '<html><head><script type="application/ld+json">'
+        f'{{"@type": "BlogPosting", "headline": "Structured", "articleBody": "{body}"}}'
+        '</script></head><body><p>Teaser</p></body></html>'
+    ).encode("utf-8")
+
+    title, content = parse_html(html, "lxml", encoding="utf8mb4")
+
+    assert title == "Structured"
+    assert content == body.strip()
+
+
+@pytest.mark.parametrize("backend", list(PARSER_BACKENDS))
+def test_unknown_header_charset_is_sniffed_instead(backend):
+    html, expected = generate_page(50_000)
+    summarizer = BlogSummarizer("test-key", parser=backend, structured_data=False)
+
+    title, content = summarizer._parse_page(html.encode("utf-8"), "text/html; charset=utf8mb4")
+
+    assert title == "Benchmark Article"
+    assert word_f1(content, expected) > 0.99
@@ -0,0 +1,61 @@
+import copy
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from summarizer import BlogSummarizer
+
+
+class SlowFirecrawl:
+    """Firecrawl stand-in that always answers, but only after ``delay`` seconds."""
+
+    def __init__(self, delay):
+        self.delay = delay
+
+    def scrape_url(self, url, params=None):
+        time.sleep(self.delay)
+        return {"success": True, "data": {"title": "Slow", "markdown": "Firecrawl text. " * 50}}
+
+
+def test_slow_firecrawl_legs_do_not_hold_up_basic_scraping(page_server, groq_client):
+    base_url, _, options = page_server
+    options["delay"] = 0.05
+    summarizer = BlogSummarizer(
+        "test-key",
+        groq_client=groq_client,
+        firecrawl_client=SlowFirecrawl(1.5),
+        hedge_delay=0,
+        hedge_firecrawl_workers=4,
+    )
+
+    def extract(i):
+        start = time.perf_counter()
+        _, content, error, method = summarizer.extract_content(f"{base_url}/post-{i}")
+        return time.perf_counter() - start, error, method
+
+    with ThreadPoolExecutor(max_workers=24) as pool:
+        results = list(pool.map(extract, range(24)))
+
+    assert all(error is None and method == "Basic Scraping" for _, error, method in results)
+    # Losing Firecrawl calls occupy their own pool for 1.5 s; scraping must not wait for them
+    assert max(elapsed for elapsed, _, _ in results) < 1.0
+
+
+def test_losing_leg_does_not_write_into_the_callers_stats(page_server, groq_client):
+    base_url, _, _ = page_server
+    summarizer = BlogSummarizer(
+        "test-key",
+        groq_client=groq_client,
+        firecrawl_client=SlowFirecrawl(0.3),
+        hedge_delay=0,
+    )
+
+    stats = {}
+    _, _, error, method = summarizer.extract_content(base_url + "/post", stats=stats)
+    returned = copy.deepcopy(stats)
+    # Let the losing Firecrawl call finish in the background
+    time.sleep(0.5)
+
+    assert error is None and method == "Basic Scraping"
+    assert "download" in stats["timings"]
+    assert "firecrawl_request" not in stats["timings"]
+    assert stats == returned
@@ -0,0 +1,67 @@
+import re
+import urllib.request
+
+import pytest
+
+import metrics
+from summarizer import BlogSummarizer
+
+SAMPLE_LINE = re.compile(r'^(?P<name>[a-zA-Z_:][\w:]*)(?P<labels>\{[^}]*\})? (?P<value>\S+)$')
+
+
+def parse_samples(text):
+    """Map 'name{labels}' to its value for every sample line of an exposition."""
+    samples = {}
+    for line in text.splitlines():
+        if line.startswith("#") or not line:
+            continue
+        match = SAMPLE_LINE.match(line)
+        assert match, f"malformed sample line: {line!r}"
+        samples[match["name"] + (match["labels"] or "")] = float(match["value"])
+    return samples
+
+
+def test_histogram_buckets_are_cumulative():
+    histogram = metrics.Histogram("test_seconds", "Test.", (0.1, 1.0), ("stage",))
+    for value in (0.05, 0.1, 0.5, 5.0):
+        histogram.observe(value, stage="parse")
+
+    series = histogram.snapshot()[("parse",)]
+
+    # le is inclusive: 0.1 falls in the 0.1 bucket
+    assert series["buckets"] == [2, 3, 4]
+    assert series["count"] == 4
+    assert series["sum"] == pytest.approx(5.65)
+
+
+def test_labels_are_escaped():
+    assert metrics._format_labels(("url",), ('say "hi"\\\n',)) == '{url="say \\"hi\\"\\\\\\n"}'
+
+
+def test_exporter_serves_a_summarization_in_the_text_format(page_server, groq_client):
+    base_url, _, _ = page_server
+    before = metrics.GROQ_REQUESTS.snapshot().get(("success",), 0.0)
+    summarizer = BlogSummarizer("test-key", groq_client=groq_client)
+    _, summary, error, _ = summarizer.summarize_url(base_url + "/post", "short")
+    assert error is None and summary
+
+    server = metrics.start_http_server(0)
+    try:
+        with urllib.request.urlopen(f"http://127.0.0.1:{server.server_port}/metrics", timeout=5) as response:
+            content_type = response.headers["Content-Type"]
+            text = response.read().decode("utf-8")
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    assert content_type == metrics.CONTENT_TYPE
+    assert "# TYPE blog_summarizer_stage_seconds histogram" in text
+    samples = parse_samples(text)
+    assert samples['blog_summarizer_groq_requests_total{outcome="success"}'] == before + 1
+
+    stage = 'stage="download"'
+    buckets = [value for name, value in samples.items()
+               if name.startswith("blog_summarizer_stage_seconds_bucket{") and stage in name]
+    assert buckets == sorted(buckets)
+    assert samples[f'blog_summarizer_stage_seconds_bucket{{{stage},le="+Inf"}}'] == \
+        samples[f"blog_summarizer_stage_seconds_count{{{stage}}}"]
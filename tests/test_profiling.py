@@ -0,0 +1,49 @@
+import os
+
+from profiling import Profiler
+from summarizer import BlogSummarizer
+
+
+def test_sampled_request_reports_allocations_at_parse_boundary(tmp_path, groq_client, page_server):
+    base_url, _, _ = page_server
+    profiler = Profiler(str(tmp_path / "profiles"), sample_every=1)
+    summarizer = BlogSummarizer("test-key", groq_client=groq_client, parser="lxml", profiler=profiler)
+
+    title, summary, error, method = summarizer.summarize_url(base_url + "/post", "short")
+    assert error is None
+
+    names = sorted(os.listdir(tmp_path / "profiles"))
+    assert [os.path.splitext(name)[1] for name in names] == [".prof", ".txt"]
+    with open(tmp_path / "profiles" / names[1], encoding="utf-8") as f:
+        report = f.read()
+    assert "Largest allocation sites at end of parse_tree:" in report
+    assert "Largest allocation sites at end of request (surviving allocations only):" in report
+    assert report.index("end of parse_tree") < report.index("end of request")
+
+
+def test_snapshot_memory_ignores_other_requests(tmp_path):
+    profiler = Profiler(str(tmp_path), sample_every=1)
+
+    with profiler.profile("request", "trace-a"):
+        profiler.snapshot_memory("elsewhere", "trace-b")
+        profiler.snapshot_memory("here", "trace-a")
+        assert [label for label, _ in profiler._snapshots] == ["here"]
+
+    profiler.snapshot_memory("after", "trace-a")
+    assert profiler._snapshots == []
+
+
+def test_only_newest_captures_are_kept(tmp_path):
+    profiler = Profiler(str(tmp_path), sample_every=1, keep=1, trace_memory=False)
+
+    with profiler.profile("request", "first"):
+        pass
+    # Age the first capture so rotation orders them regardless of timer resolution
+    for entry in os.scandir(tmp_path):
+        os.utime(entry.path, (0, 0))
+    with profiler.profile("request", "second"):
+        pass
+
+    names = os.listdir(tmp_path)
+    assert len(names) == 2
+    assert all("-second-" in name for name in names)
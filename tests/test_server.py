@@ -0,0 +1,84 @@
+import json
+import threading
+import time
+import urllib.error
+import urllib.request
+
+import pytest
+
+from server import SummaryService, make_server
+from summarizer import BlogSummarizer
+
+
+def request(base_url, method, path, body=None):
+    """Return (status, headers, JSON body) for one call to the service."""
+    data = json.dumps(body).encode("utf-8") if body is not None else None
+    req = urllib.request.Request(base_url + path, data=data, method=method, headers={"Content-Type": "application/json"})
+    try:
+        with urllib.request.urlopen(req, timeout=10) as response:
+            return response.status, response.headers, json.loads(response.read())
+    except urllib.error.HTTPError as e:
+        return e.code, e.headers, json.loads(e.read())
+
+
+@pytest.fixture
+def service_url(groq_client):
+    """Start the service on a free port with one worker and no queue."""
+    service = SummaryService(BlogSummarizer("test-key", groq_client=groq_client), workers=1, queue_size=0)
+    server = make_server(service, port=0)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{server.server_port}", service
+    service.shutdown()
+    server.shutdown()
+    server.server_close()
+
+
+def test_summarize_answers_with_the_summary(service_url, page_server):
+    base_url, _ = service_url
+    pages_url, _, _ = page_server
+
+    status, _, record = request(base_url, "POST", "/summarize", {"url": pages_url + "/post", "summary_length": "short"})
+
+    assert status == 200
+    assert record["error"] is None
+    assert record["summary"] == "A short summary of the article."
+
+
+def test_invalid_requests_are_rejected(service_url):
+    base_url, _ = service_url
+
+    assert request(base_url, "POST", "/summarize", {"url": "not a url"})[0] == 400
+    assert request(base_url, "POST", "/summarize", {"url": "https://example.com", "summary_length": "huge"})[0] == 400
+    assert request(base_url, "GET", "/jobs/unknown")[0] == 404
+
+
+def test_full_pool_answers_429_then_the_job_can_be_polled(service_url, page_server, groq_server):
+    base_url, _ = service_url
+    pages_url, _, _ = page_server
+    _, _, groq_options = groq_server
+    groq_options["delay"] = 0.5
+
+    status, _, job = request(base_url, "POST", "/jobs", {"url": pages_url + "/slow", "summary_length": "short"})
+    assert status == 202
+
+    status, headers, _ = request(base_url, "POST", "/jobs", {"url": pages_url + "/other", "summary_length": "short"})
+    assert status == 429
+    assert headers["Retry-After"] == "1"
+
+    record = None
+    for _ in range(50):
+        _, _, polled = request(base_url, "GET", f"/jobs/{job['id']}")
+        if polled["status"] == "done":
+            record = polled["result"]
+            break
+        time.sleep(0.1)
+    assert record is not None and record["summary"] == "A short summary of the article."
+
+
+def test_healthz_reports_draining(service_url):
+    base_url, service = service_url
+
+    assert request(base_url, "GET", "/healthz")[0] == 200
+    service.shutdown()
+    assert request(base_url, "GET", "/healthz")[0] == 503
+    assert request(base_url, "POST", "/jobs", {"url": "https://example.com"})[0] == 503
@@ -0,0 +1,65 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+import metrics
+from singleflight import SingleFlight
+from summarizer import BlogSummarizer
+
+CALLERS = 20
+
+
+def test_concurrent_variants_of_one_url_share_one_fetch_and_one_completion(page_server, groq_server, groq_client):
+    base_url, pages, page_options = page_server
+    _, completions, groq_options = groq_server
+    # Slow enough that every caller arrives while the first fetch and completion are in flight
+    page_options["delay"] = 0.5
+    groq_options["delay"] = 0.5
+    summarizer = BlogSummarizer("test-key", groq_client=groq_client)
+    barrier = threading.Barrier(CALLERS)
+    extractions_before = sum(metrics.EXTRACTIONS.snapshot().values())
+
+    def summarize(i):
+        barrier.wait()
+        return summarizer.summarize_url(f"{base_url}/post?utm_source={i}", "short")
+
+    with ThreadPoolExecutor(max_workers=CALLERS) as pool:
+        results = list(pool.map(summarize, range(CALLERS)))
+
+    assert all(error is None and summary == "A short summary of the article." for _, summary, error, _ in results)
+    assert pages.count("GET") == 1
+    assert completions.count("POST") == 1
+    assert summarizer.extraction_flights.coalesced == CALLERS - 1
+    # Followers did not extract, so only the leader is counted
+    assert sum(metrics.EXTRACTIONS.snapshot().values()) == extractions_before + 1
+
+
+def test_followers_receive_the_leaders_error():
+    flights = SingleFlight()
+    started = threading.Event()
+    release = threading.Event()
+
+    def fail():
+        started.set()
+        release.wait()
+        raise ValueError("upstream failed")
+
+    def follow():
+        started.wait()
+        return flights.do("key", lambda: "not called")
+
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        leader = pool.submit(flights.do, "key", fail)
+        follower = pool.submit(follow)
+        started.wait()
+        while flights.coalesced == 0:
+            time.sleep(0.01)
+        release.set()
+        with pytest.raises(ValueError):
+            leader.result()
+        with pytest.raises(ValueError):
+            follower.result()
+
+    assert flights.executions == 1
@@ -0,0 +1,28 @@
+import metrics
+from ratelimit import RateLimitScheduler
+from summarizer import BlogSummarizer
+
+
+def test_streamed_summary_exports_time_to_first_token(groq_client):
+    summarizer = BlogSummarizer("test-key", groq_client=groq_client)
+    before = metrics.STAGE_SECONDS.snapshot().get(("time_to_first_token",), {"count": 0})["count"]
+
+    stats = {}
+    summary = "".join(summarizer.summarize_content_stream("Title", "word " * 200, "short", stats=stats))
+
+    assert summary.strip() == "A short summary of the article."
+    assert stats["error"] is None
+    assert stats["timings"]["time_to_first_token"] == stats["time_to_first_token"]
+    assert metrics.STAGE_SECONDS.snapshot()[("time_to_first_token",)]["count"] == before + 1
+
+
+def test_streamed_summary_settles_its_token_reservation(groq_client):
+    scheduler = RateLimitScheduler(tokens_per_minute=3000)
+    summarizer = BlogSummarizer("test-key", groq_client=groq_client, scheduler=scheduler)
+
+    stats = {}
+    "".join(summarizer.summarize_content_stream("Title", "word " * 200, "short", stats=stats))
+
+    # The stand-in reports 120 tokens used; the rest of the reservation is refunded
+    assert stats["error"] is None
+    assert scheduler.tokens.level >= 3000 - 120
@@ -0,0 +1,29 @@
+import pytest
+
+from extractors import PARSER_BACKENDS, parse_html
+from text_utils import normalize_whitespace, split_into_chunks
+
+
+def test_normalize_whitespace_keeps_paragraph_breaks():
+    text = "  First\tline  wraps\r\n here.\n \n\n\nSecond   paragraph. \n"
+
+    assert normalize_whitespace(text) == "First line wraps\nhere.\n\nSecond paragraph."
+
+
+@pytest.mark.parametrize("backend", list(PARSER_BACKENDS))
+def test_extracted_content_is_chunked_on_paragraph_boundaries(backend):
+    paragraphs = [
+        f"Paragraph {i} explains one more detail of the topic. It wraps onto a second sentence as well."
+        for i in range(60)
+    ]
+    html = "<html><body><article><h1>Title</h1>{}</article></body></html>".format(
+        "".join("<p>{}</p>".format(paragraph.replace(" one more ", "\n   <em>one more</em> ")) for paragraph in paragraphs)
+    )
+
+    _, content = parse_html(html.encode("utf-8"), backend, structured_data=False)
+    chunks = split_into_chunks(content, 1000)
+
+    assert content.split("\n\n") == ["Title"] + paragraphs
+    assert len(chunks) > 1
+    for chunk in chunks:
+        assert set(chunk.split("\n\n")) <= set(["Title"] + paragraphs)
@@ -0,0 +1,73 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from summarizer import BlogSummarizer
+from tracing import InMemoryExporter, in_current_span, tracer
+
+
+class FailingFirecrawl:
+    """Firecrawl stand-in that always fails, so basic scraping takes over."""
+
+    def scrape_url(self, url, params=None):
+        raise RuntimeError("firecrawl is down")
+
+
+@pytest.fixture
+def exporter():
+    previous = tracer.exporter
+    tracer.exporter = InMemoryExporter()
+    yield tracer.exporter
+    tracer.exporter = previous
+
+
+def test_summarize_url_produces_one_connected_trace(exporter, page_server, groq_client):
+    base_url, _, _ = page_server
+    summarizer = BlogSummarizer("test-key", groq_client=groq_client, firecrawl_client=FailingFirecrawl(), hedge_delay=0.5)
+
+    stats = {}
+    _, summary, error, method = summarizer.summarize_url(base_url + "/post", "short", stats=stats)
+    assert error is None and method == "Basic Scraping"
+
+    spans = exporter.get_finished_spans(stats["trace_id"])
+    by_id = {span.span_id: span for span in spans}
+    by_name = {span.name: span for span in spans}
+
+    def parent(name):
+        return by_id[by_name[name].parent_id].name
+
+    root = by_name["summarize_url"]
+    assert root.parent_id is None
+    assert all(span.parent_id in by_id for span in spans if span is not root)
+    assert parent("extract_content") == "summarize_url"
+    # The hedged legs run on pool threads but stay in the request's trace
+    assert parent("extract.firecrawl") == "extract_content"
+    assert parent("extract.fallback") == "extract_content"
+    assert parent("http.fetch") == "extract.fallback"
+    assert parent("html.parse") == "extract.fallback"
+    assert parent("groq.completion") == "summarize_url"
+
+    assert by_name["extract.firecrawl"].status == "error"
+    assert root.attributes["extraction.method"] == "Basic Scraping"
+    assert by_name["groq.completion"].attributes["llm.completion_tokens"] == 20
+    assert all(span.duration is not None and span.duration <= root.duration for span in spans)
+
+
+def test_in_current_span_parents_pool_work_and_errors_are_recorded(exporter):
+    def child():
+        with tracer.span("child"):
+            pass
+
+    with pytest.raises(ValueError):
+        with tracer.span("outer") as outer:
+            with ThreadPoolExecutor(max_workers=1) as pool:
+                pool.submit(in_current_span(child)).result()
+                pool.submit(child).result()
+            raise ValueError("boom")
+
+    wrapped, bare = [span for span in exporter.get_finished_spans() if span.name == "child"]
+    assert wrapped.trace_id == outer.trace_id and wrapped.parent_id == outer.span_id
+    # Without the wrapper a pool thread starts a trace of its own
+    assert bare.trace_id != outer.trace_id and bare.parent_id is None
+    assert outer.status == "error"
+    assert outer.error == "ValueError: boom"
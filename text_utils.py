@@ -0,0 +1,116 @@
+import re
+from typing import Dict, List, Tuple
+
+HORIZONTAL_WHITESPACE = re.compile(r'[^\S\n]+')
+LINE_EDGES = re.compile(r' ?\n ?')
+EXTRA_BLANK_LINES = re.compile(r'\n{3,}')
+
+# Boundaries to split on, from the most to the least structural
+PARAGRAPH_BOUNDARY = re.compile(r'\n\s*\n')
+HEADING_BOUNDARY = re.compile(r'\s+(?=#{1,6}\s)')
+SENTENCE_BOUNDARY = re.compile(r'(?<=[.!?])\s+(?=[A-Z0-9"\'“(\[])')
+
+
+def normalize_whitespace(text: str) -> str:
+    """Collapse runs of spaces and tabs, keeping line breaks and at most one blank line between paragraphs."""
+    text = HORIZONTAL_WHITESPACE.sub(' ', text)
+    text = LINE_EDGES.sub('\n', text)
+    return EXTRA_BLANK_LINES.sub('\n\n', text).strip()
+
+
+def split_into_chunks(text: str, max_chars: int) -> List[str]:
+    """Split text into chunks of at most ``max_chars`` on paragraph, heading or sentence boundaries.
+
+    Adjacent pieces are packed greedily so chunks stay close to the limit; a
+    single piece longer than the limit is split on the next finer boundary,
+    and as a last resort on whitespace.
+    """
+    text = text.strip()
+    if len(text) <= max_chars:
+        return [text] if text else []
+    return _pack(_split(text, max_chars, [PARAGRAPH_BOUNDARY, HEADING_BOUNDARY, SENTENCE_BOUNDARY]), max_chars)
+
+
+def _split(text: str, max_chars: int, boundaries: List[re.Pattern]) -> List[str]:
+    """Recursively break text into pieces no longer than ``max_chars``."""
+    if len(text) <= max_chars:
+        return [text]
+
+    if not boundaries:
+        # No structure left: hard split on whitespace near the limit
+        pieces = []
+        while len(text) > max_chars:
+            cut = text.rfind(' ', 0, max_chars)
+            if cut <= 0:
+                cut = max_chars
+            pieces.append(text[:cut].strip())
+            text = text[cut:].strip()
+        if text:
+            pieces.append(text)
+        return pieces
+
+    pieces = []
+    for piece in boundaries[0].split(text):
+        piece = piece.strip()
+        if piece:
+            pieces.extend(_split(piece, max_chars, boundaries[1:]))
+    return pieces
+
+
+def _pack(pieces: List[str], max_chars: int) -> List[str]:
+    """Greedily join consecutive pieces into chunks no longer than ``max_chars``."""
+    chunks = []
+    current = ""
+    for piece in pieces:
+        if current and len(current) + 2 + len(piece) > max_chars:
+            chunks.append(current)
+            current = piece
+        else:
+            current = f"{current}\n\n{piece}" if current else piece
+    if current:
+        chunks.append(current)
+    return chunks
+
+
+# Llama 3's tokenizer keeps most English words whole, splits long or rare
+# words into pieces, groups digits in threes and gives punctuation and
+# non-Latin characters roughly a token each. Counting the same units
+# slightly overestimates real usage, which is the safe direction.
+TOKEN_PATTERN = re.compile(r'[A-Za-z]+|\d{1,3}|[^\sA-Za-z\d]')
+
+
+def _token_cost(piece: str) -> int:
+    """Return the estimated token cost of one regex piece."""
+    if piece[0].isalpha() and piece.isascii():
+        return 1 + (len(piece) - 1) // 8
+    return 1
+
+
+def estimate_tokens(text: str) -> int:
+    """Estimate the number of model tokens in ``text``."""
+    return sum(_token_cost(match.group()) for match in TOKEN_PATTERN.finditer(text))
+
+
+def estimate_message_tokens(messages: List[Dict[str, str]]) -> int:
+    """Estimate prompt tokens for chat messages, including per-message framing."""
+    return sum(estimate_tokens(message["content"]) + 4 for message in messages) + 3
+
+
+def truncate_to_tokens(text: str, max_tokens: int) -> Tuple[str, int]:
+    """Return the longest prefix of ``text`` within ``max_tokens`` and its token count.
+
+    A truncated prefix is cut at a token boundary and marked with "...".
+    """
+    total = 0
+    marker_tokens = estimate_tokens("...")
+    budget = max_tokens - marker_tokens
+    for match in TOKEN_PATTERN.finditer(text):
+        cost = _token_cost(match.group())
+        if total + cost > budget:
+            # Only truncate when the remaining text does not fit either
+            remaining = total + estimate_tokens(text[match.start():])
+            if remaining <= max_tokens:
+                return text, remaining
+            return text[:match.start()].rstrip() + "...", total + marker_tokens
+        total += cost
+    return text, total
@@ -0,0 +1,174 @@
+import contextvars
+import json
+import logging
+import os
+import secrets
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+logger = logging.getLogger(__name__)
+
+_current_span: contextvars.ContextVar[Optional["Span"]] = contextvars.ContextVar("current_span", default=None)
+
+
+class Span:
+    """One timed operation in a trace, in the OpenTelemetry model.
+
+    Spans of one request share a ``trace_id``; each points at the span it
+    ran in through ``parent_id``, which is what waterfall views are built from.
+    """
+
+    def __init__(self, name: str, trace_id: str, parent_id: Optional[str] = None,
+                 attributes: Optional[Dict[str, Any]] = None):
+        self.name = name
+        self.trace_id = trace_id
+        self.span_id = secrets.token_hex(8)
+        self.parent_id = parent_id
+        self.attributes: Dict[str, Any] = dict(attributes or {})
+        self.status = "ok"
+        self.error: Optional[str] = None
+        self.start_time = time.time()
+        self.duration: Optional[float] = None
+        self._start = time.perf_counter()
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        self.attributes[key] = value
+
+    def set_attributes(self, attributes: Dict[str, Any]) -> None:
+        self.attributes.update(attributes)
+
+    def record_error(self, error: Any) -> None:
+        """Mark the span failed, with an exception or an error message."""
+        self.status = "error"
+        self.error = f"{type(error).__name__}: {error}" if isinstance(error, BaseException) else str(error)
+
+    def end(self) -> None:
+        if self.duration is None:
+            self.duration = time.perf_counter() - self._start
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "name": self.name,
+            "trace_id": self.trace_id,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "start_time": self.start_time,
+            "duration": self.duration,
+            "status": self.status,
+            "error": self.error,
+            "attributes": self.attributes,
+        }
+
+
+class InMemoryExporter:
+    """Keeps finished spans in a list, for tests and debugging."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._spans: List[Span] = []
+
+    def export(self, span: Span) -> None:
+        with self._lock:
+            self._spans.append(span)
+
+    def get_finished_spans(self, trace_id: Optional[str] = None) -> List[Span]:
+        """Return finished spans in the order they ended, optionally of one trace."""
+        with self._lock:
+            return [span for span in self._spans if trace_id is None or span.trace_id == trace_id]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._spans.clear()
+
+
+class LoggingExporter:
+    """Logs every finished span as one JSON line, for shipping with the other logs."""
+
+    def __init__(self, level: int = logging.INFO):
+        self.level = level
+
+    def export(self, span: Span) -> None:
+        logger.log(self.level, json.dumps(span.to_dict(), default=str))
+
+
+class Tracer:
+    """Creates spans and hands finished ones to a pluggable exporter.
+
+    Any object with an ``export(span)`` method can be the exporter; with none,
+    spans are still created (so trace IDs exist) but go nowhere. The current
+    span is kept in a context variable, so asyncio tasks and asyncio.to_thread()
+    inherit it; plain thread pools need in_current_span().
+    """
+
+    def __init__(self, exporter: Optional[Any] = None):
+        self.exporter = exporter
+
+    @contextmanager
+    def span(self, name: str, attributes: Optional[Dict[str, Any]] = None) -> Iterator[Span]:
+        """Run the block in a new span, a child of the current one if there is one."""
+        parent = _current_span.get()
+        span = Span(
+            name,
+            parent.trace_id if parent else secrets.token_hex(16),
+            parent.span_id if parent else None,
+            attributes
+        )
+        token = _current_span.set(span)
+        try:
+            yield span
+        except BaseException as e:
+            span.record_error(e)
+            raise
+        finally:
+            _current_span.reset(token)
+            span.end()
+            self._export(span)
+
+    def _export(self, span: Span) -> None:
+        if self.exporter is None:
+            return
+        try:
+            self.exporter.export(span)
+        except Exception as e:
+            logger.warning(f"Span export failed: {str(e)}")
+
+
+def current_span() -> Optional[Span]:
+    """Return the span the caller is running in, if any."""
+    return _current_span.get()
+
+
+def annotate(attributes: Dict[str, Any]) -> None:
+    """Set attributes on the current span, if there is one."""
+    span = _current_span.get()
+    if span is not None:
+        span.set_attributes(attributes)
+
+
+def in_current_span(fn: Callable[..., Any]) -> Callable[..., Any]:
+    """Wrap ``fn`` to run in the caller's current span, e.g. when submitted to a thread pool."""
+    span = _current_span.get()
+
+    def run(*args: Any, **kwargs: Any) -> Any:
+        token = _current_span.set(span)
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            _current_span.reset(token)
+
+    return run
+
+
+def exporter_from_env() -> Optional[Any]:
+    """Build the exporter named by TRACE_EXPORTER ("log"), if any."""
+    name = os.getenv("TRACE_EXPORTER", "").strip().lower()
+    if not name or name == "none":
+        return None
+    if name == "log":
+        return LoggingExporter()
+    raise ValueError(f"Unknown TRACE_EXPORTER {name!r}; expected 'log' or 'none'")
+
+
+tracer = Tracer()